@@ -3,8 +3,11 @@ from .config import config_by_name
 from .extensions import init_app
 from .api import api_blueprint
 from .auth import auth_blueprint
+from .cli import archive_results_command
 from .errors.handlers import error_blueprint
+from .utils.compression import init_compression
 from .utils.logger import app_logger
+from .utils.serialization import init_json
 
 def create_app(config_name: str) -> Flask:
     """
@@ -24,6 +27,9 @@ def create_app(config_name: str) -> Flask:
         app.register_blueprint(auth_blueprint, url_prefix='/auth', subdomain='auth')
         app.register_blueprint(error_blueprint, url_prefix='/error', subdomain='error')
         init_app(app)
+        init_compression(app)
+        init_json(app)
+        app.cli.add_command(archive_results_command)
         app_logger.info(f"App created with {config_name} configuration.")
     except Exception as err:
         app_logger.error(f"Error in creating app: {str(err)}")
@@ -1,13 +1,45 @@
 from flask import Blueprint, Response, jsonify
 from flask_jwt_extended import jwt_required
+from app.extensions import check_influxdb, check_redis, db
+from app.db.pool import pool_status
 from app.utils.logger import api_logger
 from .test_management import test_management_routes
 from .performance_testing import performance_testing_routes
+from .jobs import job_routes
 
 
 api_blueprint: Blueprint = Blueprint('api', __name__)
 api_blueprint.register_blueprint(test_management_routes, subdomain='api', url_prefix='/api')
 api_blueprint.register_blueprint(performance_testing_routes, subdomain='api', url_prefix='/api')
+api_blueprint.register_blueprint(job_routes, subdomain='api', url_prefix='/api')
+
+@api_blueprint.route('/health', methods=['GET'])
+def health() -> tuple[Response, int]:
+    """
+    Report the reachability of the InfluxDB and Redis backends.
+
+    Returns:
+    - A JSON payload with the status of each backend and a status code of 200 if all are
+      reachable, or 503 otherwise.
+    """
+    checks: dict[str, bool] = {'influxdb': check_influxdb(), 'redis': check_redis()}
+    healthy: bool = all(checks.values())
+    if not healthy:
+        api_logger.warning(f"Health check failed: {checks}")
+    return jsonify(status='ok' if healthy else 'degraded', checks=checks), 200 if healthy else 503
+
+
+@api_blueprint.route('/metrics/db-pool', methods=['GET'])
+def db_pool_metrics() -> tuple[Response, int]:
+    """
+    Report the connection pool metrics of this worker process.
+
+    Returns:
+    - A JSON payload with, for each database bind, the pool size, connections checked out,
+      idle and in overflow, and checkout, wait and timeout counters, with a status code of 200.
+    """
+    return jsonify(pool_status(db.engines)), 200
+
 
 @api_blueprint.route('/protected', methods=['GET'])
 @jwt_required()
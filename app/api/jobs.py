@@ -0,0 +1,62 @@
+from typing import Any, Optional
+from flask import Blueprint, Response, jsonify, url_for
+from flask_jwt_extended import jwt_required
+from app.db.schema import ExecutionJob
+from app.services.execution_job_service import ExecutionJobService
+from app.utils.logger import api_logger
+
+job_routes: Blueprint = Blueprint('jobs', __name__)
+
+
+def job_accepted(job: ExecutionJob) -> tuple[dict[str, Any], int, dict[str, str]]:
+    """
+    Build the 202 Accepted response of an execute endpoint, for Flask views and Resources alike.
+
+    Args:
+        job (ExecutionJob): The queued job.
+
+    Returns:
+        tuple[dict[str, Any], int, dict[str, str]]: The job, with the URL to poll in the Location header.
+    """
+    location: str = url_for('api.jobs.job_status', job_id=job.id)
+    return {**job.to_dict(), 'status_url': location}, 202, {'Location': location}
+
+
+@job_routes.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def job_status(job_id) -> tuple[Response, int]:
+    """
+    Get the status of an execution job, and its result once it finished.
+
+    Parameters:
+        job_id (str): The ID returned by an execute endpoint.
+
+    Returns:
+        tuple[Response, int]: The job, or 404 if it does not exist.
+    """
+    job: Optional[ExecutionJob] = ExecutionJobService().get(job_id)
+    if job is None:
+        return jsonify(error=f"Job {job_id} not found"), 404
+    return jsonify(job.to_dict()), 200
+
+
+@job_routes.route('/jobs/<job_id>/cancel', methods=['POST'])
+@jwt_required()
+def cancel_job(job_id) -> tuple[Response, int]:
+    """
+    Cancel a queued or running execution job.
+
+    Parameters:
+        job_id (str): The ID returned by an execute endpoint.
+
+    Returns:
+        tuple[Response, int]: The cancelled job, 404 if it does not exist, or 409 if it already finished.
+    """
+    try:
+        job: Optional[ExecutionJob] = ExecutionJobService().cancel(job_id)
+    except ValueError as err:
+        api_logger.info(f"Not cancelling job {job_id}: {err}")
+        return jsonify(error=str(err)), 409
+    if job is None:
+        return jsonify(error=f"Job {job_id} not found"), 404
+    return jsonify(job.to_dict()), 200
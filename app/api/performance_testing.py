@@ -1,12 +1,24 @@
+from datetime import datetime
 from typing import Any, Literal
 from flask_restx import Namespace, Resource, fields
-from flask import Blueprint, request
-from app.schemas.performance_test import PerformanceTest
-from app.schemas.performance_result import PerformanceResult
+from flask import Blueprint, Response, request
+from app.db.schema import ExecutionJob, PerformanceTest, PerformanceTestResult
 from app.schemas.test_run import TestRun
-from app.services.performance_test_service import LocustPerformanceTester
+from app.schemas.performance_query import PerformanceSeriesQuery
+from app.services.execution_job_service import ExecutionJobService
+from app.services.performance_data_service import PerformanceDataService
+from app.services.latency_sketch_service import LatencySketchService
+from app.services.performance_comparison_service import PerformanceComparisonService
+from app.services.regression_service import RegressionDetectionService
 from app.extensions import db
+from app.db.cache import cached_get_or_404
+from app.db.routing import replica_reads
+from app.db.unit_of_work import unit_of_work
+from app.api.jobs import job_accepted
+from app.utils.conditional import conditional_get
 from app.utils.logger import api_logger
+from app.utils.pagination import Page, paginate, pagination_headers, parse_pagination_args
+from app.utils.serialization import json_array_response
 
 performance_testing_routes = Blueprint('performance_testing', __name__)
 
@@ -38,6 +50,8 @@ message_model = performance_testing_ns.model('MessageResponse', {
 
 
 @performance_testing_routes.route('/performancetests')
+@performance_testing_ns.param('limit', 'Page size')
+@performance_testing_ns.param('after', 'Cursor returned in the X-Next-Cursor header of the previous page')
 class PerformanceTests(Resource):
     """
     This class provides API endpoints for managing and retrieving performance tests. 
@@ -46,24 +60,33 @@ class PerformanceTests(Resource):
         GET: Retrieve all performance tests.
         POST: Create a new performance test.
     """
+    # Outside marshal_list_with, which would serialize a 304 response
+    @conditional_get(PerformanceTest)
     @performance_testing_ns.doc('get_all_performance_tests')
     @performance_testing_ns.marshal_list_with(performance_test_response_model)
-    def get(self) -> tuple[list, Literal[200]]:
-        """Retrieve all performance tests."""
-        tests: list[PerformanceTest]
+    @performance_testing_ns.response(400, 'Invalid Request', error_model)
+    @performance_testing_ns.response(304, 'Not Modified')
+    @replica_reads
+    def get(self) -> tuple[list, Literal[200], dict[str, str]]:
+        """Retrieve a page of performance tests."""
+        page: Page
 
         try:
-            tests = PerformanceTest.query.all()
-            api_logger.info(f"Fetched {len(tests)} performance tests")
+            limit, after = parse_pagination_args()
+            page = paginate(PerformanceTest.query, [(PerformanceTest.id, False)], limit, after)
+            api_logger.info(f"Fetched {len(page.items)} performance tests")
+        except ValueError as err:
+            api_logger.error(f"Invalid pagination of performance tests: {err}")
+            return {'error': str(err)}, 400
         except Exception as err:
             api_logger.error(f"Error fetching performance tests: {err}")
             return {'error': str(err)}, 500
 
-        if not tests:
+        if not page.items:
             api_logger.info("No performance tests found")
             return [], 200
 
-        return [test.to_dict() for test in tests], 200
+        return [test.to_dict() for test in page.items], 200, pagination_headers(page, limit)
 
     @performance_testing_ns.doc('create_performance_test')
     @performance_testing_ns.expect(performance_test_model)
@@ -73,14 +96,12 @@ class PerformanceTests(Resource):
         try:
             """Create a new performance test."""
             data = request.get_json()
-            new_test = PerformanceTest(**data)
-            db.session.add(new_test)
-            db.session.commit()
+            with unit_of_work() as uow:
+                new_test = uow.add(PerformanceTest(**data))
             api_logger.info(f"Added new performance test: {new_test.name}")
             return new_test.to_dict(), 201
 
         except Exception as err:
-            db.session.rollback()
             api_logger.error(f"Error creating performance test: {err}")
             return {'error': str(err)}, 500
 
@@ -101,12 +122,13 @@ class PerformanceTestResource(Resource):
     @performance_testing_ns.doc('get_performance_test')
     @performance_testing_ns.marshal_with(performance_test_response_model)
     @performance_testing_ns.response(404, 'Performance Test not found', error_model)
+    @replica_reads
     def get(self, test_id):
         """Retrieve a specific performance test by its ID."""
         test: PerformanceTest
 
         try:
-            test = PerformanceTest.query.get_or_404(test_id)
+            test = cached_get_or_404(PerformanceTest, test_id)
         except Exception as err:
             api_logger.error(
                 f"Error retrieving performance test {test_id}: {err}")
@@ -125,13 +147,12 @@ class PerformanceTestResource(Resource):
             """Update a specific performance test."""
             test = PerformanceTest.query.get_or_404(test_id)
             data = request.get_json()
-            for key, value in data.items():
-                setattr(test, key, value)
-            db.session.commit()
+            with unit_of_work():
+                for key, value in data.items():
+                    setattr(test, key, value)
             return test.to_dict(), 200
 
         except Exception as err:
-            db.session.rollback()
             api_logger.error(
                 f"Error updating performance test {test_id}: {err}")
             return {'error': str(err)}, 500
@@ -144,19 +165,22 @@ class PerformanceTestResource(Resource):
         try:
             """Delete a specific performance test."""
             test = PerformanceTest.query.get_or_404(test_id)
-            db.session.delete(test)
-            db.session.commit()
+            with unit_of_work() as uow:
+                uow.delete(test)
             return '', 204
 
         except Exception as err:
-            db.session.rollback()
             api_logger.error(
                 f"Error deleting performance test {test_id}: {err}")
             return {'error': str(err)}, 500
 
 
-performance_execution_model = performance_testing_ns.model('PerformanceExecution', {
-    'result_data': fields.Raw(description='Data resulting from performance test execution')
+execution_job_model = performance_testing_ns.model('ExecutionJob', {
+    'id': fields.String(description='ID of the execution job'),
+    'kind': fields.String(description='Kind of execution'),
+    'target_id': fields.Integer(description='ID of the executed performance test'),
+    'status': fields.String(description='Status of the execution job'),
+    'status_url': fields.String(description='URL to poll for the status and result of the job')
 })
 
 performance_results_model = performance_testing_ns.model('PerformanceResults', {
@@ -172,41 +196,46 @@ performance_results_model = performance_testing_ns.model('PerformanceResults', {
 @performance_testing_ns.param('test_id', 'The unique identifier of the performance test')
 class ExecutePerformanceTest(Resource):
     @performance_testing_ns.doc('execute_performance_test')
-    @performance_testing_ns.response(201, 'Performance Test Executed', performance_execution_model)
+    @performance_testing_ns.response(202, 'Performance Test Queued', execution_job_model)
     @performance_testing_ns.response(404, 'Performance Test not found', error_model)
-    def post(self, test_id) -> tuple[Any, Literal[201]]:
+    @performance_testing_ns.response(503, 'Performance Test not queued', error_model)
+    def post(self, test_id) -> tuple[dict[str, Any], int] | tuple[dict[str, Any], int, dict[str, str]]:
+        """Queue the execution of a specific performance test for the workers."""
         try:
-            """Execute a specific performance test."""
-            test: PerformanceTest = PerformanceTest.query.get_or_404(test_id)
-            performance_tester: LocustPerformanceTester = LocustPerformanceTester(
-                db.session)
-            result_data: dict[str, Any] | None = performance_tester.execute_test(
-                performance_test_id=test.id)
-            new_result: PerformanceResult = PerformanceResult(
-                performance_test_id=test_id, result_data=result_data)
-            db.session.add(new_result)
-            db.session.commit()
-            return new_result.to_dict(), 201
-
-        except Exception as err:
-            db.session.rollback()
+            job: ExecutionJob = ExecutionJobService().enqueue('performance_test', test_id)
+        except ValueError as err:
             api_logger.error(f"Error executing performance test: {err}")
-            return {'error': str(err)}, 500
+            return {'error': str(err)}, 404
+        except Exception as err:
+            api_logger.error(f"Error queuing performance test {test_id}: {err}")
+            return {'error': str(err)}, 503
+
+        api_logger.info(f"Queued performance test {test_id} as job {job.id}")
+        return job_accepted(job)
 
 
 @performance_testing_routes.route('/performancetests/<int:test_id>/results')
 @performance_testing_ns.param('test_id', 'The unique identifier of the performance test')
+@performance_testing_ns.param('limit', 'Page size')
+@performance_testing_ns.param('after', 'Cursor returned in the X-Next-Cursor header of the previous page')
 class PerformanceTestResults(Resource):
     @performance_testing_ns.doc('get_performance_results')
     @performance_testing_ns.marshal_list_with(performance_results_model)
     @performance_testing_ns.response(200, 'Performance Test Results Retrieved')
+    @performance_testing_ns.response(400, 'Invalid Request', error_model)
     @performance_testing_ns.response(404, 'Performance Test not found', error_model)
-    def get(self, test_id) -> tuple[list, Literal[200]]:
+    @replica_reads
+    def get(self, test_id) -> tuple[list, Literal[200], dict[str, str]]:
         try:
-            """Retrieve results of a specific performance test."""
-            results = PerformanceResult.query.filter_by(
-                performance_test_id=test_id).all()
-            return [result.to_dict() for result in results], 200
+            """Retrieve a page of results of a specific performance test, most recent first."""
+            limit, after = parse_pagination_args()
+            page: Page = paginate(
+                PerformanceTestResult.query.filter_by(performance_test_id=test_id),
+                [(PerformanceTestResult.executed_at, True), (PerformanceTestResult.id, True)], limit, after)
+            return [result.to_dict() for result in page.items], 200, pagination_headers(page, limit)
+        except ValueError as err:
+            api_logger.error(f"Invalid pagination of performance results: {err}")
+            return {'error': str(err)}, 400
         except Exception as err:
             api_logger.error(f"Error retrieving performance results: {err}")
             return {'error': str(err)}, 500
@@ -229,3 +258,149 @@ class StopPerformanceTest(Resource):
         except Exception as err:
             api_logger.error(f"Error stopping performance test: {err}")
             return {'error': str(err)}, 500
+
+
+@performance_testing_routes.route('/performancetests/<int:test_id>/timeseries')
+@performance_testing_ns.param('test_id', 'The unique identifier of the performance test')
+@performance_testing_ns.param('start', 'Inclusive start of the time range (ISO 8601)')
+@performance_testing_ns.param('end', 'Exclusive end of the time range (ISO 8601)')
+@performance_testing_ns.param('metrics', 'Comma-separated list of metric names')
+@performance_testing_ns.param('resolution', 'Bucket width in seconds')
+@performance_testing_ns.param('aggregation', "Aggregate per bucket ('mean', 'max', 'p95', ...)")
+@performance_testing_ns.param('max_points', 'Downsample the series with LTTB to at most this many points')
+class PerformanceTestTimeSeries(Resource):
+    @performance_testing_ns.doc('get_performance_timeseries')
+    @performance_testing_ns.response(200, 'Performance Time Series Streamed')
+    @performance_testing_ns.response(400, 'Invalid Request', error_model)
+    def get(self, test_id) -> Response | tuple[dict[str, str], int]:
+        """Stream a bounded, downsampled time series of a specific performance test."""
+        service: PerformanceDataService = PerformanceDataService()
+        try:
+            params: PerformanceSeriesQuery = PerformanceSeriesQuery(
+                test_id=test_id, **request.args.to_dict())
+            # Build eagerly so that bound violations surface as a 400 before streaming starts
+            service.build_query(params)
+        except ValueError as err:
+            api_logger.error(f"Invalid performance time series query for test {test_id}: {err}")
+            return {'error': str(err)}, 400
+
+        api_logger.info(f"Streaming performance time series for test {test_id}")
+        return json_array_response(service.iter_performance_data(params))
+
+
+@performance_testing_routes.route('/performancetests/<int:test_id>/percentiles')
+@performance_testing_ns.param('test_id', 'The unique identifier of the performance test')
+@performance_testing_ns.param('results', 'Comma-separated performance result IDs to merge')
+@performance_testing_ns.param('q', 'Comma-separated quantiles, e.g. 0.5,0.95,0.99')
+@performance_testing_ns.param('since', 'Start of the rolling window range (ISO 8601)')
+@performance_testing_ns.param('until', 'End of the rolling window range (ISO 8601)')
+class PerformanceTestPercentiles(Resource):
+    @performance_testing_ns.doc('get_performance_percentiles')
+    @performance_testing_ns.response(200, 'Performance Test Percentiles Retrieved')
+    @performance_testing_ns.response(400, 'Invalid Request', error_model)
+    @replica_reads
+    def get(self, test_id) -> tuple[dict[str, Any], int]:
+        """Estimate latency percentiles across runs or rolling windows by merging sketches."""
+        try:
+            quantiles: list[float] = [
+                float(q) for q in request.args.get('q', '0.5,0.9,0.95,0.99').split(',')]
+            if any(not 0 <= q <= 1 for q in quantiles):
+                raise ValueError("Quantiles must be between 0 and 1")
+            result_ids: list[int] = [
+                int(result_id) for result_id in request.args.get('results', '').split(',') if result_id]
+            since: datetime | None = datetime.fromisoformat(
+                request.args['since']) if 'since' in request.args else None
+            until: datetime | None = datetime.fromisoformat(
+                request.args['until']) if 'until' in request.args else None
+        except ValueError as err:
+            api_logger.error(f"Invalid percentile query for performance test {test_id}: {err}")
+            return {'error': str(err)}, 400
+
+        try:
+            percentiles: dict[str, Any] = LatencySketchService(db.session).get_percentiles(
+                test_id, quantiles, result_ids=result_ids, since=since, until=until)
+            api_logger.info(f"Retrieved latency percentiles for performance test {test_id}")
+            return percentiles, 200
+        except Exception as err:
+            api_logger.error(f"Error retrieving latency percentiles: {err}")
+            return {'error': str(err)}, 500
+
+
+@performance_testing_routes.route('/performanceresults/compare')
+@performance_testing_ns.param('candidate', 'The ID of the performance result to evaluate')
+@performance_testing_ns.param('baseline', 'Comma-separated IDs of the baseline performance results')
+@performance_testing_ns.param('last', 'Number of previous runs to use when no baseline IDs are given')
+class PerformanceResultComparison(Resource):
+    @performance_testing_ns.doc('compare_performance_results')
+    @performance_testing_ns.response(200, 'Performance Results Compared')
+    @performance_testing_ns.response(400, 'Invalid Request', error_model)
+    @replica_reads
+    def get(self) -> tuple[dict[str, Any], int]:
+        """Compare per-endpoint latency percentiles and throughput of a run against baseline runs."""
+        try:
+            candidate_id: int = int(request.args['candidate'])
+            baseline_ids: list[int] = [
+                int(result_id) for result_id in request.args.get('baseline', '').split(',') if result_id]
+            last: int = min(int(request.args.get('last', 10)), 100)
+            comparison: dict[str, Any] = PerformanceComparisonService(db.session).compare(
+                candidate_id, baseline_ids, last=last)
+            api_logger.info(f"Compared performance result {candidate_id}")
+            return comparison, 200
+
+        except (KeyError, ValueError) as err:
+            api_logger.error(f"Invalid performance comparison request: {err}")
+            return {'error': str(err)}, 400
+
+        except Exception as err:
+            api_logger.error(f"Error comparing performance results: {err}")
+            return {'error': str(err)}, 500
+
+
+regression_verdict_model = performance_testing_ns.model('RegressionVerdict', {
+    'performance_result_id': fields.Integer(description='ID of the evaluated performance result'),
+    'status': fields.String(description="Verdict: 'regression', 'pass' or 'insufficient_data'"),
+    'is_regression': fields.Boolean(description='Whether the run is slower than its baseline'),
+    'p_value': fields.Float(description='One-sided Mann-Whitney p-value'),
+    'effect_size': fields.Float(description="Cliff's delta of the run against the baseline"),
+    'median_ratio': fields.Float(description='Median latency of the run divided by the baseline median'),
+    'baseline_result_ids': fields.List(fields.Integer, description='Runs forming the baseline')
+})
+
+
+@performance_testing_routes.route('/performanceresults/<int:result_id>/regression')
+@performance_testing_ns.param('result_id', 'The unique identifier of the performance result')
+class PerformanceResultRegression(Resource):
+    @performance_testing_ns.doc('get_regression_verdict')
+    @performance_testing_ns.response(200, 'Regression Verdict Retrieved', regression_verdict_model)
+    @performance_testing_ns.response(404, 'Regression Verdict not found', error_model)
+    @replica_reads
+    def get(self, result_id) -> tuple[dict[str, Any], int]:
+        """Retrieve the regression verdict of a performance result."""
+        try:
+            verdict = RegressionDetectionService(db.session).get_verdict(result_id)
+        except Exception as err:
+            api_logger.error(f"Error retrieving regression verdict for result {result_id}: {err}")
+            return {'error': str(err)}, 500
+
+        if not verdict:
+            api_logger.info(f"No regression verdict for performance result {result_id}")
+            return {'error': 'Regression verdict not found'}, 404
+        return verdict.to_dict(), 200
+
+    @performance_testing_ns.doc('evaluate_regression')
+    @performance_testing_ns.response(201, 'Regression Verdict Stored', regression_verdict_model)
+    @performance_testing_ns.response(404, 'Performance Result not found', error_model)
+    def post(self, result_id) -> tuple[dict[str, Any], int]:
+        """Evaluate a performance result against its rolling baseline and store the verdict."""
+        try:
+            verdict = RegressionDetectionService(db.session).evaluate(result_id)
+            api_logger.info(f"Evaluated regression for performance result {result_id}: {verdict.status}")
+            return verdict.to_dict(), 201
+
+        except ValueError as err:
+            api_logger.error(f"Error evaluating regression for result {result_id}: {err}")
+            return {'error': str(err)}, 404
+
+        except Exception as err:
+            api_logger.error(f"Error evaluating regression for result {result_id}: {err}")
+            return {'error': str(err)}, 500
@@ -1,33 +1,84 @@
-from typing import Literal
-from flask import Blueprint, Response, abort, request, jsonify
+from typing import Iterator, Literal
+from flask import Blueprint, Response, abort, current_app, request, jsonify
 from flask_jwt_extended import jwt_required
-from app.db.schema import TestSuite, TestCase, TestResult
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.db.schema import ExecutionJob, TestSuite, TestCase, TestResult, TestRun
 from app.extensions import db
-from app.services.api_test_execution_service import execute_test_suite, execute_test_case
+from app.db.cache import cached_get_or_404
+from app.db.routing import replica_reads, use_replica
+from app.db.unit_of_work import unit_of_work
+from app.api.jobs import job_accepted
+from app.services.execution_job_service import ExecutionJobService
+from app.services.result_archive_service import ResultArchiveService
+from app.services.test_management_service import BulkResult, TestManagementService
+from app.utils.conditional import conditional_get
+from app.utils.fieldsets import Fieldset, fieldset_options, parse_fieldset_args, serialize_fieldset
 from app.utils.logger import api_logger
+from app.utils.pagination import Page, paginate, pagination_headers, parse_pagination_args
+from app.utils.serialization import json_array_response
 
 
 test_management_routes = Blueprint('test_management', __name__)
 
+# Relationships the test suite lists embed, and may leave out with ?fields= or ?include=
+SUITE_INCLUDES: tuple = ('test_cases',)
+
+
+def bulk_response(result: BulkResult, key: str, success: int) -> tuple[Response, int]:
+    """
+    Build the response of a bulk request from its outcome.
+
+    Parameters:
+        result (BulkResult): The written entities and the rejected items.
+        key (str): The key of the written entities, 'created' or 'updated'.
+        success (int): The status code when every item was written.
+
+    Returns:
+        tuple[Response, int]: ``success`` if every item was written, 207 if some items were rejected,
+            or 400 if all of them were.
+    """
+    status: int = success if not result.errors else 207 if result.items else 400
+    return jsonify({key: result.items, "errors": result.errors}), status
+
 
 @test_management_routes.route('/testsuites', methods=['GET', 'POST'])
 @jwt_required()
+@conditional_get(TestSuite, TestCase)
+@replica_reads
 def test_suites() -> Response | tuple[Response, Literal[201]] | None:
     """
     Retrieve or create test suites.
 
+    Query Parameters:
+        fields (str): Comma-separated columns to return, and 'test_cases' to embed them; every column by default.
+        include (str): Comma-separated relationships to embed; 'test_cases' unless fields or include is given.
+
     Returns:
         Tuple[jsonify, int]: A JSON response with the test suites data and the HTTP status code.
     """
     if request.method == 'GET':
+        try:
+            limit, after = parse_pagination_args()
+            fieldset: Fieldset = parse_fieldset_args(TestSuite, SUITE_INCLUDES, default_includes=SUITE_INCLUDES)
+        except ValueError as err:
+            api_logger.error(f"Invalid query of test suites: {err}")
+            return jsonify({"error": str(err)}), 400
+
         try:
             api_logger.info("Retrieving test suites")
-            suites: list[TestSuite] = TestSuite.query.all()
-            if not suites:
+            page: Page = paginate(
+                db.session.query(TestSuite).options(*fieldset_options(TestSuite, fieldset, SUITE_INCLUDES)),
+                [(TestSuite.id, False)], limit, after)
+            if not page.items:
                 api_logger.info("No test suites found")
                 return jsonify([]), 200
-            api_logger.info(f"Found {len(suites)} test suites")
-            return jsonify([suite.to_dict() for suite in suites]), 200
+            api_logger.info(f"Found {len(page.items)} test suites")
+            return jsonify([serialize_fieldset(suite, fieldset) for suite in page.items]), 200, \
+                pagination_headers(page, limit)
+        except ValueError as err:
+            api_logger.error(f"Invalid pagination of test suites: {err}")
+            return jsonify({"error": str(err)}), 400
         except Exception as e:
             api_logger.error(f"Error retrieving test suites: {e}")
             return jsonify({"error": str(e)}), 500
@@ -35,22 +86,47 @@ def test_suites() -> Response | tuple[Response, Literal[201]] | None:
     elif request.method == 'POST':
         try:
             data = request.get_json()
-            new_suite = TestSuite(
-                name=data['name'], description=data.get('description', ''))
-            db.session.add(new_suite)
-            db.session.commit()
+            with unit_of_work() as uow:
+                new_suite = uow.add(TestSuite(name=data['name'], description=data.get('description', '')))
             api_logger.info(f"Added new test suite: {new_suite.name}")
             return jsonify(new_suite.to_dict()), 201
         except Exception as e:
-            db.session.rollback()
             api_logger.error(f"Error creating test suite: {e}")
             return jsonify({"error": str(e)}), 500
 
     return None
 
 
+@test_management_routes.route('/testsuites/bulk', methods=['POST', 'PUT'])
+@jwt_required()
+def bulk_test_suites() -> tuple[Response, int]:
+    """
+    Create or update many test suites in one transaction.
+
+    POST takes an array of suites, each with an optional array of test cases; PUT takes an array
+    of suites with their ID and the fields to change. Invalid items and unknown IDs are reported
+    under "errors" with their index in the array, and the other items are still written.
+
+    Returns:
+        tuple[Response, int]: 201 (POST) or 200 (PUT) if every item was written, 207 if some were
+            rejected, or 400 if all of them were or the body is not an acceptable array.
+    """
+    service = TestManagementService()
+    try:
+        if request.method == 'POST':
+            return bulk_response(service.create_test_suites(request.get_json(silent=True)), 'created', 201)
+        return bulk_response(service.update_test_suites(request.get_json(silent=True)), 'updated', 200)
+    except ValueError as err:
+        api_logger.error(f"Invalid bulk request for test suites: {err}")
+        return jsonify({"error": str(err)}), 400
+    except Exception as err:
+        api_logger.error(f"Error writing test suites in bulk: {err}")
+        return jsonify({"error": str(err)}), 500
+
+
 @test_management_routes.route('/testsuites/<int:suite_id>', methods=['GET', 'PUT', 'DELETE'])
 @jwt_required()
+@replica_reads
 def test_suite(suite_id) -> Response | tuple[Response, Literal[204]] | None:
     """
     Retrieves, updates, or deletes a test suite.
@@ -64,14 +140,18 @@ def test_suite(suite_id) -> Response | tuple[Response, Literal[204]] | None:
     - None: If the request method is not supported.
     """
     try:
-        suite: TestSuite = TestSuite.query.get_or_404(suite_id)
-        api_logger.info(f"Found test suite: {suite.name}")
+        suite: TestSuite | None = db.session.get(
+            TestSuite, suite_id, options=[selectinload(TestSuite.test_cases)])
 
     except Exception as err:
         api_logger.error(f"Error retrieving test suite {suite_id}: {err}")
         abort(
             500, description=f"Error retrieving test suite {suite_id}: {err}")
 
+    if suite is None:
+        abort(404, description=f"Test suite {suite_id} not found")
+    api_logger.info(f"Found test suite: {suite.name}")
+
     if request.method == 'GET':
         api_logger.info(f"Retrieving test suite: {suite_id}")
         return jsonify(suite.to_dict())
@@ -79,9 +159,9 @@ def test_suite(suite_id) -> Response | tuple[Response, Literal[204]] | None:
     elif request.method == 'PUT':
         try:
             data: dict[str, str] = request.get_json()
-            suite.name: str = data.get('name', suite.name)
-            suite.description: str = data.get('description', suite.description)
-            db.session.commit()
+            with unit_of_work():
+                suite.name: str = data.get('name', suite.name)
+                suite.description: str = data.get('description', suite.description)
             api_logger.info(f"Updated test suite: {suite_id}")
             return jsonify(suite.to_dict())
 
@@ -92,8 +172,8 @@ def test_suite(suite_id) -> Response | tuple[Response, Literal[204]] | None:
 
     elif request.method == 'DELETE':
         try:
-            db.session.delete(suite)
-            db.session.commit()
+            with unit_of_work() as uow:
+                uow.delete(suite)
             api_logger.info(f"Deleted test suite: {suite_id}")
             return jsonify({}), 204
 
@@ -105,30 +185,62 @@ def test_suite(suite_id) -> Response | tuple[Response, Literal[204]] | None:
 
 @test_management_routes.route('/testsuites/<int:suite_id>/execute', methods=['POST'])
 @jwt_required()
-def execute_suite(suite_id) -> tuple[Response, Literal[200]] | tuple[Response, Literal[404]]:
+def execute_suite(suite_id) -> tuple[Response, int] | tuple[Response, int, dict[str, str]]:
     """
-    Executes a test suite.
+    Queues the execution of a test suite for the workers.
 
     Parameters:
         suite_id (int): The ID of the test suite to execute.
 
     Returns:
-        tuple[Response, Literal[200]] | tuple[Response, Literal[404]]: A tuple containing a Flask Response object and a status code. If the test suite execution is successful, the response will contain the results of the execution and the status code will be 200. If the test suite does not exist, the response will contain an error message and the status code will be 404.
+        tuple[Response, int, dict[str, str]]: 202 with the execution job, whose status URL is in the Location header,
+            404 if the test suite does not exist, or 503 if the job could not be queued.
     """
     try:
-        results: list[TestResult] | None = execute_test_suite(suite_id)
-        if not results:
-            api_logger.info(f"Test suite {suite_id} not found")
-            return jsonify({"error": "Test suite not found"}), 404
-        api_logger.info(f"Executed test suite {suite_id}")
-        return jsonify(results), 200
-
+        job: ExecutionJob = ExecutionJobService().enqueue('test_suite', suite_id)
     except ValueError as e:
         api_logger.error(f"Error executing test suite {suite_id}: {e}")
         return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        api_logger.error(f"Error queuing test suite {suite_id}: {e}")
+        return jsonify({"error": str(e)}), 503
+
+    api_logger.info(f"Queued test suite {suite_id} as job {job.id}")
+    return job_accepted(job)
+
+
+@test_management_routes.route('/testsuites/<int:suite_id>/runs', methods=['GET'])
+@jwt_required()
+@replica_reads
+def test_suite_runs(suite_id) -> tuple[Response, int] | tuple[Response, int, dict[str, str]]:
+    """
+    List the runs of a test suite, most recent first, with their result counters.
+
+    The counters are stored on the runs when their results are committed, at the end of
+    each run, so a page is a single scan of the (test_suite_id, created_at) index without
+    aggregating the results. A run still executing lists zero results.
+
+    Parameters:
+        suite_id (int): The ID of the test suite.
+
+    Returns:
+        tuple[Response, int, dict[str, str]]: The page of runs, with the cursor of the next one in the X-Next-Cursor and Link headers.
+    """
+    try:
+        limit, after = parse_pagination_args()
+        page: Page = paginate(db.session.query(TestRun).filter_by(test_suite_id=suite_id),
+                              [(TestRun.created_at, True), (TestRun.id, True)], limit, after)
+    except ValueError as err:
+        api_logger.error(f"Invalid pagination of runs of test suite {suite_id}: {err}")
+        return jsonify({"error": str(err)}), 400
+
+    api_logger.info(f"Found {len(page.items)} runs of test suite {suite_id}")
+    return jsonify([run.to_dict() for run in page.items]), 200, pagination_headers(page, limit)
 
 
 @test_management_routes.route('/testcases', methods=['GET', 'POST'])
+@conditional_get(TestCase)
+@replica_reads
 def test_cases() -> Response | tuple[Response, Literal[201]] | None:
     """
     Route handler for '/testcases' endpoint.
@@ -138,6 +250,9 @@ def test_cases() -> Response | tuple[Response, Literal[201]] | None:
     Parameters:
         None
 
+    Query Parameters:
+        fields (str): Comma-separated columns of the test cases to return on GET; every column by default.
+
     Returns:
         - If the request method is GET:
             - A JSON response containing a list of all test cases and status code 200.
@@ -154,23 +269,27 @@ def test_cases() -> Response | tuple[Response, Literal[201]] | None:
     """
     if request.method == 'GET':
         try:
-            cases: list[TestCase] = TestCase.query.all()
-            if not cases:
+            limit, after = parse_pagination_args()
+            fieldset: Fieldset = parse_fieldset_args(TestCase)
+            page: Page = paginate(
+                db.session.query(TestCase).options(*fieldset_options(TestCase, fieldset)), [(TestCase.id, False)],
+                limit, after)
+            if not page.items:
                 api_logger.info("No test cases found")
                 return jsonify([]), 200
-            api_logger.info("Fetched all test cases")
-            return jsonify([case.to_dict() for case in cases]), 200
+            api_logger.info(f"Fetched {len(page.items)} test cases")
+            return jsonify([serialize_fieldset(case, fieldset) for case in page.items]), 200, \
+                pagination_headers(page, limit)
 
         except Exception as err:
             api_logger.error(f"Error fetching test cases: {err}")
-            return jsonify({"error": str(e)}), 400
+            return jsonify({"error": str(err)}), 400
 
     elif request.method == 'POST':
         try:
             data = request.get_json()
-            new_case: TestCase = TestCase(**data)
-            db.session.add(new_case)
-            db.session.commit()
+            with unit_of_work() as uow:
+                new_case: TestCase = uow.add(TestCase(**data))
             api_logger.info(f"Added new test case: {new_case.name}")
             return jsonify(new_case.to_dict()), 201
 
@@ -202,10 +321,9 @@ def add_test_case_to_suite(suite_id) -> tuple[Response, Literal[201]]:
             abort(404, description="Test suite not found.")
 
         data = request.get_json()
-        new_case = TestCase(name=data['name'], description=data.get(
-            'description', ''), test_suite_id=suite_id)
-        db.session.add(new_case)
-        db.session.commit()
+        with unit_of_work() as uow:
+            new_case = uow.add(TestCase(name=data['name'], description=data.get(
+                'description', ''), test_suite_id=suite_id))
         api_logger.info(
             f"Added new test case {new_case.name} to test suite {suite_id}")
 
@@ -218,13 +336,65 @@ def add_test_case_to_suite(suite_id) -> tuple[Response, Literal[201]]:
     except Exception as err:
         api_logger.error(
             f"Error adding test case to test suite {suite_id}: {err}")
-        db.session.rollback()
         abort(
             500, description=f"Error adding test case to test suite {suite_id}: {err}")
         raise err
     return jsonify(new_case.to_dict()), 201
 
 
+@test_management_routes.route('/testsuites/<int:suite_id>/testcases/bulk', methods=['POST'])
+@jwt_required()
+def bulk_add_test_cases_to_suite(suite_id) -> tuple[Response, int]:
+    """
+    Add many test cases to a test suite in one transaction.
+
+    Invalid items are reported under "errors" with their index in the array, and the other items
+    are still created.
+
+    Args:
+        suite_id (int): The ID of the test suite.
+
+    Returns:
+        tuple[Response, int]: 201 if every test case was created, 207 if some were rejected, 400 if all
+            of them were or the body is not an acceptable array, or 404 if the test suite is not found.
+    """
+    try:
+        result: BulkResult = TestManagementService().create_test_cases(suite_id, request.get_json(silent=True))
+        return bulk_response(result, 'created', 201)
+    except LookupError as err:
+        api_logger.error(f"Error adding test cases to test suite {suite_id}: {err}")
+        return jsonify({"error": str(err)}), 404
+    except ValueError as err:
+        api_logger.error(f"Invalid bulk request for test suite {suite_id}: {err}")
+        return jsonify({"error": str(err)}), 400
+    except Exception as err:
+        api_logger.error(f"Error adding test cases to test suite {suite_id}: {err}")
+        return jsonify({"error": str(err)}), 500
+
+
+@test_management_routes.route('/testcases/bulk', methods=['PUT'])
+@jwt_required()
+def bulk_update_test_cases() -> tuple[Response, int]:
+    """
+    Update many test cases in one transaction.
+
+    Takes an array of test cases with their ID and the fields to change. Invalid items and unknown
+    IDs are reported under "errors" with their index in the array, and the other items are still updated.
+
+    Returns:
+        tuple[Response, int]: 200 if every test case was updated, 207 if some were rejected, or 400 if
+            all of them were or the body is not an acceptable array.
+    """
+    try:
+        return bulk_response(TestManagementService().update_test_cases(request.get_json(silent=True)), 'updated', 200)
+    except ValueError as err:
+        api_logger.error(f"Invalid bulk request for test cases: {err}")
+        return jsonify({"error": str(err)}), 400
+    except Exception as err:
+        api_logger.error(f"Error updating test cases in bulk: {err}")
+        return jsonify({"error": str(err)}), 500
+
+
 @test_management_routes.route('/testcases/<int:case_id>', methods=['GET', 'PUT', 'DELETE'])
 def test_case(case_id) -> Response | tuple[Response, Literal[204]] | None:
     """
@@ -245,7 +415,7 @@ def test_case(case_id) -> Response | tuple[Response, Literal[204]] | None:
 
     """
     try:
-        case = TestCase.query.get_or_404(case_id)
+        case = cached_get_or_404(TestCase, case_id) if request.method == 'GET' else TestCase.query.get_or_404(case_id)
         api_logger.info(f"Retrieved test case {case.name} with ID {case.id}")
 
     except Exception as err:
@@ -258,27 +428,25 @@ def test_case(case_id) -> Response | tuple[Response, Literal[204]] | None:
     if request.method == 'PUT':
         try:
             data = request.get_json()
-            case.name = data.get('name', case.name)
-            case.description = data.get('description', case.description)
-            db.session.commit()
+            with unit_of_work():
+                case.name = data.get('name', case.name)
+                case.description = data.get('description', case.description)
             api_logger.info(f"Updated test case {case.name} with ID {case.id}")
             return jsonify({'id': case.id, 'name': case.name}), 200
 
         except Exception as err:
-            db.session.rollback()
             api_logger.error(
                 f"Error updating test case {case.name} with ID {case.id}: {err}")
             return jsonify({"error": str(err)}), 400
 
     if request.method == 'DELETE':
         try:
-            db.session.delete(case)
-            db.session.commit()
+            with unit_of_work() as uow:
+                uow.delete(case)
             api_logger.info(f"Deleted test case {case.name} with ID {case.id}")
             return jsonify({}), 204
 
         except Exception as err:
-            db.session.rollback()
             api_logger.error(
                 f"Error deleting test case {case.name} with ID {case.id}: {err}")
             return jsonify({"error": str(err)}), 400
@@ -289,13 +457,14 @@ def test_case(case_id) -> Response | tuple[Response, Literal[204]] | None:
 @test_management_routes.route('/testcases/<int:case_id>/execute', methods=['GET', 'POST'])
 def test_case_execution(case_id) -> Response:
     """
-    Execute a test case.
+    Get the last result of a test case, or queue its execution for the workers.
 
     Args:
         case_id (int): The ID of the test case to execute.
 
     Returns:
-        Response: The response object containing the test case execution status.
+        Response: On GET, the last result of the test case. On POST, 202 with the execution
+            job, whose status URL is in the Location header, or 404 if the test case does not exist.
     """
     if request.method == 'GET':
         # Retrieve the current test case execution status
@@ -324,71 +493,88 @@ def test_case_execution(case_id) -> Response:
             return jsonify(error=str(err)), 500
 
     elif request.method == 'POST':
-        # Execute the test case
+        # Queue the execution of the test case
         try:
-            case = TestCase.query.get_or_404(case_id)
-            result = execute_test_case(case)
-            new_result = TestResult(test_case_id=case_id, result_data=result)
-            db.session.add(new_result)
-            db.session.commit()
-            api_logger.info(
-                f"Executed test case {case.name} with ID {case.id}")
-            return jsonify(new_result.to_dict()), 201
-
+            job: ExecutionJob = ExecutionJobService().enqueue('test_case', case_id)
+        except ValueError as err:
+            api_logger.error(f"Error executing test case {case_id}: {err}")
+            return jsonify(error=str(err)), 404
         except Exception as err:
-            db.session.rollback()
-            api_logger.error(
-                f"Error executing test case {case.name} with ID {case.id}: {err}")
-            return jsonify(error=str(err)), 500
+            api_logger.error(f"Error queuing test case {case_id}: {err}")
+            return jsonify(error=str(err)), 503
+
+        api_logger.info(f"Queued test case {case_id} as job {job.id}")
+        return job_accepted(job)
 
 
 @test_management_routes.route('/testcases/<int:case_id>/results', methods=['GET'])
-def get_test_case_results(case_id) -> Response | tuple[Response, Literal[200]] | None:
+@replica_reads
+def results(case_id) -> Response:
     """
-    Get the test case results for a specific case ID.
+    Get the results for a specific test case, most recent first.
 
-    Args:
+    Parameters:
         case_id (int): The ID of the test case.
 
+    Query Parameters:
+        limit (int): The page size.
+        after (str): The cursor returned with the previous page.
+
     Returns:
-        Response | tuple[Response, Literal[200]] | None: The test case results as a JSON object and the HTTP status code 200 if successful, or None if the test case does not exist.
+        Response: A JSON response containing a page of results of the test case, with the
+            cursor of the next page in the X-Next-Cursor and Link headers. Once the results
+            still in the database are exhausted, pages continue with archived results.
     """
     try:
-        case = TestCase.query.get_or_404(case_id)
-        if not case:
-            api_logger.info(f"Test case {case_id} not found")
-            return jsonify(error="Test case not found"), 404
+        limit, after = parse_pagination_args()
+        page: Page = ResultArchiveService(db.session).page_results(case_id, limit, after)
+    except ValueError as err:
+        api_logger.error(f"Invalid pagination of results for test case {case_id}: {err}")
+        return jsonify(error=str(err)), 400
+    except Exception as err:
+        api_logger.error(
+            f"Error retrieving results for test case {case_id}: {err}")
+        return jsonify(error=str(err)), 500
+
+    try:
+        if not page.items and not after:
+            api_logger.info(f"No results found for test case {case_id}")
+            return jsonify(error="No results found"), 404
 
-        api_logger.info(f"Retrieved test case results for test case {case_id}")
-        return jsonify(case.to_dict()), 200
+        api_logger.info(f"Retrieved {len(page.items)} results for test case {case_id}")
+        return jsonify(page.items), 200, pagination_headers(page, limit)
 
     except Exception as err:
         api_logger.error(
-            f"Error retrieving test case results for test case {case_id}: {err}")
+            f"Error retrieving results for test case {case_id}: {err}")
         return jsonify(error=str(err)), 500
 
 
-@test_management_routes.route('/testcases/<int:case_id>/results', methods=['GET'])
-def results(case_id) -> Response:
+@test_management_routes.route('/testcases/<int:case_id>/results/export', methods=['GET'])
+@jwt_required()
+def export_results(case_id) -> Response:
     """
-    Get the results for a specific test case.
+    Export every result of a test case still in the database, oldest first.
+
+    The results are read in batches of EXPORT_BATCH_SIZE rows and streamed as a JSON array
+    while they are serialized, so memory use does not grow with the number of results.
 
     Parameters:
         case_id (int): The ID of the test case.
 
     Returns:
-        Response: A JSON response containing the results of the test case.
+        Response: A streamed JSON array of the results, or 404 if the test case does not exist.
     """
-    try:
-        results = TestResult.query.filter_by(test_case_id=case_id).all()
-        if not results:
-            api_logger.info(f"No results found for test case {case_id}")
-            return jsonify(error="No results found"), 404
-
-        api_logger.info(f"Retrieved results for test case {case_id}")
-        return jsonify([result.to_dict() for result in results]), 200
-
-    except Exception as err:
-        api_logger.error(
-            f"Error retrieving results for test case {case_id}: {err}")
-        return jsonify(error=str(err)), 500
+    cached_get_or_404(TestCase, case_id)
+    batch_size: int = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+
+    def iter_results() -> Iterator[TestResult]:
+        session = db.session()
+        with use_replica(session):
+            yield from session.scalars(
+                select(TestResult).where(TestResult.test_case_id == case_id)
+                .order_by(TestResult.created_at, TestResult.id).execution_options(yield_per=batch_size))
+
+    api_logger.info(f"Exporting results of test case {case_id}")
+    return json_array_response(iter_results(), TestResult.to_dict, headers={
+        'Content-Disposition': f'attachment; filename="test_case_{case_id}_results.json"'})
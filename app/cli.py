@@ -0,0 +1,27 @@
+from typing import Dict, Optional
+import click
+from flask.cli import with_appcontext
+from app.services.result_archive_service import ResultArchiveService
+from app.utils.logger import app_logger
+
+
+@click.command('archive-results')
+@click.option('--retention-months', type=int, default=None,
+              help='Months of results kept in the database (RESULT_RETENTION_MONTHS by default).')
+@with_appcontext
+def archive_results_command(retention_months: Optional[int]) -> None:
+    """
+    Move test results older than the retention window to Parquet archives.
+
+    Meant to run periodically, e.g. daily from cron: ``flask archive-results``.
+    """
+    try:
+        moved: Dict[int, int] = ResultArchiveService().archive_expired(retention_months)
+    except Exception as err:
+        app_logger.error(f"Error archiving test results: {err}")
+        raise click.ClickException(str(err))
+
+    for month, count in moved.items():
+        click.echo(f"Archived {count} test results of {month}")
+    if not moved:
+        click.echo("No test results to archive")
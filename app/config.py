@@ -15,6 +15,53 @@ class Config:
         KEYCLOAK_CLIENT_ID (str): Keycloak client ID.
         KEYCLOAK_CLIENT_SECRET (str): Keycloak client secret.
         JWT_SECRET_KEY (str): Secret key for JWT.
+        PERFORMANCE_QUERY_MAX_RANGE_SECONDS (int): Widest time range a performance series query may span.
+        PERFORMANCE_QUERY_MAX_POINTS (int): Maximum number of buckets returned per performance metric.
+        PERFORMANCE_QUERY_CHUNK_SIZE (int): Number of points per chunk when streaming from InfluxDB.
+        LATENCY_SKETCH_COMPRESSION (float): t-digest compression used for latency sketches.
+        LATENCY_SKETCH_WINDOW_SECONDS (int): Width of the rolling windows latency sketches are kept for.
+        REGRESSION_BASELINE_RUNS (int): Number of previous runs forming the rolling baseline.
+        REGRESSION_MIN_BASELINE_RUNS (int): Minimum number of baseline runs needed to issue a verdict.
+        REGRESSION_SAMPLE_SIZE (int): Number of latency quantiles drawn from each sketch for the Mann-Whitney test.
+        REGRESSION_ALPHA (float): Significance level of the Mann-Whitney test.
+        REGRESSION_MIN_EFFECT_SIZE (float): Minimum Cliff's delta for a slowdown to count as a regression.
+        REGRESSION_MIN_SLOWDOWN (float): Minimum relative increase of the median latency to count as a regression.
+        INFLUXDB_HOST (str): InfluxDB host name.
+        INFLUXDB_PORT (int): InfluxDB HTTP port.
+        INFLUXDB_USERNAME (str): InfluxDB user name.
+        INFLUXDB_PASSWORD (str): InfluxDB password.
+        INFLUXDB_DATABASE (str): InfluxDB database holding the performance measurements.
+        INFLUXDB_TIMEOUT (int): InfluxDB request timeout in seconds.
+        INFLUXDB_RETRIES (int): Number of retries for failed InfluxDB requests.
+        INFLUXDB_POOL_SIZE (int): Size of the per-process InfluxDB HTTP connection pool.
+        REDIS_URL (str): Redis connection URL.
+        REDIS_MAX_CONNECTIONS (int): Size of the per-process Redis connection pool.
+        REDIS_POOL_TIMEOUT (int): Seconds to wait for a free Redis connection before failing.
+        REDIS_SOCKET_TIMEOUT (float): Redis socket read/write timeout in seconds.
+        REDIS_SOCKET_CONNECT_TIMEOUT (float): Redis connect timeout in seconds.
+        REDIS_HEALTH_CHECK_INTERVAL (int): Seconds of idleness after which a pooled Redis connection is pinged before use.
+        PAGINATION_DEFAULT_LIMIT (int): Page size of list endpoints when no limit is requested.
+        PAGINATION_MAX_LIMIT (int): Largest page size a list endpoint may be asked for.
+        SQLALCHEMY_REPLICA_URIS (list[str]): Database URIs of the read replicas serving read-only endpoints.
+        DB_POOL_SIZE (int): Connections kept open per database engine in each worker process.
+        DB_MAX_OVERFLOW (int): Extra connections an engine may open beyond DB_POOL_SIZE under bursts.
+        DB_POOL_TIMEOUT (int): Seconds a request waits for a free connection before failing.
+        DB_POOL_RECYCLE (int): Age in seconds after which a pooled connection is replaced.
+        DB_POOL_PRE_PING (bool): Whether to test pooled connections before handing them out.
+        ARCHIVE_DIR (str): Directory holding the Parquet archives of old test results.
+        RESULT_RETENTION_MONTHS (int): Months of test results kept in the database besides the current one.
+        ARCHIVE_BATCH_SIZE (int): Rows read and deleted per statement when archiving a month.
+        ENTITY_CACHE_ENABLED (bool): Whether hot entity lookups are served from the Redis entity cache.
+        ENTITY_CACHE_TTL (int): Seconds a cached entity is kept in Redis.
+        ENTITY_CACHE_LOCAL_SIZE (int): Entities kept in the in-process LRU tier, 0 to disable it.
+        ENTITY_CACHE_LOCAL_TTL (float): Seconds an entity is served from the in-process tier without asking Redis.
+        ETAG_REPLICA_LAG (float): Seconds after a write during which list responses read from a replica get no ETag.
+        RESPONSE_COMPRESSION_ENABLED (bool): Whether responses are compressed according to Accept-Encoding.
+        RESPONSE_COMPRESSION_MIN_SIZE (int): Minimum body size in bytes for a non-streamed response to be compressed.
+        RESPONSE_COMPRESSION_GZIP_LEVEL (int): zlib level of gzip-encoded responses.
+        RESPONSE_COMPRESSION_BROTLI_QUALITY (int): Quality of brotli-encoded responses, low values favoring speed.
+        EXPORT_BATCH_SIZE (int): Rows fetched per round trip while streaming an export.
+        BULK_MAX_ITEMS (int): Largest number of items a bulk create or update request may carry.
     """
     SECRET_KEY: str = os.getenv('SECRET_KEY', 'secret')
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
@@ -27,6 +74,55 @@ class Config:
     CELERY_RESULT_BACKEND: str = os.getenv('CELERY_RESULT_BACKEND')
     SWAGGER_URL: str = os.getenv('SWAGGER_URL')
     SWAGGER_API_URL: str = os.getenv('SWAGGER_API_URL')
+    PERFORMANCE_QUERY_MAX_RANGE_SECONDS: int = int(
+        os.getenv('PERFORMANCE_QUERY_MAX_RANGE_SECONDS', 7 * 24 * 3600))
+    PERFORMANCE_QUERY_MAX_POINTS: int = int(os.getenv('PERFORMANCE_QUERY_MAX_POINTS', 10000))
+    PERFORMANCE_QUERY_CHUNK_SIZE: int = int(os.getenv('PERFORMANCE_QUERY_CHUNK_SIZE', 2000))
+    LATENCY_SKETCH_COMPRESSION: float = float(os.getenv('LATENCY_SKETCH_COMPRESSION', 200))
+    LATENCY_SKETCH_WINDOW_SECONDS: int = int(os.getenv('LATENCY_SKETCH_WINDOW_SECONDS', 3600))
+    REGRESSION_BASELINE_RUNS: int = int(os.getenv('REGRESSION_BASELINE_RUNS', 10))
+    REGRESSION_MIN_BASELINE_RUNS: int = int(os.getenv('REGRESSION_MIN_BASELINE_RUNS', 3))
+    REGRESSION_SAMPLE_SIZE: int = int(os.getenv('REGRESSION_SAMPLE_SIZE', 500))
+    REGRESSION_ALPHA: float = float(os.getenv('REGRESSION_ALPHA', 0.01))
+    REGRESSION_MIN_EFFECT_SIZE: float = float(os.getenv('REGRESSION_MIN_EFFECT_SIZE', 0.147))
+    REGRESSION_MIN_SLOWDOWN: float = float(os.getenv('REGRESSION_MIN_SLOWDOWN', 0.05))
+    INFLUXDB_HOST: str = os.getenv('INFLUXDB_HOST', 'influxdb_host')
+    INFLUXDB_PORT: int = int(os.getenv('INFLUXDB_PORT', 8086))
+    INFLUXDB_USERNAME: str = os.getenv('INFLUXDB_USERNAME', 'admin')
+    INFLUXDB_PASSWORD: str = os.getenv('INFLUXDB_PASSWORD', 'admin')
+    INFLUXDB_DATABASE: str = os.getenv('INFLUXDB_DATABASE', 'ator')
+    INFLUXDB_TIMEOUT: int = int(os.getenv('INFLUXDB_TIMEOUT', 10))
+    INFLUXDB_RETRIES: int = int(os.getenv('INFLUXDB_RETRIES', 3))
+    INFLUXDB_POOL_SIZE: int = int(os.getenv('INFLUXDB_POOL_SIZE', 10))
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://redis_host:6379/0')
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+    REDIS_POOL_TIMEOUT: int = int(os.getenv('REDIS_POOL_TIMEOUT', 5))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv('REDIS_SOCKET_TIMEOUT', 5))
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = float(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 2))
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
+    PAGINATION_DEFAULT_LIMIT: int = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 50))
+    PAGINATION_MAX_LIMIT: int = int(os.getenv('PAGINATION_MAX_LIMIT', 500))
+    SQLALCHEMY_REPLICA_URIS: list[str] = [
+        uri.strip() for uri in os.getenv('SQLALCHEMY_REPLICA_URIS', '').split(',') if uri.strip()]
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT: int = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    ARCHIVE_DIR: str = os.getenv('ARCHIVE_DIR', 'archive')
+    RESULT_RETENTION_MONTHS: int = int(os.getenv('RESULT_RETENTION_MONTHS', 6))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv('ARCHIVE_BATCH_SIZE', 5000))
+    ENTITY_CACHE_ENABLED: bool = os.getenv('ENTITY_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    ENTITY_CACHE_TTL: int = int(os.getenv('ENTITY_CACHE_TTL', 3600))
+    ENTITY_CACHE_LOCAL_SIZE: int = int(os.getenv('ENTITY_CACHE_LOCAL_SIZE', 1024))
+    ENTITY_CACHE_LOCAL_TTL: float = float(os.getenv('ENTITY_CACHE_LOCAL_TTL', 5))
+    ETAG_REPLICA_LAG: float = float(os.getenv('ETAG_REPLICA_LAG', 5))
+    RESPONSE_COMPRESSION_ENABLED: bool = os.getenv('RESPONSE_COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RESPONSE_COMPRESSION_MIN_SIZE: int = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+    RESPONSE_COMPRESSION_GZIP_LEVEL: int = int(os.getenv('RESPONSE_COMPRESSION_GZIP_LEVEL', 6))
+    RESPONSE_COMPRESSION_BROTLI_QUALITY: int = int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))
+    EXPORT_BATCH_SIZE: int = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    BULK_MAX_ITEMS: int = int(os.getenv('BULK_MAX_ITEMS', 5000))
     app_logger.info("Base configuration loaded")
 
 
@@ -0,0 +1,277 @@
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+import jwt as pyjwt
+from quart import Blueprint, Quart, current_app, jsonify, request
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import config_by_name
+from app.db.aio import create_read_engine, create_read_sessionmaker
+from app.db.schema import PERFORMANCE_RUN_COMPLETED, PerformanceTest, PerformanceTestResult, TestCase, TestResult, \
+    TestSuite
+from app.utils.fieldsets import Fieldset, fieldset_options, parse_fieldset_args, serialize_fieldset
+from app.utils.logger import api_logger
+from app.utils.pagination import Page, paginate_async, pagination_headers, parse_pagination_args
+
+dashboard_routes: Blueprint = Blueprint('dashboard', __name__)
+
+# Orderings of the paginated lists, newest results first
+SUITE_ORDER: list = [(TestSuite.id, False)]
+PERFORMANCE_TEST_ORDER: list = [(PerformanceTest.id, False)]
+RESULT_ORDER: list = [(TestResult.created_at, True), (TestResult.id, True)]
+PERFORMANCE_RESULT_ORDER: list = [(PerformanceTestResult.executed_at, True), (PerformanceTestResult.id, True)]
+
+# Relationships the test suite list embeds, and may leave out with ?fields= or ?include=
+SUITE_INCLUDES: tuple = ('test_cases',)
+
+
+def read_session() -> AsyncSession:
+    """
+    Open an asyncio session on the read engine of the dashboard.
+
+    Returns:
+        AsyncSession: A session to use as an async context manager.
+    """
+    return current_app.extensions['read_sessions']()
+
+
+def token_required(view: Callable) -> Callable:
+    """
+    Decorator rejecting requests without a valid access token, like ``jwt_required()``
+    does for the Flask API, with which the tokens are shared.
+
+    Args:
+        view (Callable): The async view function.
+
+    Returns:
+        Callable: The wrapped view.
+    """
+    @wraps(view)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        try:
+            if scheme != 'Bearer' or not token:
+                raise pyjwt.InvalidTokenError("Missing bearer token")
+            claims: Dict[str, Any] = pyjwt.decode(
+                token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+            if claims.get('type', 'access') != 'access':
+                raise pyjwt.InvalidTokenError("Not an access token")
+        except pyjwt.InvalidTokenError as err:
+            api_logger.warning(f"Rejected dashboard request to {request.path}: {err}")
+            return jsonify(error=str(err)), 401
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+async def _page_response(statement: Any, order_by: list, serialize: Callable[[Any], Dict[str, Any]]) -> Any:
+    try:
+        limit, after = parse_pagination_args(request.args, current_app.config)
+        async with read_session() as session:
+            page: Page = await paginate_async(session, statement, order_by, limit, after)
+    except ValueError as err:
+        api_logger.error(f"Invalid pagination of {request.path}: {err}")
+        return jsonify(error=str(err)), 400
+    return jsonify([serialize(item) for item in page.items]), 200, pagination_headers(page, limit, request)
+
+
+@dashboard_routes.route('/testsuites')
+@token_required
+async def test_suites() -> Any:
+    """
+    List the test suites with their test cases, one page at a time.
+
+    Query Parameters:
+        fields (str): Comma-separated columns to return, and 'test_cases' to embed them; every column by default.
+        include (str): Comma-separated relationships to embed; 'test_cases' unless fields or include is given.
+
+    Returns:
+        Response: The page of test suites, with the cursor of the next one in the X-Next-Cursor and Link headers.
+    """
+    try:
+        fieldset: Fieldset = parse_fieldset_args(TestSuite, SUITE_INCLUDES, SUITE_INCLUDES, request.args)
+    except ValueError as err:
+        api_logger.error(f"Invalid fields of {request.path}: {err}")
+        return jsonify(error=str(err)), 400
+    return await _page_response(select(TestSuite).options(*fieldset_options(TestSuite, fieldset, SUITE_INCLUDES)),
+                                SUITE_ORDER, lambda suite: serialize_fieldset(suite, fieldset))
+
+
+@dashboard_routes.route('/testsuites/<int:suite_id>/summary')
+@token_required
+async def test_suite_summary(suite_id: int) -> Any:
+    """
+    Summarize the results of the test cases of a test suite.
+
+    Query Parameters:
+        since (str): Only count results created at or after this time (ISO 8601).
+
+    Returns:
+        Response: The number of test cases and, per test case, the number of results, passed
+            results and the mean execution time, or 404 if the suite does not exist.
+    """
+    try:
+        since: Optional[datetime] = datetime.fromisoformat(request.args['since']) if 'since' in request.args else None
+    except ValueError as err:
+        return jsonify(error=str(err)), 400
+
+    joined = TestResult.test_case_id == TestCase.id
+    if since:
+        joined = and_(joined, TestResult.created_at >= since)
+    statement = (
+        select(TestCase.id, TestCase.name, func.count(TestResult.id),
+               func.sum(case((TestResult.status == 'Passed', 1), else_=0)), func.avg(TestResult.execution_time))
+        .outerjoin(TestResult, joined)
+        .where(TestCase.test_suite_id == suite_id)
+        .group_by(TestCase.id, TestCase.name)
+        .order_by(TestCase.id))
+    async with read_session() as session:
+        if await session.get(TestSuite, suite_id) is None:
+            return jsonify(error=f"Test suite {suite_id} not found"), 404
+        rows = (await session.execute(statement)).all()
+
+    test_cases: List[Dict[str, Any]] = [{
+        'test_case_id': case_id, 'name': name, 'results': results, 'passed': int(passed or 0),
+        'pass_rate': (passed or 0) / results if results else None, 'avg_execution_time': avg_execution_time,
+    } for case_id, name, results, passed, avg_execution_time in rows]
+    api_logger.info(f"Summarized results of test suite {suite_id}")
+    return jsonify(test_suite_id=suite_id, test_cases=test_cases), 200
+
+
+@dashboard_routes.route('/testcases/<int:case_id>/results')
+@token_required
+async def test_case_results(case_id: int) -> Any:
+    """
+    List the results of a test case still in the database, most recent first.
+
+    Returns:
+        Response: The page of results, with the cursor of the next one in the X-Next-Cursor and Link headers.
+    """
+    return await _page_response(
+        select(TestResult).where(TestResult.test_case_id == case_id), RESULT_ORDER, TestResult.to_dict)
+
+
+@dashboard_routes.route('/performancetests')
+@token_required
+async def performance_tests() -> Any:
+    """
+    List the performance tests, one page at a time.
+
+    Returns:
+        Response: The page of performance tests, with the cursor of the next one in the X-Next-Cursor and Link headers.
+    """
+    return await _page_response(select(PerformanceTest), PERFORMANCE_TEST_ORDER, PerformanceTest.to_dict)
+
+
+@dashboard_routes.route('/performancetests/<int:test_id>/results')
+@token_required
+async def performance_test_results(test_id: int) -> Any:
+    """
+    List the results of a performance test, most recent first.
+
+    Returns:
+        Response: The page of results, with the cursor of the next one in the X-Next-Cursor and Link headers.
+    """
+    return await _page_response(
+        select(PerformanceTestResult).where(PerformanceTestResult.performance_test_id == test_id),
+        PERFORMANCE_RESULT_ORDER, PerformanceTestResult.to_dict)
+
+
+@dashboard_routes.route('/performancetests/<int:test_id>/summary')
+@token_required
+async def performance_test_summary(test_id: int) -> Any:
+    """
+    Aggregate the runs of a performance test.
+
+    Returns:
+        Response: The number of runs, passed (completed) runs, the mean and worst average response time,
+            the mean throughput and the time of the last run, or 404 if the test does not exist.
+    """
+    statement = select(
+        func.count(PerformanceTestResult.id),
+        func.sum(case((PerformanceTestResult.status == PERFORMANCE_RUN_COMPLETED, 1), else_=0)),
+        func.avg(PerformanceTestResult.avg_response_time),
+        func.max(PerformanceTestResult.avg_response_time),
+        func.avg(PerformanceTestResult.requests_per_sec),
+        func.max(PerformanceTestResult.executed_at),
+    ).where(PerformanceTestResult.performance_test_id == test_id)
+    async with read_session() as session:
+        if await session.get(PerformanceTest, test_id) is None:
+            return jsonify(error=f"Performance test {test_id} not found"), 404
+        runs, passed, avg_response_time, max_response_time, requests_per_sec, last_run = (
+            await session.execute(statement)).one()
+
+    api_logger.info(f"Summarized runs of performance test {test_id}")
+    return jsonify(
+        performance_test_id=test_id, runs=runs, passed=int(passed or 0),
+        avg_response_time=avg_response_time, max_response_time=max_response_time,
+        avg_requests_per_sec=requests_per_sec, last_run=last_run.isoformat() if last_run else None), 200
+
+
+@dashboard_routes.route('/performancetests/<int:test_id>/trend')
+@token_required
+async def performance_test_trend(test_id: int) -> Any:
+    """
+    Return the per-run time series of a performance test, oldest run first.
+
+    Query Parameters:
+        since (str): Only include runs executed at or after this time (ISO 8601).
+        until (str): Only include runs executed before this time (ISO 8601).
+        limit (int): Maximum number of runs, the most recent ones being kept.
+
+    Returns:
+        Response: One point per run with its execution time, average response time and throughput.
+    """
+    try:
+        limit, _ = parse_pagination_args(request.args, current_app.config)
+        since: Optional[datetime] = datetime.fromisoformat(request.args['since']) if 'since' in request.args else None
+        until: Optional[datetime] = datetime.fromisoformat(request.args['until']) if 'until' in request.args else None
+    except ValueError as err:
+        return jsonify(error=str(err)), 400
+
+    statement = select(
+        PerformanceTestResult.executed_at, PerformanceTestResult.avg_response_time,
+        PerformanceTestResult.requests_per_sec, PerformanceTestResult.execution_time,
+    ).where(PerformanceTestResult.performance_test_id == test_id)
+    if since:
+        statement = statement.where(PerformanceTestResult.executed_at >= since)
+    if until:
+        statement = statement.where(PerformanceTestResult.executed_at < until)
+    statement = statement.order_by(PerformanceTestResult.executed_at.desc(), PerformanceTestResult.id.desc()).limit(limit)
+    async with read_session() as session:
+        rows = (await session.execute(statement)).all()
+
+    return jsonify([{
+        'time': executed_at.isoformat(), 'avg_response_time': avg_response_time,
+        'requests_per_sec': requests_per_sec, 'execution_time': execution_time,
+    } for executed_at, avg_response_time, requests_per_sec, execution_time in reversed(rows)]), 200
+
+
+def create_dashboard_app(config_name: str) -> Quart:
+    """
+    Create the ASGI application serving the read-only dashboard endpoints.
+
+    Queries run on an asyncio engine, against the read replicas when there are any, so that
+    a worker keeps serving other clients while a slow query is waiting on the database.
+
+    Args:
+        config_name (str): The configuration name to use (e.g., 'development', 'testing', 'production').
+
+    Returns:
+        Quart: The configured dashboard application.
+    """
+    app: Quart = Quart(__name__)
+    app.config.from_object(config_by_name[config_name])
+    app.register_blueprint(dashboard_routes, url_prefix='/api/dashboard')
+
+    @app.before_serving
+    async def open_read_engine() -> None:
+        engine = create_read_engine(app.config)
+        app.extensions['read_engine'] = engine
+        app.extensions['read_sessions'] = create_read_sessionmaker(engine)
+        api_logger.info("Dashboard read engine created")
+
+    @app.after_serving
+    async def close_read_engine() -> None:
+        await app.extensions.pop('read_engine').dispose()
+
+    return app
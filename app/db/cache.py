@@ -0,0 +1,372 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Type, TypeVar
+from flask import abort
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from app.utils.logger import db_logger
+
+T = TypeVar('T')
+
+# Prefix of the Redis keys of the entity cache
+CACHE_KEY_PREFIX: str = 'entity'
+
+# Tables whose rows may be served from the cache, mapped to their model
+_cached_models: Dict[str, Type[Any]] = {}
+
+# Tables whose version is kept for conditional requests
+_versioned_tables: Set[str] = set()
+
+
+def register_cached_model(*models: Type[Any]) -> None:
+    """
+    Allow the rows of the given models to be served by ``cached_get``.
+
+    Writes to their tables made through a session invalidate the cached rows on commit.
+
+    Args:
+        *models (Type[Any]): Mapped classes with a single-column primary key.
+    """
+    for model in models:
+        _cached_models[model.__tablename__] = model
+
+
+def register_versioned_model(*models: Type[Any]) -> None:
+    """
+    Keep a version of the tables of the given models, see ``EntityCache.table_versions``.
+
+    Args:
+        *models (Type[Any]): Mapped classes.
+    """
+    for model in models:
+        _versioned_tables.add(model.__tablename__)
+
+
+class LocalLRU:
+    """
+    Thread-safe, size-bounded in-process cache whose entries expire after a fixed time.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry is served for.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Tuple[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry: Optional[Tuple[float, Dict[str, Any]]] = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Tuple[str, Any], row: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, row)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, table: str, ident: Any = None) -> None:
+        with self._lock:
+            if ident is not None:
+                self._entries.pop((table, ident), None)
+            else:
+                for key in [key for key in self._entries if key[0] == table]:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _dump_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _load_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type: type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+class EntityCache:
+    """
+    Versioned read-through cache of single rows, with a Redis tier shared by all processes
+    and an optional in-process LRU tier in front of it.
+
+    Every cached row is stored under ``entity:<table>:<id>`` together with the version it
+    was read at. The version combines a per-row counter (``entity:<table>:<id>:ver``) and a
+    per-table generation (``entity:<table>:gen``), both incremented after commits that
+    write the row or run bulk DML against the table, so a payload cached by a reader that
+    raced with a writer is simply ignored instead of served stale. The local tier skips
+    Redis altogether, is evicted on commits made in this process, and bounds how long
+    another process' writes can go unseen to ``local_ttl`` seconds.
+
+    Attributes:
+        enabled (bool): Whether lookups use the cache at all.
+        ttl (int): Seconds a row is kept in Redis.
+        local (LocalLRU): The in-process tier.
+    """
+
+    def __init__(self, redis_factory: Optional[Callable[[], Any]] = None, enabled: bool = True,
+                 ttl: int = 3600, local_size: int = 1024, local_ttl: float = 5.0) -> None:
+        self.redis_factory: Optional[Callable[[], Any]] = redis_factory
+        self.enabled: bool = enabled
+        self.ttl: int = ttl
+        self.local: LocalLRU = LocalLRU(local_size, local_ttl)
+
+    def configure(self, config: Mapping[str, Any], redis_factory: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Apply the ENTITY_CACHE_* settings of the application config.
+
+        Args:
+            config (Mapping[str, Any]): The application config.
+            redis_factory (Optional[Callable[[], Any]]): Returns the Redis client to use.
+        """
+        self.redis_factory = redis_factory or self.redis_factory
+        self.enabled = config.get('ENTITY_CACHE_ENABLED', True)
+        self.ttl = config.get('ENTITY_CACHE_TTL', 3600)
+        self.local = LocalLRU(config.get('ENTITY_CACHE_LOCAL_SIZE', 1024), config.get('ENTITY_CACHE_LOCAL_TTL', 5.0))
+
+    @staticmethod
+    def _keys(table: str, ident: Any) -> Tuple[str, str, str]:
+        return (f'{CACHE_KEY_PREFIX}:{table}:gen', f'{CACHE_KEY_PREFIX}:{table}:{ident}:ver',
+                f'{CACHE_KEY_PREFIX}:{table}:{ident}')
+
+    def get(self, session: Session, model: Type[T], ident: Any) -> Optional[T]:
+        """
+        Return the instance of a model with the given primary key, attached to the session.
+
+        Instances already in the session are returned as they are; otherwise the row is
+        read from the local tier, then from Redis, and only then from the database.
+
+        Args:
+            session (Session): The session the instance is attached to.
+            model (Type[T]): The mapped class, registered with ``register_cached_model``.
+            ident (Any): The primary key.
+
+        Returns:
+            Optional[T]: The instance, or None if there is no such row.
+        """
+        table: str = model.__tablename__
+        if not self.enabled or _cached_models.get(table) is not model:
+            return session.get(model, ident)
+        instance: Optional[T] = session.identity_map.get(identity_key(model, ident))
+        if instance is not None:
+            return instance
+
+        row: Optional[Dict[str, Any]] = self.local.get((table, ident))
+        if row is None:
+            row = self._read_through(session, model, table, ident)
+            if row is None:
+                return None
+            self.local.set((table, ident), row)
+        return self._attach(session, model, row)
+
+    def _read_through(self, session: Session, model: Type[Any], table: str,
+                      ident: Any) -> Optional[Dict[str, Any]]:
+        redis: Any = None
+        version: Optional[str] = None
+        if self.redis_factory is not None:
+            try:
+                redis = self.redis_factory()
+                generation, counter, payload = redis.mget(self._keys(table, ident))
+                version = f'{generation or 0}.{counter or 0}'
+                if payload is not None:
+                    cached: Dict[str, Any] = json.loads(payload)
+                    if cached['version'] == version:
+                        return cached['row']
+            except Exception as err:
+                db_logger.warning(f"Entity cache unavailable, reading {table} {ident} from the database: {err}")
+                redis = None
+
+        instance: Optional[Any] = session.get(model, ident)
+        if instance is None:
+            return None
+        row: Dict[str, Any] = {attribute.key: _dump_value(getattr(instance, attribute.key))
+                               for attribute in inspect(model).column_attrs}
+        # Rows read from a lagging replica are not shared with other processes
+        if redis is not None and not (session.info.get('replica_reads') and not session.info.get('pinned_to_primary')):
+            try:
+                redis.set(self._keys(table, ident)[2], json.dumps({'version': version, 'row': row}), ex=self.ttl)
+            except Exception as err:
+                db_logger.warning(f"Error caching {table} {ident}: {err}")
+        return row
+
+    @staticmethod
+    def _attach(session: Session, model: Type[T], row: Dict[str, Any]) -> T:
+        mapper: Any = inspect(model)
+        instance: T = mapper.class_manager.new_instance()
+        for attribute in mapper.column_attrs:
+            setattr(instance, attribute.key, _load_value(attribute.columns[0], row[attribute.key]))
+        make_transient_to_detached(instance)
+        return session.merge(instance, load=False)
+
+    def table_versions(self, tables: Iterable[str]) -> Optional[Tuple[List[str], float]]:
+        """
+        Return the current version of each table, and when the last of them changed.
+
+        Versions are counters incremented after every commit that inserts, updates or deletes
+        rows of a table registered with ``register_versioned_model``; they do not see writes
+        made outside of a session.
+
+        Args:
+            tables (Iterable[str]): The table names.
+
+        Returns:
+            Optional[Tuple[List[str], float]]: The versions in the order of ``tables`` and the
+                Unix time of the most recent change, or None if they cannot be read.
+        """
+        if not self.enabled or self.redis_factory is None:
+            return None
+        keys: List[str] = []
+        for table in tables:
+            keys += [f'{CACHE_KEY_PREFIX}:{table}:rev', f'{CACHE_KEY_PREFIX}:{table}:rev:at']
+        try:
+            values: List[Optional[str]] = self.redis_factory().mget(keys)
+        except Exception as err:
+            db_logger.warning(f"Table versions unavailable: {err}")
+            return None
+        return [values[index] or '0' for index in range(0, len(values), 2)], \
+            max(float(values[index] or 0) for index in range(1, len(values), 2))
+
+    def bump_table_version(self, table: str) -> None:
+        """
+        Mark a versioned table as changed.
+
+        Args:
+            table (str): The table name.
+        """
+        if not self.enabled or self.redis_factory is None:
+            return
+        try:
+            redis: Any = self.redis_factory()
+            redis.incr(f'{CACHE_KEY_PREFIX}:{table}:rev')
+            redis.set(f'{CACHE_KEY_PREFIX}:{table}:rev:at', repr(time.time()))
+        except Exception as err:
+            # Conditional requests may be answered 304 until the next successful bump
+            db_logger.error(f"Error bumping the version of {table}: {err}")
+
+    def invalidate(self, table: str, ident: Any = None) -> None:
+        """
+        Invalidate a cached row, or every row of a table when no primary key is given.
+
+        Args:
+            table (str): The table name.
+            ident (Any): The primary key, if a single row changed.
+        """
+        self.local.discard(table, ident)
+        if not self.enabled or self.redis_factory is None:
+            return
+        generation_key, counter_key, _ = self._keys(table, ident)
+        try:
+            self.redis_factory().incr(counter_key if ident is not None else generation_key)
+        except Exception as err:
+            # Rows may be served stale until their Redis TTL runs out
+            db_logger.error(f"Error invalidating cached {table} {ident}: {err}")
+
+
+# Cache used by cached_get, configured by init_app
+entity_cache: EntityCache = EntityCache()
+
+
+def cached_get(model: Type[T], ident: Any, session: Optional[Session] = None) -> Optional[T]:
+    """
+    Read-through replacement for ``Model.query.get(ident)``.
+
+    Args:
+        model (Type[T]): The mapped class.
+        ident (Any): The primary key.
+        session (Optional[Session]): The session to attach the instance to, ``db.session`` by default.
+
+    Returns:
+        Optional[T]: The instance, or None if there is no such row.
+    """
+    if session is None:
+        from app.extensions import db
+        session = db.session()
+    return entity_cache.get(session, model, ident)
+
+
+def cached_get_or_404(model: Type[T], ident: Any) -> T:
+    """
+    Like ``cached_get``, aborting with 404 Not Found when there is no such row.
+
+    Args:
+        model (Type[T]): The mapped class.
+        ident (Any): The primary key.
+
+    Returns:
+        T: The instance.
+    """
+    instance: Optional[T] = cached_get(model, ident)
+    if instance is None:
+        abort(404)
+    return instance
+
+
+def _pending(session: Session) -> Set[Tuple[str, Any]]:
+    return session.info.setdefault('entity_cache_pending', set())
+
+
+def _changed_tables(session: Session) -> Set[str]:
+    return session.info.setdefault('table_versions_pending', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed(session: Session, flush_context: Any) -> None:
+    for instance in list(session.dirty) + list(session.deleted):
+        table: Optional[str] = getattr(instance, '__tablename__', None)
+        if table in _cached_models:
+            _pending(session).add((table, inspect(instance).identity[0]))
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, '__tablename__', None)
+        if table in _versioned_tables:
+            _changed_tables(session).add(table)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_dml(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table: Optional[str] = getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None)
+        if table in _cached_models:
+            _pending(orm_execute_state.session).add((table, None))
+        if table in _versioned_tables:
+            _changed_tables(orm_execute_state.session).add(table)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session: Session) -> None:
+    for table, ident in session.info.pop('entity_cache_pending', ()):
+        entity_cache.invalidate(table, ident)
+    for table in session.info.pop('table_versions_pending', ()):
+        entity_cache.bump_table_version(table)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop('entity_cache_pending', None)
+    session.info.pop('table_versions_pending', None)
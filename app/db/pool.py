@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """
+    Counters of a connection pool, shared by all the threads of a worker process.
+
+    Attributes:
+        checkouts (int): Connections handed out since the pool was created.
+        checkins (int): Connections returned to the pool.
+        max_checked_out (int): Highest number of connections in use at once.
+        waits (int): Checkouts that had to wait for a connection.
+        wait_seconds (float): Total time spent waiting for connections.
+        max_wait_seconds (float): Longest single wait.
+        timeouts (int): Checkouts that gave up after ``pool_timeout``.
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self.checkouts: int = 0
+        self.checkins: int = 0
+        self.max_checked_out: int = 0
+        self.waits: int = 0
+        self.wait_seconds: float = 0.0
+        self.max_wait_seconds: float = 0.0
+        self.timeouts: int = 0
+
+    def record_checkout(self, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.max_checked_out = max(self.max_checked_out, checked_out)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.timeouts += int(timed_out)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'max_checked_out': self.max_checked_out,
+                'waits': self.waits,
+                'wait_seconds_total': round(self.wait_seconds, 6),
+                'wait_seconds_max': round(self.max_wait_seconds, 6),
+                'timeouts': self.timeouts,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that counts checkouts and checkins and measures how long checkouts wait for
+    a free connection.
+
+    The counters are kept in the pool's acquisition and return paths rather than in
+    ``checkout``/``checkin`` listeners: no event covers the wait, and listeners are copied
+    onto the new pool by ``engine.dispose()`` while still bound to the old one. The counters
+    survive ``dispose()``, which recreates the pool.
+
+    Only checkouts that find no idle connection and no overflow left wait for one to be
+    returned; opening a new connection is not counted as a wait.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats: PoolStats = PoolStats()
+
+    def _do_get(self) -> Any:
+        if not self._must_wait():
+            connection = super()._do_get()
+        else:
+            start: float = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            self.stats.record_wait(time.perf_counter() - start)
+        self.stats.record_checkout(self.checkedout())
+        return connection
+
+    def _must_wait(self) -> bool:
+        # No idle connection in the queue, and the overflow is used up (-1 means unlimited)
+        return self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self.stats.record_checkin()
+
+    def recreate(self) -> 'InstrumentedQueuePool':
+        pool: InstrumentedQueuePool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def status_dict(self) -> Dict[str, Any]:
+        """
+        Return the current occupancy of the pool together with its counters.
+
+        Returns:
+            Dict[str, Any]: Pool size, connections checked out, idle and in overflow, and the stats.
+        """
+        return {
+            'size': self.size(),
+            'checked_out': self.checkedout(),
+            'checked_in': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            'max_overflow': self._max_overflow,
+            **self.stats.to_dict(),
+        }
+
+
+def build_engine_options(config: Mapping[str, Any], uri: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the engine options of a database, e.g. ``SQLALCHEMY_ENGINE_OPTIONS``, from the
+    DB_POOL_* settings.
+
+    SQLite databases get no pool options, since SQLAlchemy picks a pool suited to the file
+    or in-memory database and rejects sizing arguments for some of them.
+
+    Args:
+        config (Mapping[str, Any]): The application config.
+        uri (Optional[str]): The URI of the database, e.g. a replica; SQLALCHEMY_DATABASE_URI by default.
+
+    Returns:
+        Dict[str, Any]: The engine options.
+    """
+    if str(uri or config.get('SQLALCHEMY_DATABASE_URI') or '').startswith('sqlite'):
+        return {}
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def pool_status(engines: Mapping[Optional[str], Any]) -> Dict[str, Any]:
+    """
+    Report the pool metrics of every engine of the process.
+
+    Args:
+        engines (Mapping[Optional[str], Any]): The engines by bind key, e.g. ``db.engines``.
+
+    Returns:
+        Dict[str, Any]: The metrics of each bind, the default bind being 'default'.
+    """
+    status: Dict[str, Any] = {}
+    for key, engine in engines.items():
+        pool = engine.pool
+        status[key or 'default'] = pool.status_dict() if isinstance(pool, InstrumentedQueuePool) else {
+            'pool': type(pool).__name__, 'status': pool.status()}
+    return status
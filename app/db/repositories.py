@@ -1,10 +1,15 @@
-from typing import List, Optional, TypeVar, Generic
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar, Generic
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 from app.extensions import db
-from app.db.models import TestSuite, TestCase, TestResult
+from app.db.schema import BaseSchema, TestSuite, TestCase, TestResult
+from app.db.unit_of_work import unit_of_work
 from app.utils.logger import db_logger  # Assuming db_logger is correctly configured
 
-T = TypeVar('T', bound=db.Model)
+T = TypeVar('T', bound=BaseSchema)
+
+# Rows per executemany batch, and IDs per IN list (kept below the bound parameter limits)
+BULK_BATCH_SIZE: int = 1000
 
 class BaseRepository(Generic[T]):
     """
@@ -12,6 +17,7 @@ class BaseRepository(Generic[T]):
 
     Attributes:
         model (T): Generic type for the database model.
+        db_session (Session): The session used, ``db.session`` by default.
 
     Methods:
         get_all: Retrieve all instances of the model.
@@ -19,10 +25,16 @@ class BaseRepository(Generic[T]):
         add: Add a new instance to the database.
         delete: Remove an instance by its ID.
         update: Update an existing instance.
+        iter_all: Stream instances with a server-side cursor.
+        get_many: Retrieve the instances with the given IDs.
+        bulk_add: Insert many rows in one transaction.
+        bulk_upsert: Insert or update many rows in one transaction.
+        delete_where: Delete the rows matching a condition with a single statement.
     """
 
-    def __init__(self, model: T) -> None:
+    def __init__(self, model: T, db_session: Optional[Session] = None) -> None:
         self.model: T = model
+        self.db_session: Session = db_session or db.session
 
     def get_all(self) -> List[T]:
         try:
@@ -47,40 +59,192 @@ class BaseRepository(Generic[T]):
 
     def add(self, entity: T) -> T:
         try:
-            db.session.add(entity)
-            db.session.commit()
+            with unit_of_work(self.db_session) as uow:
+                uow.add(entity)
             db_logger.info(f"Added new record for {self.model.__name__}.")
             return entity
         except Exception as e:
             db_logger.error(f"Error adding new record for {self.model.__name__}: {str(e)}")
-            return None
+            raise e
 
     def delete(self, id: int) -> None:
         try:
             entity: Optional[T] = self.get_by_id(id)
             if entity:
-                db.session.delete(entity)
-                db.session.commit()
+                with unit_of_work(self.db_session) as uow:
+                    uow.delete(entity)
                 db_logger.info(f"Deleted record with ID {id} for {self.model.__name__}.")
         except Exception as e:
             db_logger.error(f"Error deleting record with ID {id} for {self.model.__name__}: {str(e)}")
+            raise e
 
     def update(self, entity: T) -> T:
         try:
-            db.session.merge(entity)
-            db.session.commit()
+            with unit_of_work(self.db_session):
+                self.db_session.merge(entity)
             db_logger.info(f"Updated record for {self.model.__name__}.")
             return entity
         except Exception as e:
             db_logger.error(f"Error updating record for {self.model.__name__}: {str(e)}")
-            return None
+            raise e
+
+    def iter_all(self, *criteria: Any, batch_size: int = BULK_BATCH_SIZE) -> Iterator[T]:
+        """
+        Stream the instances of the model in primary key order, optionally filtered.
+
+        Rows are fetched through a server-side cursor in batches of ``batch_size``, so memory
+        use stays constant however large the table is. The session must not be committed
+        while the iterator is consumed.
+
+        Args:
+            *criteria (Any): Optional filter conditions.
+            batch_size (int): Number of rows buffered per round-trip.
+
+        Yields:
+            T: The instances, one at a time.
+        """
+        statement = select(self.model).where(*criteria).order_by(
+            *self.model.__table__.primary_key.columns).execution_options(yield_per=batch_size)
+        yield from self.db_session.execute(statement).scalars()
+
+    def get_many(self, ids: Iterable[int], *options: Any) -> List[T]:
+        """
+        Retrieve the instances with the given IDs, with one IN query per batch of IDs.
+
+        Args:
+            ids (Iterable[int]): The IDs to look up; missing IDs are skipped.
+            *options (Any): Loader options, e.g. ``selectinload`` of a relationship.
+
+        Returns:
+            List[T]: The instances found, in primary key order.
+        """
+        ids = sorted(set(ids))
+        entities: List[T] = []
+        try:
+            for start in range(0, len(ids), BULK_BATCH_SIZE):
+                entities.extend(self.db_session.execute(
+                    select(self.model).where(self.model.id.in_(ids[start:start + BULK_BATCH_SIZE]))
+                    .order_by(self.model.id).options(*options)).scalars())
+            db_logger.info(f"Retrieved {len(entities)} of {len(ids)} records for {self.model.__name__}.")
+            return entities
+        except Exception as e:
+            db_logger.error(f"Error retrieving records by ID for {self.model.__name__}: {str(e)}")
+            return []
+
+    def bulk_add(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Insert many rows with executemany batches, committed once with the enclosing unit of work.
+
+        Args:
+            rows (Sequence[Dict[str, Any]]): Column values of each row.
+
+        Returns:
+            int: The number of rows inserted.
+
+        Raises:
+            Exception: If the insert fails; the transaction is rolled back.
+        """
+        try:
+            with unit_of_work(self.db_session):
+                for start in range(0, len(rows), BULK_BATCH_SIZE):
+                    self.db_session.execute(insert(self.model), list(rows[start:start + BULK_BATCH_SIZE]))
+            db_logger.info(f"Added {len(rows)} records for {self.model.__name__}.")
+            return len(rows)
+        except Exception as e:
+            db_logger.error(f"Error adding records for {self.model.__name__}: {str(e)}")
+            raise e
+
+    def bulk_upsert(self, rows: Sequence[Dict[str, Any]], index_elements: Optional[List[str]] = None) -> int:
+        """
+        Insert many rows, updating the existing rows that conflict on ``index_elements``.
+
+        Uses ``ON CONFLICT DO UPDATE`` on PostgreSQL and SQLite and ``ON DUPLICATE KEY UPDATE``
+        on MySQL. Every row must provide the same columns.
+
+        Args:
+            rows (Sequence[Dict[str, Any]]): Column values of each row.
+            index_elements (Optional[List[str]]): The unique columns identifying a row,
+                the primary key by default (ignored on MySQL, which checks every unique key).
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            NotImplementedError: If the database dialect has no upsert statement.
+            Exception: If the statement fails; the transaction is rolled back.
+        """
+        if not rows:
+            return 0
+        table = self.model.__table__
+        index_elements = index_elements or [column.name for column in table.primary_key.columns]
+        dialect: str = self.db_session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect in ('mysql', 'mariadb'):
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"Upsert is not supported on {dialect}")
+
+        statement = dialect_insert(table)
+        updated: List[str] = [name for name in rows[0] if name not in index_elements]
+        if dialect in ('mysql', 'mariadb'):
+            statement = statement.on_duplicate_key_update({name: statement.inserted[name] for name in updated})
+        elif updated:
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements, set_={name: statement.excluded[name] for name in updated})
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+
+        try:
+            with unit_of_work(self.db_session):
+                for start in range(0, len(rows), BULK_BATCH_SIZE):
+                    self.db_session.execute(statement, list(rows[start:start + BULK_BATCH_SIZE]))
+            db_logger.info(f"Upserted {len(rows)} records for {self.model.__name__}.")
+            return len(rows)
+        except Exception as e:
+            db_logger.error(f"Error upserting records for {self.model.__name__}: {str(e)}")
+            raise e
+
+    def delete_where(self, *criteria: Any) -> int:
+        """
+        Delete the rows matching the given conditions with a single DELETE statement.
+
+        Instances already loaded in the session are not expired; use it for set-based
+        clean-ups rather than on objects the caller still holds.
+
+        Args:
+            *criteria (Any): The filter conditions; at least one is required.
+
+        Returns:
+            int: The number of rows deleted.
+
+        Raises:
+            ValueError: If no condition is given.
+            Exception: If the statement fails; the transaction is rolled back.
+        """
+        if not criteria:
+            raise ValueError("delete_where requires at least one condition")
+        try:
+            with unit_of_work(self.db_session):
+                deleted: int = self.db_session.execute(
+                    delete(self.model).where(*criteria).execution_options(synchronize_session=False)).rowcount
+            db_logger.info(f"Deleted {deleted} records for {self.model.__name__}.")
+            return deleted
+        except Exception as e:
+            db_logger.error(f"Error deleting records for {self.model.__name__}: {str(e)}")
+            raise e
+
 
-class TestSuiteRepository(BaseRepository):
-    def __init__(self) -> None:
-        super().__init__(TestSuite)
+class TestSuiteRepository(BaseRepository[TestSuite]):
+    def __init__(self, db_session: Optional[Session] = None) -> None:
+        super().__init__(TestSuite, db_session)
 
 class TestCaseRepository(BaseRepository[TestCase]):
-    pass
+    def __init__(self, db_session: Optional[Session] = None) -> None:
+        super().__init__(TestCase, db_session)
 
 class TestResultRepository(BaseRepository[TestResult]):
-    pass
+    def __init__(self, db_session: Optional[Session] = None) -> None:
+        super().__init__(TestResult, db_session)
@@ -0,0 +1,138 @@
+import random
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, List, MutableMapping, Optional
+import sqlalchemy as sa
+from flask import request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from app.db.pool import build_engine_options
+from app.utils.logger import db_logger
+
+# Prefix of the SQLALCHEMY_BINDS keys holding the read replicas
+REPLICA_BIND_PREFIX: str = 'replica_'
+
+
+def register_replica_binds(config: MutableMapping[str, Any]) -> List[str]:
+    """
+    Add one SQLAlchemy bind per URI in ``SQLALCHEMY_REPLICA_URIS`` to the app config.
+
+    Must run before ``db.init_app`` so that Flask-SQLAlchemy creates the replica engines.
+    Flask-SQLAlchemy applies ``SQLALCHEMY_ENGINE_OPTIONS`` to the default bind only, so each
+    replica gets the pool options built for its own URI.
+
+    Args:
+        config (MutableMapping[str, Any]): The application config.
+
+    Returns:
+        List[str]: The bind keys of the replicas.
+    """
+    binds: dict = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(config.get('SQLALCHEMY_REPLICA_URIS') or []):
+        binds[f'{REPLICA_BIND_PREFIX}{index}'] = {'url': uri, **build_engine_options(config, uri)}
+    config['SQLALCHEMY_BINDS'] = binds
+    return [key for key in binds if key.startswith(REPLICA_BIND_PREFIX)]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a read replica when the caller opted in.
+
+    Reads are routed to a replica only inside ``use_replica()`` (or a view decorated with
+    ``replica_reads``). Flushes, DML statements and locking reads always go to the primary,
+    and once the session has written, with a flush or a DML statement, it is pinned to the
+    primary for the rest of its lifetime (a request, with Flask-SQLAlchemy's scoping) so that
+    it reads its own writes.
+    Without configured replicas every statement goes to the primary.
+    """
+
+    def __init__(self, db: Any, **kwargs: Any) -> None:
+        super().__init__(db, **kwargs)
+        self.info.setdefault('replica_reads', 0)
+        self.info.setdefault('pinned_to_primary', False)
+        event.listen(self, 'after_flush', _pin_to_primary)
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, bind: Any = None, **kwargs: Any) -> Any:
+        if bind is None and self._reads_from_replica(clause):
+            replica: Optional[sa.engine.Engine] = self._replica_engine()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause: Any) -> bool:
+        if isinstance(clause, sa.UpdateBase):
+            # Core DML does not go through a flush, so it pins the session here
+            self.info['pinned_to_primary'] = True
+            return False
+        if not self.info['replica_reads'] or self.info['pinned_to_primary'] or self._flushing:
+            return False
+        return not (isinstance(clause, sa.Select) and clause._for_update_arg is not None)
+
+    def _replica_engine(self) -> Optional[sa.engine.Engine]:
+        # Stick to one replica per session so that a request sees a single snapshot
+        key: Optional[str] = self.info.get('replica_bind_key')
+        if key is None:
+            keys: List[str] = [key for key in self._db.engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+            if not keys:
+                return None
+            key = self.info['replica_bind_key'] = random.choice(keys)
+        return self._db.engines[key]
+
+
+def _pin_to_primary(session: RoutingSession, flush_context: Any) -> None:
+    if not session.info['pinned_to_primary'] and (session.new or session.dirty or session.deleted):
+        db_logger.info("Session wrote to the primary; pinning its reads to the primary")
+    session.info['pinned_to_primary'] = True
+
+
+@contextmanager
+def use_replica(session: RoutingSession) -> Iterator[RoutingSession]:
+    """
+    Route the reads of the session to a read replica within the block.
+
+    Meant for read-only endpoints and analytics queries that tolerate replication lag.
+
+    Args:
+        session (RoutingSession): The session to route, usually ``db.session``.
+
+    Yields:
+        RoutingSession: The same session.
+    """
+    session.info['replica_reads'] += 1
+    try:
+        yield session
+    finally:
+        session.info['replica_reads'] -= 1
+
+
+def pin_to_primary(session: RoutingSession) -> None:
+    """
+    Send every later read of the session to the primary, e.g. right before reading back
+    data that was written outside of this session.
+
+    Args:
+        session (RoutingSession): The session to pin, usually ``db.session``.
+    """
+    session.info['pinned_to_primary'] = True
+
+
+def replica_reads(view: Callable) -> Callable:
+    """
+    Decorator routing the database reads of a GET or HEAD request to a read replica.
+
+    Other methods of the same view keep using the primary.
+
+    Args:
+        view (Callable): The view function or Resource method.
+
+    Returns:
+        Callable: The wrapped view.
+    """
+    @wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if request.method not in ('GET', 'HEAD'):
+            return view(*args, **kwargs)
+        from app.extensions import db
+        with use_replica(db.session()):
+            return view(*args, **kwargs)
+    return wrapper
@@ -1,8 +1,12 @@
+import json
 from typing import Dict, Any
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.orm import relationship, Mapped, DeclarativeBase, MappedAsDataclass
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, LargeBinary, Index, Boolean
+from app.db.cache import register_cached_model, register_versioned_model
+from app.db.types import CompressedText
+from app.db.unit_of_work import unit_of_work
 from app.utils.logger import db_logger
 from app.extensions import db
 
@@ -36,8 +40,9 @@ class TestSuite(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -45,19 +50,17 @@ class TestSuite(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"TestSuite saved: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error saving TestSuite: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"TestSuite saved: {self.name}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -65,16 +68,16 @@ class TestSuite(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"TestSuite deleted: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error deleting TestSuite: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"TestSuite deleted: {self.name}")
 
 
 class TestCase(BaseSchema):
     __tablename__ = 'test_cases'
+    __table_args__: tuple = (
+        Index('ix_test_cases_test_suite_id', 'test_suite_id'),
+    )
 
     id: Column = Column(Integer, primary_key=True)
     test_suite_id: Column = Column(
@@ -100,8 +103,9 @@ class TestCase(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -109,19 +113,17 @@ class TestCase(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"TestCase saved: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error saving TestCase: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"TestCase saved: {self.name}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -129,16 +131,36 @@ class TestCase(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"TestCase deleted: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error deleting TestCase: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"TestCase deleted: {self.name}")
+
+
+def month_bucket(moment: datetime) -> int:
+    """
+    Return the month bucket (YYYYMM) results created at a given time are stored in.
+
+    Args:
+        moment (datetime): The creation time.
+
+    Returns:
+        int: The bucket, e.g. 202405.
+    """
+    return moment.year * 100 + moment.month
+
+
+def _created_month_default(context: Any) -> int:
+    return month_bucket(context.get_current_parameters().get('created_at') or datetime.utcnow())
 
 
 class TestResult(BaseSchema):
     __tablename__: str = 'test_results'
+    __table_args__: tuple = (
+        Index('ix_test_results_test_case_id_created_at', 'test_case_id', 'created_at'),
+        Index('ix_test_results_test_run_id_created_at', 'test_run_id', 'created_at'),
+        Index('ix_test_results_created_at', 'created_at'),
+        Index('ix_test_results_created_month_id', 'created_month', 'id'),
+    )
     id: Column = Column(Integer, primary_key=True)
     test_case_id: Column = Column(
         Integer, ForeignKey('test_cases.id'), nullable=False)
@@ -146,8 +168,10 @@ class TestResult(BaseSchema):
     status: Column = Column(String(50))  # e.g., 'Passed', 'Failed', 'Error'
     execution_time: Column = Column(Float)
     failure_reason = db.Column(db.String(255))  # Time in seconds
-    result_data: Column = Column(Text)
+    result_data: Column = Column(CompressedText())
     created_at: Column = Column(DateTime, default=datetime.utcnow)
+    # Month bucket of created_at; results are archived one month at a time
+    created_month: Column = Column(Integer, default=_created_month_default)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -169,8 +193,9 @@ class TestResult(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -178,19 +203,17 @@ class TestResult(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"TestResult saved: {self.test_case_id}")
-        except Exception as err:
-            db_logger.error(f"Error saving TestResult: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"TestResult saved: {self.test_case_id}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -198,12 +221,9 @@ class TestResult(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"TestResult deleted: {self.test_case_id}")
-        except Exception as err:
-            db_logger.error(f"Error deleting TestResult: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"TestResult deleted: {self.test_case_id}")
 
 
 class PerformanceTest(BaseSchema):
@@ -211,7 +231,7 @@ class PerformanceTest(BaseSchema):
     id: Column = Column(Integer, primary_key=True)
     name: Column = Column(String(128), nullable=False)
     description: Column = Column(String(256))
-    test_suite_id = db.Column(db.Integer, db.ForeignKey('test_suite.id'))
+    test_suite_id = db.Column(db.Integer, db.ForeignKey('test_suites.id'))
     config: Column = Column(Text)
     created_at: Column = Column(DateTime, default=datetime.utcnow)
 
@@ -239,8 +259,9 @@ class PerformanceTest(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -248,19 +269,17 @@ class PerformanceTest(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"PerformanceTest saved: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error saving PerformanceTest: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"PerformanceTest saved: {self.name}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -268,24 +287,29 @@ class PerformanceTest(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"PerformanceTest deleted: {self.name}")
-        except Exception as err:
-            db_logger.error(f"Error deleting PerformanceTest: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"PerformanceTest deleted: {self.name}")
+
+
+# Statuses of performance test runs: Locust ran to completion, or the run could not be executed
+PERFORMANCE_RUN_COMPLETED: str = 'completed'
+PERFORMANCE_RUN_ERROR: str = 'Error'
 
 
 class PerformanceTestResult(BaseSchema):
     __tablename__: str = 'performance_results'
+    __table_args__: tuple = (
+        Index('ix_performance_results_test_id_executed_at', 'performance_test_id', 'executed_at'),
+    )
     id: Column = Column(Integer, primary_key=True)
     performance_test_id: Column = Column(
         Integer, ForeignKey('performance_tests.id'), nullable=False)
     execution_time: Column = Column(Float)
-    status: Column = Column(String(50))  # e.g., 'Passed', 'Failed', 'Error'
+    status: Column = Column(String(50))  # PERFORMANCE_RUN_COMPLETED or PERFORMANCE_RUN_ERROR
     avg_response_time = db.Column(db.Float)
     requests_per_sec = db.Column(db.Float)
-    result_data: Column = Column(Text)
+    result_data: Column = Column(CompressedText())
     executed_at: Column = Column(DateTime, default=datetime.utcnow)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -308,8 +332,87 @@ class PerformanceTestResult(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(
+            f"PerformanceResult saved: {self.performance_test_id}")
+
+    def delete(self) -> None:
+        """
+        Delete the object from the database.
+
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(
+            f"PerformanceResult deleted: {self.performance_test_id}")
+
+
+class LatencySketch(BaseSchema):
+    """
+    Serialized t-digest of response times for a performance test.
+
+    A sketch either summarizes a single run (``performance_result_id`` set) or a rolling
+    time window of live stats (``window_start`` set). Sketches are mergeable, so
+    percentiles across arbitrary sets of runs or windows never re-read raw samples.
+    """
+    __tablename__: str = 'latency_sketches'
+    __table_args__: tuple = (
+        Index('ix_latency_sketches_test_result', 'performance_test_id', 'performance_result_id'),
+        Index('ix_latency_sketches_test_window', 'performance_test_id', 'window_start'),
+    )
+    id: Column = Column(Integer, primary_key=True)
+    performance_test_id: Column = Column(
+        Integer, ForeignKey('performance_tests.id'), nullable=False)
+    performance_result_id: Column = Column(
+        Integer, ForeignKey('performance_results.id'), nullable=True)
+    window_start: Column = Column(DateTime, nullable=True)
+    sample_count: Column = Column(Integer, nullable=False, default=0)
+    digest: Column = Column(LargeBinary, nullable=False)
+    updated_at: Column = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the object to a dictionary representation.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the object's attributes, without the digest.
+        """
+        return {
+            'id': self.id,
+            'performance_test_id': self.performance_test_id,
+            'performance_result_id': self.performance_result_id,
+            'window_start': self.window_start.isoformat() if self.window_start else None,
+            'sample_count': self.sample_count,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def save(self) -> None:
+        """
+        Save the object to the database.
+
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -317,20 +420,17 @@ class PerformanceTestResult(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(
-                f"PerformanceResult saved: {self.performance_test_id}")
-        except Exception as err:
-            db_logger.error(f"Error saving PerformanceResult: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"LatencySketch saved: {self.performance_test_id}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -338,21 +438,103 @@ class PerformanceTestResult(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(
-                f"PerformanceResult deleted: {self.performance_test_id}")
-        except Exception as err:
-            db_logger.error(f"Error deleting PerformanceResult: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"LatencySketch deleted: {self.performance_test_id}")
+
+
+class RegressionVerdict(BaseSchema):
+    """
+    Outcome of comparing a performance run against the rolling baseline of its test.
+    """
+    __tablename__: str = 'regression_verdicts'
+    id: Column = Column(Integer, primary_key=True)
+    performance_result_id: Column = Column(
+        Integer, ForeignKey('performance_results.id'), nullable=False, unique=True)
+    performance_test_id: Column = Column(
+        Integer, ForeignKey('performance_tests.id'), nullable=False)
+    status: Column = Column(String(32), nullable=False)  # e.g., 'regression', 'pass', 'insufficient_data'
+    is_regression: Column = Column(Boolean, nullable=False, default=False)
+    p_value: Column = Column(Float)
+    effect_size: Column = Column(Float)  # Cliff's delta of the run vs. the baseline
+    median_ratio: Column = Column(Float)
+    baseline_result_ids: Column = Column(Text)  # JSON list of the runs used as baseline
+    created_at: Column = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the object to a dictionary representation.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the object's attributes.
+        """
+        return {
+            'id': self.id,
+            'performance_result_id': self.performance_result_id,
+            'performance_test_id': self.performance_test_id,
+            'status': self.status,
+            'is_regression': self.is_regression,
+            'p_value': self.p_value,
+            'effect_size': self.effect_size,
+            'median_ratio': self.median_ratio,
+            'baseline_result_ids': json.loads(self.baseline_result_ids or '[]'),
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def save(self) -> None:
+        """
+        Save the object to the database.
+
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"RegressionVerdict saved: {self.performance_result_id}")
+
+    def delete(self) -> None:
+        """
+        Delete the object from the database.
+
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"RegressionVerdict deleted: {self.performance_result_id}")
 
 
 class TestRun(BaseSchema):
     __tablename__: str = 'test_run'
+    __table_args__: tuple = (
+        Index('ix_test_run_test_suite_id_created_at', 'test_suite_id', 'created_at'),
+    )
     id: Column = Column(Integer, primary_key=True)
     test_suite_id: Column = Column(
-        Integer, ForeignKey('test_suite.id'), nullable=False)
-    created_at: Column = Column(DateTime, default=datetime.utcnow)
+        Integer, ForeignKey('test_suites.id'), nullable=False)
+    status: Column = Column(String(20), default='running')  # 'running', 'completed', 'failed'
+    created_at: Column = Column(DateTime, default=datetime.utcnow)  # Start of the run
+    finished_at: Column = Column(DateTime, nullable=True)
+    # Summary of the run's results, incremented in the transaction that writes them
+    total_results: Column = Column(Integer, nullable=False, default=0)
+    passed_results: Column = Column(Integer, nullable=False, default=0)
+    failed_results: Column = Column(Integer, nullable=False, default=0)
+    errored_results: Column = Column(Integer, nullable=False, default=0)
+    total_duration: Column = Column(Float, nullable=False, default=0.0)  # Sum of execution times in seconds
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -364,15 +546,23 @@ class TestRun(BaseSchema):
         return {
             'id': self.id,
             'test_suite_id': self.test_suite_id,
-            'created_at': self.created_at.isoformat()
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'total_results': self.total_results,
+            'passed_results': self.passed_results,
+            'failed_results': self.failed_results,
+            'errored_results': self.errored_results,
+            'total_duration': self.total_duration
         }
 
     def save(self) -> None:
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -380,12 +570,65 @@ class TestRun(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"TestRun saved: {self.id}")
-        except Exception as err:
-            db_logger.error(f"Error saving TestRun: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"TestRun saved: {self.id}")
+
+
+class ExecutionJob(BaseSchema):
+    """
+    Execution of a test suite, test case or performance test queued for a Celery worker.
+    """
+    __tablename__: str = 'execution_jobs'
+    __table_args__: tuple = (
+        Index('ix_execution_jobs_kind_target_id_created_at', 'kind', 'target_id', 'created_at'),
+    )
+    id: Column = Column(String(36), primary_key=True)  # UUID, also the id of the Celery task
+    kind: Column = Column(String(32), nullable=False)  # 'test_suite', 'test_case' or 'performance_test'
+    target_id: Column = Column(Integer, nullable=False)  # ID of the suite, case or performance test
+    status: Column = Column(String(20), nullable=False, default='queued')  # 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+    result: Column = Column(CompressedText())  # JSON result of the execution
+    error: Column = Column(Text)
+    created_at: Column = Column(DateTime, default=datetime.utcnow)
+    started_at: Column = Column(DateTime, nullable=True)
+    finished_at: Column = Column(DateTime, nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the object to a dictionary representation.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the object's attributes.
+        """
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'target_id': self.target_id,
+            'status': self.status,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def save(self) -> None:
+        """
+        Save the object to the database.
+
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"ExecutionJob saved: {self.id}")
 
 
 class User(BaseSchema):
@@ -436,8 +679,9 @@ class User(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -445,19 +689,17 @@ class User(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"User saved: {self.username}")
-        except Exception as err:
-            db_logger.error(f"Error saving User: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"User saved: {self.username}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -465,12 +707,9 @@ class User(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"User deleted: {self.username}")
-        except Exception as err:
-            db_logger.error(f"Error deleting User: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"User deleted: {self.username}")
 
 
 # Role Model
@@ -495,8 +734,9 @@ class Role(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -504,20 +744,17 @@ class Role(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"Role saved: {self.name}")
-
-        except Exception as err:
-            db_logger.error(f"Error saving Role: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"Role saved: {self.name}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -525,13 +762,9 @@ class Role(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"Role deleted: {self.name}")
-
-        except Exception as err:
-            db_logger.error(f"Error deleting Role: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"Role deleted: {self.name}")
 
 
 # AppSettings Model (if still relevant)
@@ -558,8 +791,9 @@ class AppSettings(BaseSchema):
         """
         Save the object to the database.
 
-        This method adds the object to the session, commits the changes, and logs the result.
-        If an error occurs during the save process, an error message is logged.
+        This method adds the object to the session within a unit of work, so it is committed
+        with the enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -567,20 +801,17 @@ class AppSettings(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.add(self)
-            db.session.commit()
-            db_logger.info(f"AppSettings saved: {self.setting_name}")
-
-        except Exception as err:
-            db_logger.error(f"Error saving AppSettings: {err}")
+        with unit_of_work() as uow:
+            uow.add(self)
+        db_logger.info(f"AppSettings saved: {self.setting_name}")
 
     def delete(self) -> None:
         """
         Delete the object from the database.
 
-        This method removes the object from the session, commits the changes, and logs the result.
-        If an error occurs during the delete process, an error message is logged.
+        This method deletes the object within a unit of work, so it is committed with the
+        enclosing unit of work, or right away outside of one. If an error occurs, the
+        transaction is rolled back and the error is re-raised.
 
         Parameters:
             None
@@ -588,30 +819,33 @@ class AppSettings(BaseSchema):
         Returns:
             None
         """
-        try:
-            db.session.delete(self)
-            db.session.commit()
-            db_logger.info(f"AppSettings deleted: {self.setting_name}")
-        except Exception as err:
-            db_logger.error(f"Error deleting AppSettings: {err}")
+        with unit_of_work() as uow:
+            uow.delete(self)
+        db_logger.info(f"AppSettings deleted: {self.setting_name}")
 
 
-# One-to-many
-TestSuite.test_cases = db.relationship('TestCase', lazy='dynamic', backref='test_suite')
+# One-to-many; loaded per request with selectinload() where suites are serialized in bulk
+TestSuite.test_cases = db.relationship(
+    'TestCase', lazy='select', back_populates="test_suite", order_by='TestCase.id')
 
 # Many-to-one
 TestCase.test_suite = db.relationship('TestSuite', back_populates="test_cases")
 
 # One-to-many
-TestRun.test_results = db.relationship('TestResult', lazy='dynamic')
+TestRun.test_results = db.relationship('TestResult', lazy='dynamic', back_populates="test_run")
 
 # Many-to-one
 TestResult.test_run = db.relationship('TestRun', back_populates="test_results")
 
 # One-to-many
 PerformanceTest.performance_results = db.relationship(
-    'PerformanceResult', lazy='dynamic')
+    'PerformanceTestResult', lazy='dynamic', back_populates="performance_test")
 
 # Many-to-one
 PerformanceTestResult.performance_test = db.relationship(
     'PerformanceTest', back_populates="performance_results")
+
+# Looked up by id on every execution; served by cached_get
+register_cached_model(TestSuite, TestCase, PerformanceTest)
+# Polled by the frontend; versioned for the ETags of their list endpoints
+register_versioned_model(TestSuite, TestCase, PerformanceTest)
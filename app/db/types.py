@@ -0,0 +1,102 @@
+import zlib
+from typing import Any, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # zlib is used for new payloads when zstandard is not installed
+    zstandard = None
+
+# First byte of a stored payload, telling how the rest is encoded
+RAW: bytes = b'\x00'
+ZLIB: bytes = b'\x01'
+ZSTD: bytes = b'\x02'
+
+# Payloads smaller than this (in UTF-8 bytes) are stored uncompressed
+COMPRESSION_THRESHOLD: int = 1024
+ZLIB_LEVEL: int = 6
+ZSTD_LEVEL: int = 3
+
+
+def compress_text(value: str, threshold: int = COMPRESSION_THRESHOLD) -> bytes:
+    """
+    Encode text for storage, compressing it when it is large enough to be worth it.
+
+    Args:
+        value (str): The text to store.
+        threshold (int): Minimum UTF-8 size in bytes for the payload to be compressed.
+
+    Returns:
+        bytes: A one-byte codec header followed by the raw or compressed UTF-8 payload.
+    """
+    data: bytes = value.encode('utf-8')
+    if len(data) < threshold:
+        return RAW + data
+    if zstandard is not None:
+        compressed, header = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ZSTD
+    else:
+        compressed, header = zlib.compress(data, ZLIB_LEVEL), ZLIB
+    # Incompressible payloads are kept raw rather than grown
+    return header + compressed if len(compressed) < len(data) else RAW + data
+
+
+def decompress_text(value: bytes | str) -> str:
+    """
+    Decode a payload produced by ``compress_text``.
+
+    Values without a codec header, such as text written before the column was
+    compressed, are returned as they are.
+
+    Args:
+        value (bytes | str): The stored payload.
+
+    Returns:
+        str: The original text.
+
+    Raises:
+        RuntimeError: If the payload is zstd-compressed and zstandard is not installed.
+    """
+    if isinstance(value, str):
+        return value
+    header, payload = value[:1], value[1:]
+    if header == RAW:
+        return payload.decode('utf-8')
+    if header == ZLIB:
+        return zlib.decompress(payload).decode('utf-8')
+    if header == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed payloads")
+        return zstandard.ZstdDecompressor().decompress(payload).decode('utf-8')
+    return bytes(value).decode('utf-8')
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column stored as a binary payload, compressed with zstd (or zlib) above a size threshold.
+
+    Reads and writes use plain ``str`` values; the column cannot be filtered or searched
+    on in SQL.
+
+    Attributes:
+        threshold (int): Minimum UTF-8 size in bytes for a value to be compressed.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, threshold: int = COMPRESSION_THRESHOLD, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.threshold: int = threshold
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        # BLOB caps at 64 KB on MySQL, below the size of large Newman outputs
+        if dialect.name in ('mysql', 'mariadb'):
+            return dialect.type_descriptor(LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Optional[str], dialect: Any) -> Optional[bytes]:
+        return None if value is None else compress_text(value, self.threshold)
+
+    def process_result_value(self, value: Optional[bytes], dialect: Any) -> Optional[str]:
+        return None if value is None else decompress_text(value)
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
+from sqlalchemy.orm import Session
+from app.utils.logger import db_logger
+
+# Session.info key counting the units of work open on a session
+DEPTH_KEY: str = 'unit_of_work_depth'
+
+
+class UnitOfWork:
+    """
+    The changes of one logical operation, committed together by ``unit_of_work``.
+
+    Objects added or deleted are written with the commit that closes the outermost unit of
+    work. With a ``batch_size``, pending objects are also flushed every ``batch_size``
+    additions so that large operations do not hold every row in the session, without
+    committing in between.
+
+    Attributes:
+        session (Session): The session the changes are made in.
+        batch_size (Optional[int]): Number of additions after which pending objects are flushed.
+    """
+
+    def __init__(self, session: Session, batch_size: Optional[int] = None) -> None:
+        self.session: Session = session
+        self.batch_size: Optional[int] = batch_size
+        self._pending: int = 0
+
+    def add(self, instance: Any) -> Any:
+        """
+        Add an object to the unit of work.
+
+        Args:
+            instance (Any): The new or modified object.
+
+        Returns:
+            Any: The same object.
+        """
+        self.session.add(instance)
+        self._pending += 1
+        if self.batch_size and self._pending >= self.batch_size:
+            self.flush()
+        return instance
+
+    def add_all(self, instances: Iterable[Any]) -> None:
+        """
+        Add several objects to the unit of work.
+
+        Args:
+            instances (Iterable[Any]): The new or modified objects.
+        """
+        for instance in instances:
+            self.add(instance)
+
+    def delete(self, instance: Any) -> None:
+        """
+        Delete an object with the unit of work.
+
+        Args:
+            instance (Any): The persistent object to delete.
+        """
+        self.session.delete(instance)
+
+    def flush(self) -> None:
+        """Write the pending changes to the database without committing them."""
+        self.session.flush()
+        self._pending = 0
+
+
+def in_unit_of_work(session: Session) -> bool:
+    """
+    Tell whether a unit of work is open on the session.
+
+    Args:
+        session (Session): The session.
+
+    Returns:
+        bool: True inside ``unit_of_work()``.
+    """
+    return session.info.get(DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work(session: Optional[Session] = None, batch_size: Optional[int] = None) -> Iterator[UnitOfWork]:
+    """
+    Run a logical operation as a single transaction.
+
+    The outermost unit of work on a session commits once when the block exits normally;
+    units opened inside it, e.g. by the services or ``save()`` methods it calls, join it
+    instead of committing. If the block raises, the outermost unit rolls the whole
+    transaction back, logs the error and re-raises it.
+
+    Args:
+        session (Optional[Session]): The session to use, ``db.session`` by default.
+        batch_size (Optional[int]): Flush pending objects every ``batch_size`` additions.
+
+    Yields:
+        UnitOfWork: The unit of work.
+    """
+    if session is None:
+        from app.extensions import db
+        session = db.session()
+    depth: int = session.info.get(DEPTH_KEY, 0)
+    session.info[DEPTH_KEY] = depth + 1
+    try:
+        yield UnitOfWork(session, batch_size)
+        if not depth:
+            session.commit()
+    except Exception as err:
+        if not depth:
+            session.rollback()
+            db_logger.error(f"Unit of work rolled back: {err}")
+        raise err
+    finally:
+        session.info[DEPTH_KEY] = depth
@@ -1,19 +1,27 @@
+import os
+import threading
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_oauthlib.client import OAuth
-from redis import Redis
-from influxdb import InfluxDBClient
-from flask import Flask
-from typing import NoReturn
+from flask import Flask, current_app, has_app_context
+from typing import Any, Callable, Dict, Mapping, NoReturn, TYPE_CHECKING
 from celery import Celery
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_restx import Api
 from flask_cors import CORS  # TODO
+from .config import Config
+from .db.cache import entity_cache
+from .db.pool import build_engine_options
+from .db.routing import RoutingSession, register_replica_binds
 from .utils.logger import app_logger
 
-# Database ORM
-db: SQLAlchemy = SQLAlchemy()
+if TYPE_CHECKING:
+    from influxdb import InfluxDBClient
+    from redis import Redis
+
+# Database ORM; reads can be routed to the replicas in SQLALCHEMY_REPLICA_URIS
+db: SQLAlchemy = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Database migration tool
 migrate: Migrate = Migrate()
@@ -30,18 +38,77 @@ celery: Celery = Celery()
 # Swagger API
 swagger_api: Api = Api()
 
+# Settings the InfluxDB and Redis clients are built from, captured by init_app
+_client_settings: Dict[str, Any] = {}
+
+# InfluxDB and Redis clients, created lazily and owned by a single process
+_clients: Dict[str, Any] = {}
+_clients_pid: int = os.getpid()
+_clients_lock: threading.Lock = threading.Lock()
+
+
+def _client_config() -> Mapping[str, Any]:
+    """
+    Return the settings used to build the InfluxDB and Redis clients.
+
+    Inside an application context the app config is used; otherwise (Celery workers,
+    scripts) the settings captured by ``init_app`` or, failing that, the base config.
+    """
+    if has_app_context():
+        return current_app.config
+    return _client_settings or {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+
+
+def _reset_clients() -> None:
+    """
+    Drop the clients inherited from a parent process.
+
+    Registered to run in the child after ``fork()`` so that gunicorn and Celery workers
+    never share sockets with the master; each worker builds its own pools on first use.
+    """
+    global _clients_pid
+    _clients.clear()
+    _clients_pid = os.getpid()
+
 
-def create_influxdb_client() -> InfluxDBClient:
+os.register_at_fork(after_in_child=_reset_clients)
+
+
+def _get_client(name: str, factory: Callable[[Mapping[str, Any]], Any]) -> Any:
+    if _clients_pid != os.getpid():
+        _reset_clients()
+    client: Any = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory(_client_config())
+    return client
+
+
+def create_influxdb_client(config: Mapping[str, Any]) -> 'InfluxDBClient':
     """
     Create and return an InfluxDB client.
 
+    Args:
+        config (Mapping[str, Any]): The settings to build the client from.
+
     Returns:
-        InfluxDBClient: An instance of InfluxDBClient.
+        InfluxDBClient: An instance of InfluxDBClient with a sized HTTP connection pool.
     """
     try:
+        from influxdb import InfluxDBClient
         influxdb = InfluxDBClient(
-            host='influxdb_host', port=8086, username='admin', password='admin'
+            host=config['INFLUXDB_HOST'],
+            port=config['INFLUXDB_PORT'],
+            username=config['INFLUXDB_USERNAME'],
+            password=config['INFLUXDB_PASSWORD'],
+            database=config['INFLUXDB_DATABASE'],
+            timeout=config['INFLUXDB_TIMEOUT'],
+            retries=config['INFLUXDB_RETRIES'],
+            pool_size=config['INFLUXDB_POOL_SIZE']
         )
+        app_logger.info(f"InfluxDB client created for process {os.getpid()}")
         return influxdb
 
     except Exception as err:
@@ -49,20 +116,29 @@ def create_influxdb_client() -> InfluxDBClient:
         raise err
 
 
-influxdb_client: InfluxDBClient = create_influxdb_client()
-
-
-def create_redis_client() -> Redis:
+def create_redis_client(config: Mapping[str, Any]) -> 'Redis':
     """
     Create and return a Redis client.
 
+    Args:
+        config (Mapping[str, Any]): The settings to build the client from.
+
     Returns:
-        Redis: An instance of Redis client.
+        Redis: An instance of Redis client backed by a bounded, health-checked connection pool.
     """
     try:
-        redis: Redis = Redis(
-            host='redis_host', port=6379, db=0, decode_responses=True
+        from redis import BlockingConnectionPool, Redis
+        pool: BlockingConnectionPool = BlockingConnectionPool.from_url(
+            config['REDIS_URL'],
+            max_connections=config['REDIS_MAX_CONNECTIONS'],
+            timeout=config['REDIS_POOL_TIMEOUT'],
+            socket_timeout=config['REDIS_SOCKET_TIMEOUT'],
+            socket_connect_timeout=config['REDIS_SOCKET_CONNECT_TIMEOUT'],
+            health_check_interval=config['REDIS_HEALTH_CHECK_INTERVAL'],
+            decode_responses=True
         )
+        redis: Redis = Redis(connection_pool=pool)
+        app_logger.info(f"Redis client created for process {os.getpid()}")
         return redis
 
     except Exception as err:
@@ -70,7 +146,53 @@ def create_redis_client() -> Redis:
         raise err
 
 
-redis_client: Redis = create_redis_client()
+def get_influxdb_client() -> 'InfluxDBClient':
+    """
+    Return the InfluxDB client of the current process, creating it on first use.
+
+    Returns:
+        InfluxDBClient: The per-process InfluxDB client.
+    """
+    return _get_client('influxdb', create_influxdb_client)
+
+
+def get_redis_client() -> 'Redis':
+    """
+    Return the Redis client of the current process, creating it on first use.
+
+    Returns:
+        Redis: The per-process Redis client.
+    """
+    return _get_client('redis', create_redis_client)
+
+
+def check_influxdb() -> bool:
+    """
+    Check that InfluxDB is reachable.
+
+    Returns:
+        bool: True if the server answered a ping, False otherwise.
+    """
+    try:
+        get_influxdb_client().ping()
+        return True
+    except Exception as err:
+        app_logger.error(f"InfluxDB health check failed: {str(err)}")
+        return False
+
+
+def check_redis() -> bool:
+    """
+    Check that Redis is reachable.
+
+    Returns:
+        bool: True if the server answered a ping, False otherwise.
+    """
+    try:
+        return bool(get_redis_client().ping())
+    except Exception as err:
+        app_logger.error(f"Redis health check failed: {str(err)}")
+        return False
 
 
 def create_keycloak_oauth(app: Flask) -> OAuth:
@@ -105,22 +227,34 @@ def create_keycloak_oauth(app: Flask) -> OAuth:
 
 def create_celery(app: Flask) -> Celery:
     """
-    Create and return a Celery instance.
+    Configure and return the Celery instance of the application.
+
+    Tasks run within an application context, so they can use ``db.session`` and the app
+    config. The instance becomes the default Celery app, used by ``delay`` and
+    ``apply_async`` in the web workers and by the tasks of ``app.tasks`` in Celery workers.
 
     Args:
         app (Flask): The Flask application instance to be used.
 
     Returns:
-        Celery: A Celery instance.
+        Celery: The configured Celery instance.
     """
     try:
-        celery = Celery(
-            app.import_name,
-            backend=app.config['CELERY_RESULT_BACKEND'],
-            broker=app.config['CELERY_BROKER_URL']
+        class ContextTask(celery.Task):
+            def __call__(self, *args: Any, **kwargs: Any) -> Any:
+                with app.app_context():
+                    return self.run(*args, **kwargs)
+
+        celery.main = app.import_name
+        celery.conf.update(
+            broker_url=app.config['CELERY_BROKER_URL'],
+            result_backend=app.config['CELERY_RESULT_BACKEND'],
+            # Executions last minutes; a worker only reserves the job it runs
+            worker_prefetch_multiplier=1,
+            task_track_started=True,
         )
-
-        celery.conf.update(app.config)
+        celery.Task = ContextTask
+        celery.set_default()
         return celery
 
     except Exception as err:
@@ -163,7 +297,16 @@ def init_app(app: Flask) -> NoReturn:
     """
     try:
         app_logger.info("Initializing Flask extensions...")
+        _client_settings.update(
+            {key: value for key, value in app.config.items() if key.startswith(('INFLUXDB_', 'REDIS_'))})
+        if not app.config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+        replicas: list[str] = register_replica_binds(app.config)
+        if replicas:
+            app_logger.info(f"Routing read-only queries to {len(replicas)} database replicas")
         db.init_app(app)
+        entity_cache.configure(app.config, get_redis_client)
+        create_celery(app)
         with app.app_context():
             db.create_all()
         migrate.init_app(app, db)
@@ -0,0 +1,67 @@
+import re
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import datetime
+
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+AGGREGATION_PATTERN = re.compile(
+    r'^(mean|median|min|max|sum|count|first|last|spread|stddev|p(?:[1-9]|[1-9][0-9]))$')
+
+
+class PerformanceSeriesQuery(BaseModel):
+    """
+    Schema for a bounded time-series query against the performance measurements.
+
+    Attributes:
+        test_id (int): The identifier of the performance test whose series is requested.
+        start (datetime): Inclusive lower bound of the time range.
+        end (datetime): Exclusive upper bound of the time range.
+        metrics (List[str]): Field names to aggregate (e.g. 'response_time').
+        resolution (Optional[int]): Width of each GROUP BY time() bucket in seconds.
+            When omitted, the finest resolution that fits the point budget is used.
+        aggregation (str): Aggregate function applied per bucket ('mean', 'max', 'p95', ...).
+        max_points (Optional[int]): When set, the series is visually downsampled with LTTB
+            to at most this many points.
+    """
+    test_id: int
+    start: datetime
+    end: datetime
+    metrics: List[str] = Field(min_length=1, max_length=10)
+    resolution: Optional[int] = Field(default=None, gt=0)
+    aggregation: str = 'mean'
+    max_points: Optional[int] = Field(default=None, ge=3)
+
+    @field_validator('metrics', mode='before')
+    @classmethod
+    def split_metrics(cls, value):
+        if isinstance(value, str):
+            return [metric.strip() for metric in value.split(',') if metric.strip()]
+        return value
+
+    @field_validator('metrics')
+    @classmethod
+    def validate_metrics(cls, value: List[str]) -> List[str]:
+        for metric in value:
+            if not IDENTIFIER_PATTERN.match(metric):
+                raise ValueError(f"Invalid metric name: {metric}")
+        return value
+
+    @field_validator('aggregation')
+    @classmethod
+    def validate_aggregation(cls, value: str) -> str:
+        if not AGGREGATION_PATTERN.match(value):
+            raise ValueError(f"Unsupported aggregation: {value}")
+        return value
+
+    @model_validator(mode='after')
+    def validate_time_range(self) -> 'PerformanceSeriesQuery':
+        if self.start >= self.end:
+            raise ValueError("start must be earlier than end")
+        return self
+
+    @model_validator(mode='after')
+    def validate_max_points(self) -> 'PerformanceSeriesQuery':
+        # Each metric is downsampled to its own share of the points
+        if self.max_points is not None and self.max_points < 3 * len(self.metrics):
+            raise ValueError(f"max_points must be at least 3 per metric ({3 * len(self.metrics)})")
+        return self
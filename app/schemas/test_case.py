@@ -0,0 +1,44 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+
+class TestCaseCreate(BaseModel):
+    """
+    Schema for one test case of a bulk creation.
+
+    Attributes:
+        name (str): The name of the test case.
+        description (Optional[str]): An optional description of the test case.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    name: str = Field(min_length=1, max_length=128)
+    description: Optional[str] = Field(default='', max_length=256)
+
+
+class TestCaseUpdate(BaseModel):
+    """
+    Schema for one test case of a bulk update; only the fields given are changed.
+
+    Attributes:
+        id (int): The ID of the test case to update.
+        name (Optional[str]): The new name of the test case.
+        description (Optional[str]): The new description of the test case.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    id: int
+    name: Optional[str] = Field(default=None, min_length=1, max_length=128)
+    description: Optional[str] = Field(default=None, max_length=256)
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, value: Optional[str]) -> str:
+        if value is None:
+            raise ValueError("name may not be null")
+        return value
+
+
+# Validators of whole request bodies, built once at import time
+TEST_CASES_CREATE: TypeAdapter = TypeAdapter(List[TestCaseCreate])
+TEST_CASES_UPDATE: TypeAdapter = TypeAdapter(List[TestCaseUpdate])
@@ -0,0 +1,47 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from app.schemas.test_case import TestCaseCreate
+
+
+class TestSuiteCreate(BaseModel):
+    """
+    Schema for one test suite of a bulk creation, with the test cases it is created with.
+
+    Attributes:
+        name (str): The name of the test suite.
+        description (Optional[str]): An optional description of the test suite.
+        test_cases (List[TestCaseCreate]): The test cases of the suite.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    name: str = Field(min_length=1, max_length=128)
+    description: Optional[str] = Field(default='', max_length=256)
+    test_cases: List[TestCaseCreate] = Field(default_factory=list)
+
+
+class TestSuiteUpdate(BaseModel):
+    """
+    Schema for one test suite of a bulk update; only the fields given are changed.
+
+    Attributes:
+        id (int): The ID of the test suite to update.
+        name (Optional[str]): The new name of the test suite.
+        description (Optional[str]): The new description of the test suite.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    id: int
+    name: Optional[str] = Field(default=None, min_length=1, max_length=128)
+    description: Optional[str] = Field(default=None, max_length=256)
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, value: Optional[str]) -> str:
+        if value is None:
+            raise ValueError("name may not be null")
+        return value
+
+
+# Validators of whole request bodies, built once at import time
+TEST_SUITES_CREATE: TypeAdapter = TypeAdapter(List[TestSuiteCreate])
+TEST_SUITES_UPDATE: TypeAdapter = TypeAdapter(List[TestSuiteUpdate])
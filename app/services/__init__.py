@@ -1,5 +1,6 @@
 from typing import Any, Literal
 from prefect import flow
+from app.db.cache import cached_get
 from app.db.schema import TestSuite, User
 from app.services.api_test_execution_service import aggregate_results, execute_test_case
 from prefect.task_runners import ConcurrentTaskRunner
@@ -48,7 +49,7 @@ def test_execution_flow(test_suite_id: int):
         test_suite_id (int): The ID of the test suite to execute.
     """
     try:
-        test_suite: TestSuite = TestSuite.query.get(test_suite_id)
+        test_suite: TestSuite = cached_get(TestSuite, test_suite_id)
     
     except Exception as err:
         service_logger.error(f"Error retrieving test suite {test_suite_id}: {err}")
@@ -85,7 +86,7 @@ def execute_test_suite(test_suite_id: int) -> dict[str, Any]:
         dict[str, Any]: A dictionary containing the execution results.
     """
     try:
-        test_suite: TestSuite = TestSuite.query.get(test_suite_id)
+        test_suite: TestSuite = cached_get(TestSuite, test_suite_id)
         if not test_suite:
             service_logger.error(f"Test Suite not found: {test_suite_id}")
             raise ValueError(f"Test Suite with ID {test_suite_id} not found.")
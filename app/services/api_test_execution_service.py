@@ -1,13 +1,21 @@
 import subprocess
+import time
+from datetime import datetime
 from typing import List, Dict, Any
-from app.db.schema import TestCase, TestSuite
+from app.db.cache import cached_get
+from app.db.schema import TestCase, TestResult, TestSuite, month_bucket
+from app.db.unit_of_work import unit_of_work
+from app.services.result_writer import BulkResultWriter
 # from app.tasks import perform_async_test
 from app.utils.logger import service_logger
+from app.utils.processes import start_process, wait_process
 
 
 def execute_test_suite(test_suite_id: int) -> Dict[str, Any]:
     """
-    Executes all test cases in a given test suite.
+    Executes all test cases in a given test suite as a new test run.
+
+    The results are buffered and written in a single transaction when the run ends.
 
     Args:
         test_suite_id (int): The ID of the test suite to execute.
@@ -15,15 +23,19 @@ def execute_test_suite(test_suite_id: int) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary containing the execution results.
     """
-    test_suite = TestSuite.query.get(test_suite_id)
+    test_suite = cached_get(TestSuite, test_suite_id)
     if not test_suite:
         service_logger.error(f"Test Suite not found: {test_suite_id}")
         raise ValueError(f"Test Suite with ID {test_suite_id} not found.")
 
-    results: Dict[str, Any] = {"test_suite_id": test_suite_id, "results": []}
-    for test_case in test_suite.test_cases:
-        result: Dict[str, Any] = execute_test_case(test_case.id)
-        results["results"].append(result)
+    writer: BulkResultWriter = BulkResultWriter.for_new_run(test_suite_id)
+    results: Dict[str, Any] = {"test_suite_id": test_suite_id, "test_run_id": writer.test_run_id, "results": []}
+    with writer:
+        for test_case in test_suite.test_cases:
+            result: Dict[str, Any] = execute_test_case(test_case.id)
+            writer.add(test_case.id, "Passed" if result["status"] == "success" else "Failed",
+                       execution_time=result["execution_time"], result_data=result["output"])
+            results["results"].append(result)
 
     service_logger.info(f"Executed test suite: {test_suite_id}")
     return results
@@ -39,25 +51,50 @@ def execute_test_case(test_case_id: int) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary containing the execution result.
     """
-    test_case = TestCase.query.get(test_case_id)
+    test_case = cached_get(TestCase, test_case_id)
     if not test_case:
         service_logger.error(f"Test Case not found: {test_case_id}")
         raise ValueError(f"Test Case with ID {test_case_id} not found.")
 
     collection_path: str = f'path_to_collections/{test_case.name}.json'
-    result: subprocess.CompletedProcessa = subprocess.run(
-        ["newman", "run", collection_path], capture_output=True, text=True)
+    started: float = time.perf_counter()
+    process: subprocess.Popen = start_process(
+        ["newman", "run", collection_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    output, _ = wait_process(process)
+    execution_status: str = "success" if process.returncode == 0 else "failure"
 
     service_logger.info(
         f"Executed test case: {test_case_id}, Status: {execution_status}")
     return {
         "test_case_id": test_case_id,
         "name": test_case.name,
-        "status": "success" if result.returncode == 0 else "failure",
-        "output": result.stdout
+        "status": execution_status,
+        "execution_time": time.perf_counter() - started,
+        "output": output
     }
 
 
+def run_test_case(test_case_id: int) -> Dict[str, Any]:
+    """
+    Executes a single test case and stores its result.
+
+    Args:
+        test_case_id (int): The ID of the test case to execute.
+
+    Returns:
+        Dict[str, Any]: The stored TestResult as a dictionary.
+    """
+    result: Dict[str, Any] = execute_test_case(test_case_id)
+    created_at: datetime = datetime.utcnow()
+    with unit_of_work() as uow:
+        # Every field is given, as the mapped dataclass would otherwise default to the columns
+        new_result: TestResult = uow.add(TestResult(
+            id=None, test_case_id=test_case_id, status="Passed" if result["status"] == "success" else "Failed",
+            execution_time=result["execution_time"], result_data=result["output"], created_at=created_at,
+            created_month=month_bucket(created_at)))
+    return new_result.to_dict()
+
+
 def aggregate_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Aggregates results from multiple test executions.
@@ -0,0 +1,163 @@
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Type
+from sqlalchemy import update
+from app.extensions import celery, db
+from app.db.cache import cached_get
+from app.db.schema import ExecutionJob, PerformanceTest, TestCase, TestSuite
+from app.db.unit_of_work import unit_of_work
+from app.services.api_test_execution_service import execute_test_suite, run_test_case
+from app.services.performance_test_service import run_performance_test
+from app.utils.logger import service_logger
+from app.utils.serialization import dumps
+
+# Model of the target of each kind of job
+JOB_TARGETS: Dict[str, Type[Any]] = {
+    'test_suite': TestSuite,
+    'test_case': TestCase,
+    'performance_test': PerformanceTest,
+}
+
+# Runs the execution of each kind of job, given the target ID and the session; raises when it cannot run
+EXECUTORS: Dict[str, Callable[[int, Any], Dict[str, Any]]] = {
+    'test_suite': lambda target_id, db_session: execute_test_suite(target_id),
+    'test_case': lambda target_id, db_session: run_test_case(target_id),
+    'performance_test': run_performance_test,
+}
+
+# Statuses of jobs that have not finished yet
+ACTIVE_STATUSES: tuple = ('queued', 'running')
+
+
+class ExecutionJobService:
+    """
+    Queues executions for the Celery workers and tracks them as ExecutionJob rows.
+
+    Every status change is a conditional UPDATE from the statuses it is allowed from, so a
+    job cancelled while it waits in the queue is never started, and a job cancelled while
+    it runs keeps its cancelled status when the worker finishes.
+    """
+
+    def __init__(self, db_session=None):
+        self.db_session = db_session or db.session
+
+    def enqueue(self, kind: str, target_id: int) -> ExecutionJob:
+        """
+        Create a job and send it to the workers.
+
+        Args:
+            kind (str): 'test_suite', 'test_case' or 'performance_test'.
+            target_id (int): The ID of the suite, case or performance test to execute.
+
+        Returns:
+            ExecutionJob: The queued job.
+
+        Raises:
+            ValueError: If the kind is unknown or the target does not exist.
+        """
+        model: Optional[Type[Any]] = JOB_TARGETS.get(kind)
+        if model is None:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if cached_get(model, target_id, self.db_session) is None:
+            raise ValueError(f"{model.__name__} with ID {target_id} not found.")
+
+        with unit_of_work(self.db_session) as uow:
+            job: ExecutionJob = uow.add(ExecutionJob(
+                id=str(uuid.uuid4()), kind=kind, target_id=target_id, status='queued', result=None, error=None,
+                created_at=datetime.utcnow(), started_at=None, finished_at=None))
+
+        # Sent after the commit, so that the worker always finds the job
+        try:
+            from app.tasks import run_execution_job
+            run_execution_job.apply_async(args=[job.id], task_id=job.id)
+        except Exception as err:
+            service_logger.error(f"Error queuing {kind} {target_id} as job {job.id}: {err}")
+            self._transition(job.id, ('queued',), status='failed', error=f"Not queued: {err}",
+                             finished_at=datetime.utcnow())
+            raise err
+        service_logger.info(f"Queued {kind} {target_id} as job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ExecutionJob]:
+        """
+        Return a job by its ID.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[ExecutionJob]: The job, or None if it does not exist.
+        """
+        return self.db_session.get(ExecutionJob, job_id)
+
+    def run(self, job_id: str) -> Optional[ExecutionJob]:
+        """
+        Execute a queued job and record its result; called by the worker.
+
+        Jobs that are no longer queued, e.g. cancelled ones, are skipped.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[ExecutionJob]: The finished job, or None if it does not exist.
+        """
+        job: Optional[ExecutionJob] = self.get(job_id)
+        if job is None:
+            service_logger.error(f"Job {job_id} not found")
+            return None
+        kind, target_id = job.kind, job.target_id
+        if not self._transition(job_id, ('queued',), status='running', started_at=datetime.utcnow()):
+            service_logger.info(f"Skipping job {job_id}, which is {job.status}")
+            return job
+
+        service_logger.info(f"Running job {job_id}: {kind} {target_id}")
+        try:
+            result: Dict[str, Any] = EXECUTORS[kind](target_id, self.db_session)
+        except Exception as err:
+            service_logger.error(f"Job {job_id} failed: {err}")
+            self.db_session.rollback()
+            self._transition(job_id, ('running',), status='failed', error=str(err), finished_at=datetime.utcnow())
+        else:
+            if not self._transition(job_id, ('running',), status='succeeded', result=dumps(result).decode('utf-8'),
+                                    finished_at=datetime.utcnow()):
+                service_logger.info(f"Job {job_id} finished after being cancelled; its result is discarded")
+        return self.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[ExecutionJob]:
+        """
+        Cancel a queued or running job.
+
+        The Celery task is revoked, and terminated along with the Locust or Newman process
+        it runs if it already started.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[ExecutionJob]: The cancelled job, or None if it does not exist.
+
+        Raises:
+            ValueError: If the job already finished.
+        """
+        job: Optional[ExecutionJob] = self.get(job_id)
+        if job is None:
+            return None
+        if not self._transition(job_id, ACTIVE_STATUSES, status='cancelled', finished_at=datetime.utcnow()):
+            raise ValueError(f"Job {job_id} is already {self.get(job_id).status}")
+
+        try:
+            celery.control.revoke(job_id, terminate=True)
+        except Exception as err:
+            # A job that did not start yet is still skipped by the worker
+            service_logger.error(f"Error revoking the task of job {job_id}: {err}")
+        service_logger.info(f"Cancelled job {job_id}")
+        return self.get(job_id)
+
+    def _transition(self, job_id: str, statuses: Iterable[str], **values: Any) -> bool:
+        # Jobs loaded in the session are updated along with their rows
+        with unit_of_work(self.db_session):
+            updated: int = self.db_session.execute(
+                update(ExecutionJob).where(ExecutionJob.id == job_id, ExecutionJob.status.in_(tuple(statuses)))
+                .values(**values)).rowcount
+        return updated == 1
@@ -0,0 +1,145 @@
+import calendar
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from flask import current_app
+from app.extensions import db
+from app.db.schema import LatencySketch
+from app.db.unit_of_work import unit_of_work
+from app.utils.tdigest import TDigest
+from app.utils.logger import service_logger
+
+
+def percentile_label(quantile: float) -> str:
+    """
+    Format a quantile as a percentile label, e.g. 0.99 -> 'p99' and 0.999 -> 'p99.9'.
+    """
+    return f"p{quantile * 100:g}"
+
+
+class LatencySketchService:
+    """
+    Maintains mergeable t-digest sketches of response times per performance test.
+
+    Every batch of live samples updates the sketch of its run and the sketch of the
+    rolling window it falls in. Percentile queries merge the stored sketches instead
+    of re-reading raw samples.
+    """
+
+    def __init__(self, db_session=None):
+        self.db_session = db_session or db.session
+
+    def record_samples(self, performance_test_id: int, samples: Iterable[float],
+                       performance_result_id: Optional[int] = None,
+                       timestamp: Optional[datetime] = None, weight: float = 1.0) -> None:
+        """
+        Add response time samples to the run and rolling window sketches.
+
+        Args:
+            performance_test_id (int): The ID of the performance test the samples belong to.
+            samples (Iterable[float]): The response times to add.
+            performance_result_id (Optional[int]): The run the samples belong to, if any.
+            timestamp (Optional[datetime]): When the samples were taken. Defaults to now (UTC).
+            weight (float): The number of requests each sample stands for, when the samples
+                summarize a larger run.
+        """
+        values: np.ndarray = np.asarray(list(samples), dtype=np.float64)
+        if not values.size:
+            return
+
+        window_start: datetime = self._window_start(timestamp or datetime.utcnow())
+        try:
+            with unit_of_work(self.db_session):
+                if performance_result_id is not None:
+                    self._update_sketch(self._get_or_create_sketch(
+                        performance_test_id, performance_result_id=performance_result_id), values, weight)
+                self._update_sketch(self._get_or_create_sketch(
+                    performance_test_id, window_start=window_start), values, weight)
+            service_logger.info(
+                f"Recorded {values.size} latency samples for test_id: {performance_test_id}")
+        except Exception as err:
+            service_logger.error(
+                f"Error recording latency samples for test_id {performance_test_id}: {err}")
+            raise err
+
+    def get_digest(self, performance_test_id: int, result_ids: Optional[List[int]] = None,
+                   since: Optional[datetime] = None, until: Optional[datetime] = None) -> TDigest:
+        """
+        Merge the stored sketches of a performance test into a single digest.
+
+        Args:
+            performance_test_id (int): The ID of the performance test.
+            result_ids (Optional[List[int]]): Merge the sketches of these runs. When omitted,
+                the rolling window sketches are merged instead.
+            since (Optional[datetime]): Only merge windows starting at or after this time.
+            until (Optional[datetime]): Only merge windows starting before this time.
+
+        Returns:
+            TDigest: The merged digest.
+        """
+        query = self.db_session.query(LatencySketch.digest).filter(
+            LatencySketch.performance_test_id == performance_test_id)
+        if result_ids:
+            query = query.filter(LatencySketch.performance_result_id.in_(result_ids))
+        else:
+            query = query.filter(LatencySketch.window_start.isnot(None))
+            if since:
+                query = query.filter(LatencySketch.window_start >= self._window_start(since))
+            if until:
+                query = query.filter(LatencySketch.window_start < until)
+
+        digests: List[TDigest] = [TDigest.from_bytes(row.digest) for row in query]
+        return TDigest.merge_all(digests, current_app.config['LATENCY_SKETCH_COMPRESSION'])
+
+    def get_percentiles(self, performance_test_id: int, quantiles: List[float],
+                        result_ids: Optional[List[int]] = None, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Estimate response time percentiles across a set of runs or windows.
+
+        Args:
+            performance_test_id (int): The ID of the performance test.
+            quantiles (List[float]): The quantiles to estimate, in the [0, 1] range.
+            result_ids (Optional[List[int]]): Restrict the estimate to these runs.
+            since (Optional[datetime]): Lower bound for rolling windows.
+            until (Optional[datetime]): Upper bound for rolling windows.
+
+        Returns:
+            Dict[str, Any]: The sample count and the estimated percentiles keyed by label.
+        """
+        digest: TDigest = self.get_digest(performance_test_id, result_ids, since, until)
+        values: np.ndarray = digest.quantiles(quantiles)
+        service_logger.info(f"Estimated latency percentiles for test_id: {performance_test_id}")
+        return {
+            'performance_test_id': performance_test_id,
+            'count': digest.count,
+            'percentiles': {
+                percentile_label(quantile): None if np.isnan(value) else float(value)
+                for quantile, value in zip(quantiles, values)
+            }
+        }
+
+    def _get_or_create_sketch(self, performance_test_id: int, **filters: Any) -> LatencySketch:
+        sketch: Optional[LatencySketch] = self.db_session.query(LatencySketch).filter_by(
+            performance_test_id=performance_test_id, **filters).with_for_update().first()
+        if not sketch:
+            # Every field is given, as the mapped dataclass would otherwise default to the columns
+            sketch = LatencySketch(**{
+                'id': None, 'performance_test_id': performance_test_id, 'performance_result_id': None,
+                'window_start': None, 'sample_count': 0,
+                'digest': TDigest(current_app.config['LATENCY_SKETCH_COMPRESSION']).to_bytes(),
+                'updated_at': datetime.utcnow(), **filters})
+            self.db_session.add(sketch)
+        return sketch
+
+    @staticmethod
+    def _update_sketch(sketch: LatencySketch, values: np.ndarray, weight: float) -> None:
+        digest: TDigest = TDigest.from_bytes(sketch.digest).update(values, weight)
+        sketch.digest = digest.to_bytes()
+        sketch.sample_count = digest.count
+
+    @staticmethod
+    def _window_start(timestamp: datetime) -> datetime:
+        window: int = current_app.config['LATENCY_SKETCH_WINDOW_SECONDS']
+        seconds: int = calendar.timegm(timestamp.utctimetuple())
+        return datetime.utcfromtimestamp(seconds - seconds % window)
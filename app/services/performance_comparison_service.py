@@ -0,0 +1,192 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.extensions import db
+from app.db.schema import PerformanceTestResult
+from app.utils.logger import service_logger
+
+# Per-endpoint stats compared between runs, as stored in PerformanceTestResult.result_data
+COMPARISON_METRICS: Tuple[str, ...] = ('p50', 'p95', 'p99', 'rps')
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+_T_CRITICAL_95: np.ndarray = np.array([
+    np.nan, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042])
+_Z_95: float = 1.959964
+
+
+def t_critical_95(degrees_of_freedom: np.ndarray) -> np.ndarray:
+    """
+    Two-sided 95% Student t critical values, element-wise.
+
+    Tabulated up to 30 degrees of freedom; beyond that the Cornish-Fisher expansion
+    around the normal quantile is used. Zero degrees of freedom yield NaN.
+
+    Args:
+        degrees_of_freedom (np.ndarray): Degrees of freedom (non-negative integers).
+
+    Returns:
+        np.ndarray: The critical values.
+    """
+    df: np.ndarray = np.asarray(degrees_of_freedom, dtype=np.int64)
+    large: np.ndarray = np.maximum(df, 1).astype(np.float64)
+    approximation: np.ndarray = _Z_95 + (_Z_95 ** 3 + _Z_95) / (4 * large)
+    return np.where(df <= 30, _T_CRITICAL_95[np.clip(df, 0, 30)], approximation)
+
+
+def build_stats_matrix(runs: List[Dict[str, Any]],
+                       metrics: Tuple[str, ...] = COMPARISON_METRICS) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack per-endpoint run stats into a dense array.
+
+    Args:
+        runs (List[Dict[str, Any]]): Parsed result_data of each run, with an 'endpoints' mapping.
+        metrics (Tuple[str, ...]): The stats to extract for each endpoint.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The sorted endpoint names and a
+            (runs, endpoints, metrics) array with NaN where a run lacks an endpoint or stat.
+    """
+    endpoints: List[str] = sorted({name for run in runs for name in (run.get('endpoints') or {})})
+    positions: Dict[str, int] = {name: index for index, name in enumerate(endpoints)}
+    matrix: np.ndarray = np.full((len(runs), len(endpoints), len(metrics)), np.nan)
+    for run_index, run in enumerate(runs):
+        for name, stats in (run.get('endpoints') or {}).items():
+            matrix[run_index, positions[name]] = [stats.get(metric, np.nan) for metric in metrics]
+    return endpoints, matrix
+
+
+def compare_stats(candidate: np.ndarray, baseline: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compare a candidate run against baseline runs, vectorized over endpoints and metrics.
+
+    The baseline mean gets a 95% confidence interval. Since the candidate is a single run,
+    its delta gets a 95% prediction interval (``t * s * sqrt(1 + 1/n)``); a delta whose
+    interval excludes zero is flagged as significant.
+
+    Args:
+        candidate (np.ndarray): A (endpoints, metrics) array for the candidate run.
+        baseline (np.ndarray): A (runs, endpoints, metrics) array for the baseline runs.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays of shape (endpoints, metrics) for each statistic.
+    """
+    count: np.ndarray = np.sum(~np.isnan(baseline), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean: np.ndarray = np.nansum(baseline, axis=0) / count
+        squares: np.ndarray = np.nansum((baseline - mean) ** 2, axis=0)
+        std: np.ndarray = np.sqrt(squares / (count - 1))
+        t_value: np.ndarray = t_critical_95(np.maximum(count - 1, 0))
+        mean_margin: np.ndarray = t_value * std / np.sqrt(count)
+        delta_margin: np.ndarray = t_value * std * np.sqrt(1 + 1 / count)
+        delta: np.ndarray = candidate - mean
+        delta_pct: np.ndarray = np.where(mean != 0, delta / mean * 100, np.nan)
+
+    return {
+        'runs': count,
+        'baseline_mean': mean,
+        'baseline_ci_low': mean - mean_margin,
+        'baseline_ci_high': mean + mean_margin,
+        'candidate': candidate,
+        'delta': delta,
+        'delta_pct': delta_pct,
+        'delta_ci_low': delta - delta_margin,
+        'delta_ci_high': delta + delta_margin,
+        'significant': np.abs(delta) > delta_margin,
+    }
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+class PerformanceComparisonService:
+    """
+    Compares a candidate performance run against a set of baseline runs.
+    """
+
+    def __init__(self, db_session=None):
+        self.db_session = db_session or db.session
+
+    def get_baseline_ids(self, candidate: PerformanceTestResult, last: int) -> List[int]:
+        """
+        Return the IDs of the last runs of the same performance test before the candidate.
+
+        Args:
+            candidate (PerformanceTestResult): The run being evaluated.
+            last (int): How many previous runs to use.
+
+        Returns:
+            List[int]: The baseline result IDs, most recent first.
+        """
+        rows = self.db_session.query(PerformanceTestResult.id).filter(
+            PerformanceTestResult.performance_test_id == candidate.performance_test_id,
+            PerformanceTestResult.id < candidate.id
+        ).order_by(PerformanceTestResult.id.desc()).limit(last)
+        return [row.id for row in rows]
+
+    def compare(self, candidate_id: int, baseline_ids: Optional[List[int]] = None,
+                last: int = 10) -> Dict[str, Any]:
+        """
+        Compare per-endpoint latency percentiles and throughput of a run against baselines.
+
+        Args:
+            candidate_id (int): The ID of the candidate PerformanceTestResult.
+            baseline_ids (Optional[List[int]]): Baseline PerformanceTestResult IDs. When
+                omitted, the ``last`` previous runs of the same performance test are used.
+            last (int): Number of previous runs to use when no baseline IDs are given.
+
+        Returns:
+            Dict[str, Any]: The comparison, keyed by endpoint and metric.
+
+        Raises:
+            ValueError: If the candidate or baseline runs cannot be found.
+        """
+        candidate: Optional[PerformanceTestResult] = self.db_session.get(PerformanceTestResult, candidate_id)
+        if not candidate:
+            raise ValueError(f"Performance result with ID {candidate_id} not found.")
+
+        baseline_ids = [result_id for result_id in (baseline_ids or self.get_baseline_ids(candidate, last))
+                        if result_id != candidate_id]
+        if not baseline_ids:
+            raise ValueError(f"No baseline runs found for performance result {candidate_id}.")
+
+        baselines: List[PerformanceTestResult] = self.db_session.query(PerformanceTestResult).filter(
+            PerformanceTestResult.id.in_(baseline_ids)).all()
+        missing: set = set(baseline_ids) - {result.id for result in baselines}
+        if missing:
+            raise ValueError(f"Performance results not found: {sorted(missing)}")
+
+        runs: List[Dict[str, Any]] = [self._load_stats(result) for result in [candidate, *baselines]]
+        endpoints, matrix = build_stats_matrix(runs)
+        comparison: Dict[str, np.ndarray] = compare_stats(matrix[0], matrix[1:])
+        service_logger.info(
+            f"Compared performance result {candidate_id} against {len(baselines)} baseline runs "
+            f"over {len(endpoints)} endpoints")
+
+        return {
+            'candidate_id': candidate_id,
+            'baseline_ids': sorted(result.id for result in baselines),
+            'confidence': 0.95,
+            'endpoints': {
+                endpoint: {
+                    metric: {name: _to_json_value(values[endpoint_index, metric_index])
+                             for name, values in comparison.items()}
+                    for metric_index, metric in enumerate(COMPARISON_METRICS)
+                }
+                for endpoint_index, endpoint in enumerate(endpoints)
+            }
+        }
+
+    @staticmethod
+    def _load_stats(result: PerformanceTestResult) -> Dict[str, Any]:
+        try:
+            return json.loads(result.result_data or '{}')
+        except ValueError as err:
+            service_logger.error(f"Invalid result data for performance result {result.id}: {err}")
+            return {}
@@ -1,10 +1,84 @@
-from typing import List, Dict, Any
-from influxdb import InfluxDBClient, ResultSet
-from sqlalchemy.sql import count
-from app.extensions import influxdb_client, db
+import math
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Tuple
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.sql.functions import count
+from app.extensions import db, get_influxdb_client
 from app.db.schema import TestResult, PerformanceTestResult
+from app.db.unit_of_work import unit_of_work
+from app.schemas.performance_query import PerformanceSeriesQuery
+from app.services.latency_sketch_service import LatencySketchService
+from app.utils.downsampling import downsample_points
 from app.utils.logger import service_logger
 
+PERFORMANCE_MEASUREMENT: str = 'performance'
+
+
+def _format_influx_time(value: datetime) -> str:
+    """
+    Format a datetime as an RFC3339 UTC literal understood by InfluxQL.
+
+    Naive datetimes are assumed to already be in UTC.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _aggregate_expression(aggregation: str, metric: str) -> str:
+    """
+    Build the InfluxQL aggregate call for a metric, e.g. MEAN("latency") or PERCENTILE("latency", 95).
+    """
+    if aggregation.startswith('p'):
+        return f'PERCENTILE("{metric}", {int(aggregation[1:])})'
+    return f'{aggregation.upper()}("{metric}")'
+
+
+def build_series_query(params: PerformanceSeriesQuery, max_range_seconds: int,
+                       max_points: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build a bounded, downsampled InfluxQL query for a performance test time series.
+
+    The time range is capped to ``max_range_seconds`` and the GROUP BY time() resolution is
+    chosen so that no series returns more than ``max_points`` buckets. Identifiers are
+    validated by the schema and values are passed as bind parameters.
+
+    Args:
+        params (PerformanceSeriesQuery): The validated query parameters.
+        max_range_seconds (int): Maximum allowed width of the time range.
+        max_points (int): Maximum number of buckets returned per metric.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The InfluxQL query and its bind parameters.
+
+    Raises:
+        ValueError: If the time range or requested resolution exceed the configured bounds.
+    """
+    range_seconds: float = (params.end - params.start).total_seconds()
+    if range_seconds > max_range_seconds:
+        raise ValueError(
+            f"Time range of {int(range_seconds)}s exceeds the maximum of {max_range_seconds}s")
+
+    min_resolution: int = max(1, math.ceil(range_seconds / max_points))
+    resolution: int = params.resolution or min_resolution
+    if resolution < min_resolution:
+        raise ValueError(
+            f"Resolution of {resolution}s would return more than {max_points} points; "
+            f"use at least {min_resolution}s")
+
+    selects: str = ', '.join(
+        f'{_aggregate_expression(params.aggregation, metric)} AS "{metric}"'
+        for metric in params.metrics)
+    query: str = (
+        f'SELECT {selects} FROM "{PERFORMANCE_MEASUREMENT}" '
+        f'WHERE "test_id" = $test_id '
+        f"AND time >= '{_format_influx_time(params.start)}' "
+        f"AND time < '{_format_influx_time(params.end)}' "
+        f'GROUP BY time({resolution}s) fill(none) '
+        f'LIMIT {max_points}')
+    return query, {'test_id': str(params.test_id)}
+
 
 class PerformanceDataService:
     def __init__(self, db_session=None):
@@ -45,37 +119,84 @@ class PerformanceDataService:
             test_id = data[0]["test_id"]
             service_logger.info(
                 f"Writing performance data for test_id: {test_id}")
-            performance_data = PerformanceTestResult(
-                test_id=test_id, execution_time=data[0]["execution_time"])
-            self.db_session.add(performance_data)
-            self.db_session.commit()
+            # The result row and its latency sketches are committed together
+            with unit_of_work(self.db_session) as uow:
+                performance_data = uow.add(PerformanceTestResult(
+                    id=None, performance_test_id=test_id, execution_time=data[0]["execution_time"],
+                    status=None, result_data=None, executed_at=datetime.utcnow()))
+                uow.flush()
+                LatencySketchService(self.db_session).record_samples(
+                    test_id, [row["execution_time"] for row in data if row.get("execution_time") is not None],
+                    performance_result_id=performance_data.id)
             service_logger.info(
                 f"Added performance data for test_id: {test_id}")
             service_logger.info(
                 f"Writing performance data to InfluxDB for test_id: {test_id}")
-            influxdb_client.write_points(
-                [{"measurement": "performance", "tags": {"test_id": test_id}, "fields": data}])
+            get_influxdb_client().write_points(
+                [{"measurement": PERFORMANCE_MEASUREMENT, "tags": {"test_id": test_id}, "fields": data}])
             service_logger.info("Wrote performance data to InfluxDB")
         except Exception as err:
             service_logger.error(
                 f"Error saving performance data for test_id {test_id}: {err}")
 
-    def get_performance_data(self, query: str) -> ResultSet:
+    def build_query(self, params: PerformanceSeriesQuery) -> Tuple[str, Dict[str, Any]]:
         """
-        Query performance data from the InfluxDB.
+        Build a bounded InfluxQL query using the limits from the application config.
 
         Args:
-            query (str): The query string to retrieve data from InfluxDB.
+            params (PerformanceSeriesQuery): The validated query parameters.
 
         Returns:
-            InfluxDBClient.ResultSet: The result set of the query.
+            Tuple[str, Dict[str, Any]]: The InfluxQL query and its bind parameters.
         """
-        performance_data: Dict[str, float] = {}
+        return build_series_query(
+            params,
+            max_range_seconds=current_app.config['PERFORMANCE_QUERY_MAX_RANGE_SECONDS'],
+            max_points=current_app.config['PERFORMANCE_QUERY_MAX_POINTS'])
+
+    def iter_performance_data(self, params: PerformanceSeriesQuery) -> Iterator[Dict[str, Any]]:
+        """
+        Stream downsampled performance data points from InfluxDB.
+
+        The query is executed with chunked responses so that points are yielded as each
+        chunk arrives instead of materializing the whole result set in memory. When
+        ``max_points`` is requested, the bounded series is collected and reduced with LTTB
+        before being yielded.
+
+        Args:
+            params (PerformanceSeriesQuery): The validated query parameters.
+
+        Yields:
+            Dict[str, Any]: One point per time bucket, keyed by 'time' and the metric names.
+        """
+        points: Iterator[Dict[str, Any]] = self._query_points(params)
+        if params.max_points:
+            points = iter(downsample_points(list(points), params.metrics, params.max_points))
+        yield from points
+
+    def _query_points(self, params: PerformanceSeriesQuery) -> Iterator[Dict[str, Any]]:
+        query, bind_params = self.build_query(params)
+        chunk_size: int = current_app.config['PERFORMANCE_QUERY_CHUNK_SIZE']
+        service_logger.info(f"Querying performance data for test_id: {params.test_id}")
         try:
-            performance_data = influxdb_client.query(query)
-            service_logger.info(f"Retrieved performance data")
-        except Exception as e:
+            for chunk in get_influxdb_client().query(
+                    query, bind_params=bind_params, chunked=True, chunk_size=chunk_size):
+                yield from chunk.get_points()
+        except Exception as err:
             service_logger.error(
-                f"Error retrieving performance data: {e}")
+                f"Error retrieving performance data for test_id {params.test_id}: {err}")
+            raise err
+
+    def get_performance_data(self, params: PerformanceSeriesQuery) -> List[Dict[str, Any]]:
+        """
+        Query downsampled performance data from InfluxDB.
 
+        Args:
+            params (PerformanceSeriesQuery): The validated query parameters.
+
+        Returns:
+            List[Dict[str, Any]]: The bounded list of points for the requested series.
+        """
+        performance_data: List[Dict[str, Any]] = list(self.iter_performance_data(params))
+        service_logger.info(f"Retrieved {len(performance_data)} performance data points")
         return performance_data
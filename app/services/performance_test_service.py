@@ -1,16 +1,53 @@
 import os
 import csv
-import subprocess
+import json
 import threading
 import signal
 import time
 from typing import Any, Dict, List, Optional
-from flask import current_app
-from app.schemas.performance_test import PerformanceTest
+import numpy as np
+from app.db.cache import cached_get
+from app.db.schema import PERFORMANCE_RUN_COMPLETED, PERFORMANCE_RUN_ERROR, PerformanceTest, PerformanceTestResult
+from app.db.unit_of_work import unit_of_work
+from app.services.latency_sketch_service import LatencySketchService
+from app.services.regression_service import RegressionDetectionService
 from app.schemas.test_run import TestRun
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.utils.logger import service_logger
+from app.utils.processes import start_process, wait_process
+
+# Per-endpoint stats kept from Locust's *_stats.csv, keyed by the name used in result_data
+LOCUST_STATS_COLUMNS: Dict[str, str] = {
+    "requests": "Request Count",
+    "failures": "Failure Count",
+    "avg": "Average Response Time",
+    "p50": "50%",
+    "p90": "90%",
+    "p95": "95%",
+    "p99": "99%",
+    "rps": "Requests/s",
+}
+
+# Response time percentiles of Locust's *_stats.csv, from which the latency distribution of a run is rebuilt
+LOCUST_PERCENTILE_COLUMNS: Dict[float, str] = {
+    0.0: "Min Response Time",
+    0.5: "50%",
+    0.66: "66%",
+    0.75: "75%",
+    0.8: "80%",
+    0.9: "90%",
+    0.95: "95%",
+    0.98: "98%",
+    0.99: "99%",
+    0.999: "99.9%",
+    0.9999: "99.99%",
+    1.0: "100%",
+}
+
+# Largest number of response times rebuilt per run for its latency sketch; each stands for an
+# equal share of the requests of the run
+LOCUST_MAX_LATENCY_SAMPLES: int = 1000
 
 
 class LocustPerformanceTester:
@@ -21,49 +58,58 @@ class LocustPerformanceTester:
         test = self._get_test(performance_test_id)
         if not test:
             service_logger.error("Test not found")
-            return {"status": "Error", "message": "Test not found"}
+            return {"status": PERFORMANCE_RUN_ERROR, "message": "Test not found"}
+
+        # Runs started without a test run, e.g. by the execution jobs, are not tracked in one
+        test_run = None
+        if test_run_id is not None:
+            try:
+                test_run = self._get_or_create_test_run(test_run_id)
+                test_run.statuses[performance_test_id] = "started"
+                self.db_session.commit()
 
-        try:
-            test_run = self._get_or_create_test_run(test_run_id)
-            test_run.statuses[performance_test_id] = "started"
-            self.db_session.commit()
-        
-        except Exception as err:
-            service_logger.error(f"Error creating test run: {err}")
-            return {"status": "Error", "message": str(err)}
+            except Exception as err:
+                service_logger.error(f"Error creating test run: {err}")
+                return {"status": PERFORMANCE_RUN_ERROR, "message": str(err)}
 
         try:
-            locust_command = self._build_locust_command(test.config)
             result_file_prefix = f"locust_result_{performance_test_id}"
-            process = subprocess.Popen(locust_command, shell=True)
+            locust_command = self._build_locust_command(self._load_config(test), result_file_prefix)
+            process = start_process(locust_command, shell=True)
 
             # Save process ID to file for later termination
             with open(f"locust_{performance_test_id}.pid", "w") as f:
                 f.write(str(process.pid))
 
             # Wait for process to finish
-            process.wait()
+            wait_process(process)
 
             # Parse and aggregate test results
             results = self._parse_locust_test_results(
-                f"{result_file_prefix}.csv")
+                f"{result_file_prefix}_stats.csv")
+            if not results:
+                raise RuntimeError(f"Locust exited with code {process.returncode} without writing "
+                                   f"{result_file_prefix}_stats.csv")
             aggregated_data = self._aggregate_test_results(results)
 
             # Update test run status and save results
-            test_run.statuses[performance_test_id] = "completed"
-            test_run.results = aggregated_data
-            self.db_session.commit()
+            if test_run is not None:
+                test_run.statuses[performance_test_id] = "completed"
+                test_run.results = aggregated_data
+                self.db_session.commit()
 
             # Cleanup test resources
             self._cleanup_test_resources(result_file_prefix)
             os.remove(f"locust_{performance_test_id}.pid")
 
-            return {"status": "completed", "test_id": performance_test_id, "test_run_id": test_run_id, "results": aggregated_data}
+            return {"status": PERFORMANCE_RUN_COMPLETED, "test_id": performance_test_id, "test_run_id": test_run_id,
+                    "results": aggregated_data, **self._latency_samples(results)}
         except Exception as e:  # Catching a broad exception to handle any subprocess-related errors
             service_logger.error(f"Error executing test: {e}")
-            test_run.statuses[performance_test_id] = "error"
-            self.db_session.commit()
-            return {"status": "Error", "message": str(e)}
+            if test_run is not None:
+                test_run.statuses[performance_test_id] = "error"
+                self.db_session.commit()
+            return {"status": PERFORMANCE_RUN_ERROR, "message": str(e)}
 
     def execute_test_async(self, performance_test_id: int, test_run_id: str) -> None:
         threading.Thread(target=self.execute_test, args=(
@@ -114,9 +160,9 @@ class LocustPerformanceTester:
             self.db_session.commit()
             return
 
-        # Send SIGTERM signal to terminate Locust process
+        # Send SIGTERM signal to the process group of Locust, which also holds its shell
         try:
-            os.kill(locust_pid, signal.SIGTERM)
+            os.killpg(locust_pid, signal.SIGTERM)
             print(f"Sent termination signal to Locust process {locust_pid}")
             test_run.statuses[test_id] = 'stopped'
             self.db_session.commit()
@@ -159,11 +205,19 @@ class LocustPerformanceTester:
         return self.db_session.query(TestRun).filter_by(id=test_run_id).first()
 
     @staticmethod
-    def _build_locust_command(config: Dict[str, Any]) -> str:
+    def _load_config(test: PerformanceTest) -> Dict[str, Any]:
+        # The config is stored as a JSON document
+        if isinstance(test.config, str):
+            return json.loads(test.config or '{}')
+        return test.config or {}
+
+    @staticmethod
+    def _build_locust_command(config: Dict[str, Any], result_file_prefix: str) -> str:
+        # Locust writes <prefix>_stats.csv, which execute_test parses with the same prefix
         return (f"locust -f {config.get('locustfile')} --headless "
                 f"--users {config.get('users', 10)} --spawn-rate {config.get('spawn_rate', 1)} "
                 f"--run-time {config.get('run_time', '1m')} --host {config.get('host')} "
-                f"--csv={config.get('result_file_prefix', 'locust_result')}")
+                f"--csv={result_file_prefix}")
 
     @staticmethod
     def _parse_locust_test_results(csv_file: str) -> List[Dict[str, Any]]:
@@ -172,12 +226,11 @@ class LocustPerformanceTester:
                 csv_reader = csv.DictReader(file)
                 return [row for row in csv_reader]
         except IOError as e:
-            current_app.logger.error(f"Error reading Locust result file: {e}")
+            service_logger.error(f"Error reading Locust result file: {e}")
             return []
 
-    @staticmethod
-    def _get_test(test_id: int) -> Optional[PerformanceTest]:
-        return PerformanceTest.query.get(test_id)
+    def _get_test(self, test_id: int) -> Optional[PerformanceTest]:
+        return cached_get(PerformanceTest, test_id, self.db_session)
 
     def _get_or_create_test_run(self, test_run_id: str) -> TestRun:
         try:
@@ -202,13 +255,105 @@ class LocustPerformanceTester:
     def _aggregate_test_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Aggregates and analyzes the test results.
 
+        Each row of the Locust stats CSV is reduced to the per-endpoint stats that runs are
+        compared on. The "Aggregated" row is kept separately.
+
         :param results: List of test result data
-        :return: Aggregated result data
+        :return: Aggregated result data, keyed by endpoint ("<method> <name>")
         """
-        aggregated_data = {}
+        aggregated_data: Dict[str, Any] = {"endpoints": {}, "aggregated": None}
         for result in results:
-            # Process each result and update aggregated_data
-            # Example: aggregated_data['some_metric'] = calculate_metric(result)
-            pass
+            try:
+                stats: Dict[str, float] = {
+                    metric: float(result[column]) for metric, column in LOCUST_STATS_COLUMNS.items()
+                    if result.get(column) not in (None, '', 'N/A')
+                }
+            except ValueError as err:
+                service_logger.error(f"Error parsing Locust stats row {result.get('Name')}: {err}")
+                continue
+
+            if result.get("Name") == "Aggregated":
+                aggregated_data["aggregated"] = stats
+            else:
+                aggregated_data["endpoints"][f"{result.get('Type', '')} {result.get('Name')}".strip()] = stats
 
         return aggregated_data
+
+    @staticmethod
+    def _latency_samples(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rebuilds response times of a run from the percentiles of the "Aggregated" row.
+
+        Locust does not export individual response times, so evenly spaced quantiles are
+        interpolated between the reported percentiles, one per request up to
+        LOCUST_MAX_LATENCY_SAMPLES. Each quantile is weighted by the number of requests it
+        stands for, so that sketches merged across runs count every request once.
+
+        :param results: List of test result data
+        :return: The response times in milliseconds ("latency_samples", empty if the row is
+            missing) and the number of requests each stands for ("latency_sample_weight")
+        """
+        row: Optional[Dict[str, Any]] = next(
+            (result for result in results if result.get("Name") == "Aggregated"), None)
+        empty: Dict[str, Any] = {"latency_samples": [], "latency_sample_weight": 1.0}
+        if not row:
+            return empty
+        try:
+            points: List[tuple] = [(quantile, float(row[column]))
+                                   for quantile, column in LOCUST_PERCENTILE_COLUMNS.items()
+                                   if row.get(column) not in (None, '', 'N/A')]
+            count: int = int(float(row.get("Request Count") or 0))
+        except ValueError as err:
+            service_logger.error(f"Error parsing Locust percentiles: {err}")
+            return empty
+        if len(points) < 2 or not count:
+            return empty
+
+        size: int = min(count, LOCUST_MAX_LATENCY_SAMPLES)
+        quantiles: np.ndarray = (np.arange(size) + 0.5) / size
+        samples: np.ndarray = np.interp(quantiles, [point[0] for point in points], [point[1] for point in points])
+        return {"latency_samples": samples.tolist(), "latency_sample_weight": count / size}
+
+
+def run_performance_test(performance_test_id: int, db_session: Session) -> Dict[str, Any]:
+    """
+    Executes a performance test with Locust, stores the run with its latency sketch and
+    evaluates it for regressions.
+
+    A failed regression evaluation is logged but does not fail the run. A run Locust could
+    not complete is stored with the Error status, then reported as an exception.
+
+    Args:
+        performance_test_id (int): The ID of the performance test to execute.
+        db_session (Session): The session to store the result with.
+
+    Returns:
+        Dict[str, Any]: The stored PerformanceTestResult as a dictionary.
+
+    Raises:
+        RuntimeError: If the test could not be executed.
+    """
+    result_data: Dict[str, Any] = LocustPerformanceTester(db_session).execute_test(
+        performance_test_id=performance_test_id)
+    stats: Dict[str, Any] = result_data.get('results') or {}
+    aggregated: Dict[str, float] = stats.get('aggregated') or {}
+    new_result: PerformanceTestResult = PerformanceTestResult(
+        id=None, performance_test_id=performance_test_id, execution_time=None, status=result_data.get('status'),
+        result_data=json.dumps(stats), executed_at=datetime.utcnow())
+    # Not dataclass fields of the model, so they are set after construction
+    new_result.avg_response_time = aggregated.get('avg')
+    new_result.requests_per_sec = aggregated.get('rps')
+    # The run and its latency sketch are committed together
+    with unit_of_work(db_session) as uow:
+        uow.add(new_result)
+        uow.flush()
+        LatencySketchService(db_session).record_samples(
+            performance_test_id, result_data.get('latency_samples') or [], performance_result_id=new_result.id,
+            weight=result_data.get('latency_sample_weight', 1.0))
+    if new_result.status == PERFORMANCE_RUN_ERROR:
+        raise RuntimeError(result_data.get('message') or f"Performance test {performance_test_id} failed")
+
+    try:
+        RegressionDetectionService(db_session).evaluate(new_result.id)
+    except Exception as err:
+        service_logger.error(f"Error evaluating regression for performance result {new_result.id}: {err}")
+    return new_result.to_dict()
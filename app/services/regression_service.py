@@ -0,0 +1,146 @@
+import json
+from datetime import datetime
+from typing import Any, List, Mapping, Optional
+import numpy as np
+from flask import current_app
+from app.extensions import db
+from app.db.schema import LatencySketch, PerformanceTestResult, RegressionVerdict
+from app.db.unit_of_work import unit_of_work
+from app.utils.statistics import mann_whitney_greater
+from app.utils.tdigest import TDigest
+from app.utils.logger import service_logger
+
+
+def quantile_sample(digest: TDigest, size: int) -> np.ndarray:
+    """
+    Draw an evenly spaced quantile sample from a latency sketch.
+
+    Args:
+        digest (TDigest): The sketch to sample.
+        size (int): The maximum number of values to draw.
+
+    Returns:
+        np.ndarray: ``min(size, digest.count)`` values at the midpoints of equal-probability slices.
+    """
+    count: int = min(size, digest.count)
+    return digest.quantiles((np.arange(count) + 0.5) / count)
+
+
+def judge_regression(candidate: TDigest, baseline: TDigest,
+                     config: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Decide whether a run's latency distribution is a regression against its baseline.
+
+    The Mann-Whitney U test runs on quantile samples of both sketches. A run is only flagged
+    when the slowdown is significant and its effect size and median slowdown both exceed the
+    configured minimums, so that large samples do not turn noise into failures.
+
+    Args:
+        candidate (TDigest): Latency sketch of the run under test.
+        baseline (TDigest): Merged latency sketch of the baseline runs.
+        config (Mapping[str, Any]): Settings holding the REGRESSION_* thresholds.
+
+    Returns:
+        dict[str, Any]: The verdict status, flag, p-value, effect size and median ratio.
+    """
+    size: int = config['REGRESSION_SAMPLE_SIZE']
+    _, p_value, effect_size = mann_whitney_greater(
+        quantile_sample(candidate, size), quantile_sample(baseline, size))
+    baseline_median: float = baseline.quantile(0.5)
+    median_ratio: Optional[float] = candidate.quantile(0.5) / baseline_median if baseline_median else None
+    is_regression: bool = bool(
+        p_value < config['REGRESSION_ALPHA']
+        and effect_size >= config['REGRESSION_MIN_EFFECT_SIZE']
+        and median_ratio is not None
+        and median_ratio >= 1 + config['REGRESSION_MIN_SLOWDOWN'])
+    return {
+        'status': 'regression' if is_regression else 'pass',
+        'is_regression': is_regression,
+        'p_value': p_value,
+        'effect_size': effect_size,
+        'median_ratio': median_ratio,
+    }
+
+
+class RegressionDetectionService:
+    """
+    Compares performance runs against a rolling baseline of prior runs of the same test.
+    """
+
+    def __init__(self, db_session=None):
+        self.db_session = db_session or db.session
+
+    def evaluate(self, performance_result_id: int) -> RegressionVerdict:
+        """
+        Evaluate a run against its rolling baseline and store the verdict.
+
+        The baseline is made of the latest ``REGRESSION_BASELINE_RUNS`` earlier runs of the
+        same performance test that have a latency sketch.
+
+        Args:
+            performance_result_id (int): The ID of the PerformanceTestResult to evaluate.
+
+        Returns:
+            RegressionVerdict: The stored verdict.
+
+        Raises:
+            ValueError: If the performance result does not exist.
+        """
+        result: Optional[PerformanceTestResult] = self.db_session.get(PerformanceTestResult, performance_result_id)
+        if not result:
+            raise ValueError(f"Performance result with ID {performance_result_id} not found.")
+
+        config: Mapping[str, Any] = current_app.config
+        candidate_row = self.db_session.query(LatencySketch.digest).filter(
+            LatencySketch.performance_result_id == performance_result_id).first()
+        baseline_rows = self.db_session.query(
+            LatencySketch.performance_result_id, LatencySketch.digest
+        ).filter(
+            LatencySketch.performance_test_id == result.performance_test_id,
+            LatencySketch.performance_result_id < performance_result_id
+        ).order_by(LatencySketch.performance_result_id.desc()).limit(
+            config['REGRESSION_BASELINE_RUNS']).all()
+        baseline_ids: List[int] = [row.performance_result_id for row in baseline_rows]
+
+        verdict: RegressionVerdict = self.db_session.query(RegressionVerdict).filter_by(
+            performance_result_id=performance_result_id).first() or RegressionVerdict(
+            id=None, performance_result_id=performance_result_id, performance_test_id=result.performance_test_id,
+            status=None, is_regression=False, p_value=None, effect_size=None, median_ratio=None,
+            baseline_result_ids=None, created_at=datetime.utcnow())
+
+        if not candidate_row or len(baseline_rows) < config['REGRESSION_MIN_BASELINE_RUNS']:
+            outcome: dict[str, Any] = {'status': 'insufficient_data', 'is_regression': False,
+                                       'p_value': None, 'effect_size': None, 'median_ratio': None}
+        else:
+            outcome = judge_regression(
+                TDigest.from_bytes(candidate_row.digest),
+                TDigest.merge_all([TDigest.from_bytes(row.digest) for row in baseline_rows]),
+                config)
+
+        for key, value in outcome.items():
+            setattr(verdict, key, value)
+        verdict.baseline_result_ids = json.dumps(baseline_ids)
+
+        try:
+            with unit_of_work(self.db_session) as uow:
+                uow.add(verdict)
+        except Exception as err:
+            service_logger.error(f"Error storing regression verdict for result {performance_result_id}: {err}")
+            raise err
+
+        service_logger.info(
+            f"Regression verdict for performance result {performance_result_id}: {verdict.status}")
+        return verdict
+
+    def get_verdict(self, performance_result_id: int) -> Optional[RegressionVerdict]:
+        """
+        Retrieve the stored verdict of a run.
+
+        Args:
+            performance_result_id (int): The ID of the PerformanceTestResult.
+
+        Returns:
+            Optional[RegressionVerdict]: The verdict, or None if the run was not evaluated yet.
+        """
+        return self.db_session.query(RegressionVerdict).filter_by(
+            performance_result_id=performance_result_id).first()
@@ -0,0 +1,249 @@
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import delete, select
+from app.extensions import db
+from app.db.schema import TestResult, month_bucket
+from app.utils.pagination import Page, decode_cursor, encode_cursor, paginate
+from app.utils.logger import service_logger
+
+# Archived columns, in file order
+ARCHIVE_COLUMNS: Tuple[str, ...] = (
+    'id', 'test_case_id', 'test_run_id', 'status', 'execution_time', 'failure_reason', 'result_data', 'created_at')
+
+# Ordering of result listings, newest first, shared by the live table and the archive
+RESULT_ORDER: List[Tuple[Any, bool]] = [(TestResult.created_at, True), (TestResult.id, True)]
+
+
+def retention_cutoff(now: datetime, retention_months: int) -> int:
+    """
+    Return the oldest month bucket kept in the database.
+
+    Args:
+        now (datetime): The current time.
+        retention_months (int): Number of months kept before the current one.
+
+    Returns:
+        int: The first month bucket (YYYYMM) that is not archived.
+    """
+    months: int = now.year * 12 + now.month - 1 - retention_months
+    return (months // 12) * 100 + months % 12 + 1
+
+
+def _archive_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': row['id'],
+        'test_case_id': row['test_case_id'],
+        'status': row['status'],
+        'execution_time': row['execution_time'],
+        'result_data': row['result_data'],
+        'created_at': row['created_at'].isoformat(),
+    }
+
+
+class ResultArchiveService:
+    """
+    Moves month buckets of test results past the retention window to Parquet files, and
+    reads them back for historical queries.
+
+    Each month is stored as ``<ARCHIVE_DIR>/test_results/month=YYYYMM.parquet``,
+    zstd-compressed.
+    """
+
+    def __init__(self, db_session=None, archive_dir: Optional[str] = None):
+        self.db_session = db_session or db.session
+        self.archive_dir: str = archive_dir or current_app.config['ARCHIVE_DIR']
+
+    def month_path(self, month: int) -> str:
+        return os.path.join(self.archive_dir, 'test_results', f'month={month}.parquet')
+
+    def archived_months(self) -> List[int]:
+        """
+        List the archived month buckets, most recent first.
+
+        Returns:
+            List[int]: The month buckets (YYYYMM).
+        """
+        directory: str = os.path.join(self.archive_dir, 'test_results')
+        if not os.path.isdir(directory):
+            return []
+        return sorted((int(name[len('month='):-len('.parquet')]) for name in os.listdir(directory)
+                       if name.startswith('month=') and name.endswith('.parquet')), reverse=True)
+
+    def expired_months(self, retention_months: int, now: Optional[datetime] = None) -> List[int]:
+        """
+        List the month buckets still in the database that are older than the retention window.
+
+        Args:
+            retention_months (int): Number of months kept before the current one.
+            now (Optional[datetime]): The current time, ``datetime.utcnow()`` by default.
+
+        Returns:
+            List[int]: The month buckets to archive, oldest first.
+        """
+        cutoff: int = retention_cutoff(now or datetime.utcnow(), retention_months)
+        table = TestResult.__table__
+        return list(self.db_session.execute(
+            select(table.c.created_month).distinct().where(table.c.created_month < cutoff)
+            .order_by(table.c.created_month)).scalars())
+
+    def archive_month(self, month: int, batch_size: int = 5000) -> int:
+        """
+        Move the results of a month bucket to its Parquet file.
+
+        Rows are streamed in primary key batches into a temporary file that replaces the
+        month's archive atomically (merged with any rows archived earlier), and are only
+        deleted from the database once the file is in place.
+
+        Args:
+            month (int): The month bucket (YYYYMM).
+            batch_size (int): Rows read and deleted per statement.
+
+        Returns:
+            int: The number of rows moved.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = TestResult.__table__
+        path: str = self.month_path(month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        schema = pa.schema([
+            ('id', pa.int64()), ('test_case_id', pa.int64()), ('test_run_id', pa.int64()), ('status', pa.string()),
+            ('execution_time', pa.float64()), ('failure_reason', pa.string()), ('result_data', pa.string()),
+            ('created_at', pa.timestamp('us'))])
+
+        moved: int = 0
+        last_id: int = 0
+        temporary_path: str = f'{path}.tmp'
+        with pq.ParquetWriter(temporary_path, schema, compression='zstd') as writer:
+            archived_ids: set = set()
+            if os.path.exists(path):
+                previous = pq.read_table(path, schema=schema)
+                archived_ids = set(previous.column('id').to_pylist())
+                writer.write_table(previous)
+            while True:
+                rows = self.db_session.execute(
+                    select(*[table.c[name] for name in ARCHIVE_COLUMNS])
+                    .where(table.c.created_month == month, table.c.id > last_id)
+                    .order_by(table.c.id).limit(batch_size)).mappings().all()
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                batch: List[Dict[str, Any]] = [dict(row) for row in rows if row['id'] not in archived_ids]
+                if batch:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                moved += len(rows)
+        os.replace(temporary_path, path)
+
+        try:
+            deleted_up_to: int = 0
+            while deleted_up_to < last_id:
+                upper: int = self.db_session.execute(
+                    select(table.c.id).where(table.c.created_month == month, table.c.id > deleted_up_to,
+                                             table.c.id <= last_id)
+                    .order_by(table.c.id).offset(batch_size - 1).limit(1)).scalar() or last_id
+                self.db_session.execute(delete(table).where(
+                    table.c.created_month == month, table.c.id > deleted_up_to, table.c.id <= upper))
+                self.db_session.commit()
+                deleted_up_to = upper
+        except Exception as err:
+            self.db_session.rollback()
+            service_logger.error(f"Error deleting archived results of month {month}: {err}")
+            raise err
+
+        service_logger.info(f"Archived {moved} test results of month {month} to {path}")
+        return moved
+
+    def archive_expired(self, retention_months: Optional[int] = None, now: Optional[datetime] = None,
+                        batch_size: Optional[int] = None) -> Dict[int, int]:
+        """
+        Archive every month bucket older than the retention window.
+
+        Args:
+            retention_months (Optional[int]): Months kept, RESULT_RETENTION_MONTHS by default.
+            now (Optional[datetime]): The current time, ``datetime.utcnow()`` by default.
+            batch_size (Optional[int]): Rows per statement, ARCHIVE_BATCH_SIZE by default.
+
+        Returns:
+            Dict[int, int]: The number of rows moved per month bucket.
+        """
+        config = current_app.config
+        retention_months = config['RESULT_RETENTION_MONTHS'] if retention_months is None else retention_months
+        batch_size = batch_size or config['ARCHIVE_BATCH_SIZE']
+        return {month: self.archive_month(month, batch_size)
+                for month in self.expired_months(retention_months, now)}
+
+    def read_results(self, test_case_id: int, limit: int,
+                     after: Optional[Tuple[datetime, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Read archived results of a test case, newest first.
+
+        Args:
+            test_case_id (int): The ID of the test case.
+            limit (int): Maximum number of results to return.
+            after (Optional[Tuple[datetime, int]]): Only return results sorting after this
+                (created_at, id) key, i.e. older ones.
+
+        Returns:
+            List[Dict[str, Any]]: The results, serialized like ``TestResult.to_dict()``.
+        """
+        months: List[int] = self.archived_months()
+        if after is not None:
+            months = [month for month in months if month <= month_bucket(after[0])]
+        if not months:
+            return []
+
+        import pyarrow.parquet as pq
+
+        results: List[Dict[str, Any]] = []
+        for month in months:
+            rows: List[Dict[str, Any]] = pq.read_table(
+                self.month_path(month), filters=[('test_case_id', '=', test_case_id)]).to_pylist()
+            if after is not None:
+                rows = [row for row in rows if (row['created_at'], row['id']) < after]
+            rows.sort(key=lambda row: (row['created_at'], row['id']), reverse=True)
+            results.extend(rows[:limit - len(results)])
+            if len(results) >= limit:
+                break
+        return results
+
+    def page_results(self, test_case_id: int, limit: int, after: Optional[str] = None) -> Page:
+        """
+        Return a page of results of a test case, continuing into the archive once the live
+        rows run out.
+
+        Live rows are always newer than archived ones, so the (created_at, id) cursor
+        carries over from the database to the archive unchanged.
+
+        Args:
+            test_case_id (int): The ID of the test case.
+            limit (int): The page size.
+            after (Optional[str]): Cursor of the previous page, if any.
+
+        Returns:
+            Page: Serialized results and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        page: Page = paginate(
+            self.db_session.query(TestResult).filter(TestResult.test_case_id == test_case_id),
+            RESULT_ORDER, limit, after)
+        items: List[Dict[str, Any]] = [result.to_dict() for result in page.items]
+        if page.next_cursor:
+            return Page(items, page.next_cursor)
+
+        if page.items:
+            boundary: Optional[Tuple[datetime, int]] = (page.items[-1].created_at, page.items[-1].id)
+        else:
+            boundary = tuple(decode_cursor(after, RESULT_ORDER)) if after else None
+        remaining: int = limit - len(items)
+        archived: List[Dict[str, Any]] = self.read_results(test_case_id, remaining + 1, boundary)
+        items += [_archive_row(row) for row in archived[:remaining]]
+        if len(archived) <= remaining:
+            return Page(items, None)
+        last: Dict[str, Any] = archived[remaining - 1] if remaining else None
+        cursor_key: Tuple[datetime, int] = (last['created_at'], last['id']) if last else boundary
+        return Page(items, encode_cursor(list(cursor_key)))
@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, update
+from app.extensions import db
+from app.db.schema import TestResult, TestRun
+from app.utils.logger import service_logger
+
+
+# Summary counter of a TestRun incremented for each result status
+STATUS_COUNTERS: Dict[str, str] = {'Passed': 'passed_results', 'Failed': 'failed_results', 'Error': 'errored_results'}
+
+
+def run_counter_increments(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the SET clause adding a batch of results to the summary counters of their run.
+
+    The counters are incremented in SQL (``total_results = total_results + n``), so that
+    concurrent writers of the same run never lose an update.
+
+    Args:
+        rows (List[Dict[str, Any]]): The results, with their 'status' and 'execution_time'.
+
+    Returns:
+        Dict[str, Any]: The column expressions to pass to ``update().values()``.
+    """
+    table = TestRun.__table__
+    increments: Dict[str, Any] = {'total_results': len(rows),
+                                  'total_duration': sum(row.get('execution_time') or 0.0 for row in rows)}
+    for row in rows:
+        counter: Optional[str] = STATUS_COUNTERS.get(row['status'])
+        if counter:
+            increments[counter] = increments.get(counter, 0) + 1
+    return {name: table.c[name] + value for name, value in increments.items()}
+
+
+class BulkResultWriter:
+    """
+    Collects the results of a test run and persists them in a single transaction.
+
+    Rows are buffered in memory while the run executes and written with executemany
+    batches when the run is committed, together with the run's final status and summary
+    counters, instead of one INSERT and COMMIT per test case.
+
+    Usage:
+        with BulkResultWriter(test_run.id) as writer:
+            for test_case in test_cases:
+                writer.add(test_case.id, 'Passed', execution_time=0.4)
+
+    Attributes:
+        test_run_id (int): The ID of the TestRun the results belong to.
+        batch_size (int): Number of rows per executemany batch.
+    """
+
+    def __init__(self, test_run_id: int, db_session=None, batch_size: int = 1000):
+        self.db_session = db_session or db.session
+        self.test_run_id: int = test_run_id
+        self.batch_size: int = batch_size
+        self._rows: List[Dict[str, Any]] = []
+
+    @classmethod
+    def for_new_run(cls, test_suite_id: int, db_session=None, batch_size: int = 1000) -> 'BulkResultWriter':
+        """
+        Record a new running TestRun of a suite and return a writer for its results.
+
+        Args:
+            test_suite_id (int): The ID of the TestSuite being run.
+
+        Returns:
+            BulkResultWriter: A writer bound to the new run.
+        """
+        db_session = db_session or db.session
+        try:
+            test_run_id: int = db_session.execute(insert(TestRun.__table__).values(
+                test_suite_id=test_suite_id, status='running', created_at=datetime.utcnow())
+            ).inserted_primary_key[0]
+            db_session.commit()
+        except Exception as err:
+            db_session.rollback()
+            service_logger.error(f"Error starting a test run of test suite {test_suite_id}: {err}")
+            raise err
+        return cls(test_run_id, db_session=db_session, batch_size=batch_size)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __enter__(self) -> 'BulkResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.commit(status='failed')
+
+    def add(self, test_case_id: int, status: str, execution_time: Optional[float] = None,
+            result_data: Optional[str] = None, failure_reason: Optional[str] = None) -> None:
+        """
+        Buffer the result of one test case.
+
+        Args:
+            test_case_id (int): The ID of the executed TestCase.
+            status (str): The outcome, e.g. 'Passed', 'Failed' or 'Error'.
+            execution_time (Optional[float]): Duration of the test case in seconds.
+            result_data (Optional[str]): Raw output of the execution.
+            failure_reason (Optional[str]): Short reason of a failure.
+        """
+        self._rows.append({
+            'test_case_id': test_case_id,
+            'test_run_id': self.test_run_id,
+            'status': status,
+            'execution_time': execution_time,
+            'failure_reason': failure_reason[:255] if failure_reason else None,
+            'result_data': result_data,
+            'created_at': datetime.utcnow(),
+        })
+
+    def commit(self, status: str = 'completed') -> int:
+        """
+        Insert the buffered results, add them to the run's counters and finish the run in
+        one transaction.
+
+        Args:
+            status (str): The final status of the TestRun.
+
+        Returns:
+            int: The number of results written.
+
+        Raises:
+            Exception: If the transaction fails; it is rolled back and nothing is written.
+        """
+        rows: List[Dict[str, Any]] = self._rows
+        try:
+            for start in range(0, len(rows), self.batch_size):
+                self.db_session.execute(insert(TestResult.__table__), rows[start:start + self.batch_size])
+            self.db_session.execute(
+                update(TestRun.__table__).where(TestRun.__table__.c.id == self.test_run_id).values(
+                    status=status, finished_at=datetime.utcnow(), **run_counter_increments(rows)))
+            self.db_session.commit()
+        except Exception as err:
+            self.db_session.rollback()
+            service_logger.error(f"Error writing {len(rows)} results of test run {self.test_run_id}: {err}")
+            raise err
+
+        self._rows = []
+        service_logger.info(f"Wrote {len(rows)} results of test run {self.test_run_id} ({status})")
+        return len(rows)
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from flask import current_app
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.db.repositories import TestCaseRepository, TestSuiteRepository
+from app.db.schema import TestCase, TestSuite
+from app.db.unit_of_work import unit_of_work
+from app.schemas.test_case import TEST_CASES_CREATE, TEST_CASES_UPDATE
+from app.schemas.test_suite import TEST_SUITES_CREATE, TEST_SUITES_UPDATE
+from app.utils.logger import service_logger
+
+
+class BulkResult(NamedTuple):
+    """
+    Outcome of a bulk operation.
+
+    Attributes:
+        items (List[Dict[str, Any]]): The created or updated entities, each with the ``index`` of its item in the request.
+        errors (List[Dict[str, Any]]): The rejected items, each with its ``index`` and a list of ``errors``.
+    """
+    items: List[Dict[str, Any]]
+    errors: List[Dict[str, Any]]
+
+
+def validate_items(adapter: TypeAdapter, items: Any,
+                   max_items: int) -> Tuple[List[Tuple[int, BaseModel]], List[Dict[str, Any]]]:
+    """
+    Validate the items of a bulk request in one pass, separating the valid items from the invalid ones.
+
+    Args:
+        adapter (TypeAdapter): The adapter of the list of items, e.g. ``TEST_CASES_CREATE``.
+        items (Any): The decoded request body.
+        max_items (int): The largest number of items accepted.
+
+    Returns:
+        Tuple[List[Tuple[int, BaseModel]], List[Dict[str, Any]]]: The valid items with their indexes,
+            and the errors of the invalid items.
+
+    Raises:
+        ValueError: If the body is not a non-empty array, or has more than ``max_items`` items.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("Expected a non-empty JSON array")
+    if len(items) > max_items:
+        raise ValueError(f"At most {max_items} items may be sent at once, got {len(items)}")
+
+    try:
+        return list(enumerate(adapter.validate_python(items))), []
+    except ValidationError as err:
+        errors: Dict[int, List[Dict[str, str]]] = defaultdict(list)
+        for error in err.errors(include_url=False):
+            index, *field = error['loc']
+            errors[index].append({'field': '.'.join(str(part) for part in field), 'message': error['msg']})
+
+    # Only the items that passed are validated again, to build their models
+    indexes: List[int] = [index for index in range(len(items)) if index not in errors]
+    models: List[BaseModel] = adapter.validate_python([items[index] for index in indexes])
+    return list(zip(indexes, models)), [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+
+
+class TestManagementService:
+    """
+    Creates and updates test suites and test cases in bulk.
+
+    The request body is validated as a whole with the compiled adapters of ``app.schemas``,
+    then every valid item is written in a single transaction; the invalid items are reported
+    with their index instead of failing the whole request.
+    """
+
+    def __init__(self, db_session=None, max_items: Optional[int] = None):
+        self.db_session = db_session or db.session
+        self.max_items: int = max_items or current_app.config['BULK_MAX_ITEMS']
+
+    def create_test_suites(self, items: Any) -> BulkResult:
+        """
+        Create test suites, each with its test cases.
+
+        Args:
+            items (Any): The decoded request body, a list of TestSuiteCreate.
+
+        Returns:
+            BulkResult: The created suites and the rejected items.
+
+        Raises:
+            ValueError: If the body is not a list of acceptable size.
+        """
+        valid, errors = validate_items(TEST_SUITES_CREATE, items, self.max_items)
+        suites: List[Tuple[int, TestSuite]] = []
+        for index, item in valid:
+            suite = TestSuite(id=None, name=item.name, description=item.description)
+            # Assigned before the flush, so that the suites are serialized without loading their cases
+            suite.test_cases = [TestCase(id=None, test_suite_id=None, name=case.name, description=case.description)
+                                for case in item.test_cases]
+            suites.append((index, suite))
+
+        with unit_of_work(self.db_session) as uow:
+            uow.add_all(suite for _, suite in suites)
+            uow.flush()
+            created: List[Dict[str, Any]] = [{'index': index, **suite.to_dict()} for index, suite in suites]
+        service_logger.info(f"Created {len(created)} test suites, rejected {len(errors)}")
+        return BulkResult(created, errors)
+
+    def update_test_suites(self, items: Any) -> BulkResult:
+        """
+        Update the name or description of test suites.
+
+        Args:
+            items (Any): The decoded request body, a list of TestSuiteUpdate.
+
+        Returns:
+            BulkResult: The updated suites and the rejected items, including unknown IDs.
+
+        Raises:
+            ValueError: If the body is not a list of acceptable size.
+        """
+        valid, errors = validate_items(TEST_SUITES_UPDATE, items, self.max_items)
+        with unit_of_work(self.db_session):
+            suites: Dict[int, TestSuite] = {suite.id: suite for suite in TestSuiteRepository(self.db_session).get_many(
+                [item.id for _, item in valid], selectinload(TestSuite.test_cases))}
+            updated: List[Tuple[int, TestSuite]] = self._apply(valid, suites, errors)
+            self.db_session.flush()
+            result: List[Dict[str, Any]] = [{'index': index, **suite.to_dict()} for index, suite in updated]
+        service_logger.info(f"Updated {len(result)} test suites, rejected {len(errors)}")
+        return BulkResult(result, sorted(errors, key=lambda error: error['index']))
+
+    def create_test_cases(self, suite_id: int, items: Any) -> BulkResult:
+        """
+        Add test cases to a test suite.
+
+        Args:
+            suite_id (int): The ID of the test suite.
+            items (Any): The decoded request body, a list of TestCaseCreate.
+
+        Returns:
+            BulkResult: The created cases and the rejected items.
+
+        Raises:
+            LookupError: If the test suite does not exist.
+            ValueError: If the body is not a list of acceptable size.
+        """
+        if self.db_session.get(TestSuite, suite_id) is None:
+            raise LookupError(f"Test suite {suite_id} not found.")
+        valid, errors = validate_items(TEST_CASES_CREATE, items, self.max_items)
+        cases: List[Tuple[int, TestCase]] = [
+            (index, TestCase(id=None, test_suite_id=suite_id, name=item.name, description=item.description))
+            for index, item in valid]
+
+        with unit_of_work(self.db_session) as uow:
+            uow.add_all(case for _, case in cases)
+            uow.flush()
+            created: List[Dict[str, Any]] = [{'index': index, **case.to_dict()} for index, case in cases]
+        service_logger.info(f"Added {len(created)} test cases to test suite {suite_id}, rejected {len(errors)}")
+        return BulkResult(created, errors)
+
+    def update_test_cases(self, items: Any) -> BulkResult:
+        """
+        Update the name or description of test cases.
+
+        Args:
+            items (Any): The decoded request body, a list of TestCaseUpdate.
+
+        Returns:
+            BulkResult: The updated cases and the rejected items, including unknown IDs.
+
+        Raises:
+            ValueError: If the body is not a list of acceptable size.
+        """
+        valid, errors = validate_items(TEST_CASES_UPDATE, items, self.max_items)
+        with unit_of_work(self.db_session):
+            cases: Dict[int, TestCase] = {case.id: case for case in TestCaseRepository(self.db_session).get_many(
+                [item.id for _, item in valid])}
+            updated: List[Tuple[int, TestCase]] = self._apply(valid, cases, errors)
+            self.db_session.flush()
+            result: List[Dict[str, Any]] = [{'index': index, **case.to_dict()} for index, case in updated]
+        service_logger.info(f"Updated {len(result)} test cases, rejected {len(errors)}")
+        return BulkResult(result, sorted(errors, key=lambda error: error['index']))
+
+    @staticmethod
+    def _apply(valid: List[Tuple[int, BaseModel]], entities: Dict[int, Any],
+               errors: List[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+        updated: List[Tuple[int, Any]] = []
+        for index, item in valid:
+            entity: Any = entities.get(item.id)
+            if entity is None:
+                errors.append({'index': index, 'errors': [{'field': 'id', 'message': f"ID {item.id} not found"}]})
+                continue
+            for name, value in item.model_dump(exclude_unset=True, exclude={'id'}).items():
+                setattr(entity, name, value)
+            updated.append((index, entity))
+        return updated
@@ -1,24 +1,25 @@
-# from typing import Any
-# from celery import Celery
-# from flask import Flask
-# from app.extensions import create_celery
-# from app.utils.logger import app_logger
-# from app import create_app
+import signal
+from typing import Optional
+from app.db.schema import ExecutionJob
+from app.extensions import celery
+from app.services.execution_job_service import ExecutionJobService
+from app.utils.logger import app_logger
+from app.utils.processes import process_groups_killed_on
 
-# app: Flask = create_app('development')
-# celery: Celery = create_celery(app)
 
+@celery.task(name='ator.run_execution_job')
+def run_execution_job(job_id: str) -> Optional[str]:
+    """
+    Execute a queued test suite, test case or performance test.
 
-# @celery.task
-# def perform_async_test(test_id: int) -> Any:
-#     try:
-#         # Logic for performing the test
-#         app_logger.info(f"Async test execution started for test_id: {test_id}")
-#         # Example result for demonstration
-#         result: dict = {"status": "success", "test_id": test_id}
-#         app_logger.info(f"Async test execution completed for test_id: {test_id}")
-#         return result
-#     except Exception as e:
-#         app_logger.error(
-#             f"Error in async test execution for test_id {test_id}: {e}")
-#         return {"status": "error", "error": str(e)}
+    Args:
+        job_id (str): The ID of the ExecutionJob, also the ID of this task.
+
+    Returns:
+        Optional[str]: The final status of the job, or None if it does not exist.
+    """
+    app_logger.info(f"Worker picked up job {job_id}")
+    # Cancelling a running job terminates this task with SIGTERM; Locust and Newman are stopped with it
+    with process_groups_killed_on(signal.SIGTERM):
+        job: Optional[ExecutionJob] = ExecutionJobService().run(job_id)
+    return job.status if job else None
@@ -0,0 +1,114 @@
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional
+from flask import Flask, Response, current_app, request
+from app.utils.logger import app_logger
+
+try:
+    import brotli
+except ImportError:  # only gzip is offered when brotli is not installed
+    brotli = None
+
+# Mimetypes compressed besides text/*
+COMPRESSIBLE_MIMETYPES: frozenset = frozenset({
+    'application/json', 'application/javascript', 'application/xml', 'application/x-ndjson', 'image/svg+xml'})
+
+
+def accepted_encoding() -> Optional[str]:
+    """
+    Pick the content coding to use for the current request from its Accept-Encoding.
+
+    Returns:
+        Optional[str]: 'br' or 'gzip', preferring brotli at equal quality, or None.
+    """
+    offered: List[str] = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def _compressible(response: Response) -> bool:
+    mimetype: str = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+class _StreamCompressor:
+    """Incremental gzip or brotli encoder of a response body."""
+
+    def __init__(self, encoding: str, config: Any) -> None:
+        self.encoding: str = encoding
+        if encoding == 'br':
+            self._encoder: Any = brotli.Compressor(quality=config.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))
+        else:
+            # wbits 31: deflate with a gzip header and trailer
+            self._encoder = zlib.compressobj(config.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._encoder.process(data) if self.encoding == 'br' else self._encoder.compress(data)
+
+    def finish(self) -> bytes:
+        return self._encoder.finish() if self.encoding == 'br' else self._encoder.flush()
+
+    def stream(self, chunks: Iterable[Any]) -> Iterator[bytes]:
+        """Compress a streamed body chunk by chunk, never holding all of it in memory."""
+        try:
+            for chunk in chunks:
+                data: bytes = self.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                if data:
+                    yield data
+            yield self.finish()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Compress a response body with the best content coding the client accepts.
+
+    Responses are compressed when they are successful (2xx), of a textual mimetype and
+    either streamed or at least RESPONSE_COMPRESSION_MIN_SIZE bytes long. Redirects and
+    errors, responses already encoded, files sent with ``send_file`` and partial content
+    are left alone. Streamed
+    bodies are compressed incrementally, so generators keep streaming.
+
+    Args:
+        response (Response): The response of the view.
+
+    Returns:
+        Response: The same response, compressed when worth it.
+    """
+    config: Any = current_app.config
+    if not config.get('RESPONSE_COMPRESSION_ENABLED', True) or request.method == 'HEAD' \
+            or not 200 <= response.status_code < 300 or response.status_code in (204, 206) \
+            or response.direct_passthrough or 'Content-Encoding' in response.headers or not _compressible(response):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding: Optional[str] = accepted_encoding()
+    if encoding is None:
+        return response
+    if not response.is_streamed and \
+            response.calculate_content_length() < config.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024):
+        return response
+
+    compressor: _StreamCompressor = _StreamCompressor(encoding, config)
+    if response.is_streamed:
+        response.response = compressor.stream(response.response)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(compressor.compress(response.get_data()) + compressor.finish())
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from the identity ones, so only a weak validator still holds
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Register ``compress_response`` on an application.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.after_request(compress_response)
+    app_logger.info(f"Response compression enabled with {'brotli and gzip' if brotli is not None else 'gzip'}")
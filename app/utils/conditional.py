@@ -0,0 +1,75 @@
+import hashlib
+import time
+from functools import wraps
+from typing import Any, Callable, List, Optional, Tuple, Type
+from flask import after_this_request, current_app, request
+from app.db.cache import entity_cache
+from app.utils.logger import api_logger
+
+
+def list_etag(models: Tuple[Type[Any], ...]) -> Optional[str]:
+    """
+    Compute the weak ETag of a GET request on lists of the given models.
+
+    The tag hashes the path with its query string (page, filters) and the versions of the
+    tables the response is built from, so it changes whenever one of them is written.
+
+    Args:
+        models (Tuple[Type[Any], ...]): The models the response is serialized from.
+
+    Returns:
+        Optional[str]: The opaque tag, or None if no ETag should be used for this request.
+    """
+    versions: Optional[Tuple[List[str], float]] = entity_cache.table_versions(model.__tablename__ for model in models)
+    if versions is None:
+        return None
+    revisions, changed_at = versions
+    # A lagging replica could still return the previous rows under the new version
+    if current_app.config.get('SQLALCHEMY_REPLICA_URIS') and \
+            time.time() - changed_at < current_app.config.get('ETAG_REPLICA_LAG', 5):
+        return None
+    return hashlib.sha1(f"{request.full_path}|{'.'.join(revisions)}".encode()).hexdigest()
+
+
+def conditional_get(*models: Type[Any]) -> Callable[[Callable], Callable]:
+    """
+    Decorator answering GET requests whose If-None-Match matches the current ETag with
+    304 Not Modified, without running the view.
+
+    Other responses with status 200 get the weak ETag, so that polling clients revalidate
+    with a single Redis read instead of a query and a serialization. Place it under
+    ``jwt_required()`` so that 304s are only sent to authenticated clients.
+
+    Args:
+        *models (Type[Any]): The models the response is serialized from, registered with
+            ``register_versioned_model``.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            etag: Optional[str] = list_etag(models)
+            if etag is None:
+                return view(*args, **kwargs)
+
+            if request.if_none_match.contains_weak(etag):
+                api_logger.info(f"Not modified: {request.full_path}")
+                response: Any = current_app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            @after_this_request
+            def add_etag(response: Any) -> Any:
+                if response.status_code == 200:
+                    response.set_etag(etag, weak=True)
+                    response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
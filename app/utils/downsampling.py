@@ -0,0 +1,94 @@
+from typing import Any, Dict, List
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The remaining points are split into
+    ``threshold - 2`` buckets and, from each bucket, the point forming the largest
+    triangle with the previously selected point and the average of the next bucket is
+    kept. Bucket averages and triangle areas are computed with NumPy; only the walk
+    over buckets is sequential, since each choice depends on the previous one.
+
+    Args:
+        x (np.ndarray): Monotonically increasing x coordinates (e.g. timestamps).
+        y (np.ndarray): The values to preserve the visual shape of.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices into ``x`` and ``y`` of the selected points.
+    """
+    size: int = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    every: float = (size - 2) / (threshold - 2)
+    # Bucket i covers [edges[i], edges[i + 1]); the trailing segment is the last point alone
+    edges: np.ndarray = np.append(np.floor(np.arange(threshold - 1) * every).astype(np.int64) + 1, size)
+    edges[-2] = size - 1
+
+    x_sums: np.ndarray = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums: np.ndarray = np.concatenate(([0.0], np.cumsum(y)))
+    lengths: np.ndarray = edges[1:] - edges[:-1]
+    x_means: np.ndarray = (x_sums[edges[1:]] - x_sums[edges[:-1]]) / lengths
+    y_means: np.ndarray = (y_sums[edges[1:]] - y_sums[edges[:-1]]) / lengths
+
+    selected: np.ndarray = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+    previous: int = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        x_previous, y_previous = x[previous], y[previous]
+        areas: np.ndarray = np.abs(
+            (x_previous - x_means[bucket + 1]) * (y[start:end] - y_previous)
+            - (x_previous - x[start:end]) * (y_means[bucket + 1] - y_previous))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_points(points: List[Dict[str, Any]], metrics: List[str],
+                      max_points: int) -> List[Dict[str, Any]]:
+    """
+    Downsample time-series points with LTTB so that at most ``max_points`` remain.
+
+    Each metric is downsampled independently over its non-null values to an equal share of
+    ``max_points``, and the union of the selected rows is returned, so spikes in any metric
+    survive.
+
+    Args:
+        points (List[Dict[str, Any]]): Points ordered by their RFC3339 'time' key.
+        metrics (List[str]): The metric keys to preserve.
+        max_points (int): The maximum number of points to return.
+
+    Returns:
+        List[Dict[str, Any]]: The selected points, in their original order.
+
+    Raises:
+        ValueError: If ``max_points`` leaves fewer than 3 points per metric.
+    """
+    if max_points < 3 * len(metrics):
+        raise ValueError(f"max_points must be at least 3 per metric ({3 * len(metrics)})")
+    if len(points) <= max_points:
+        return points
+
+    times: np.ndarray = np.array(
+        [str(point['time']).rstrip('Z') for point in points], dtype='datetime64[ns]').astype(np.int64)
+    keep: np.ndarray = np.zeros(len(points), dtype=bool)
+    per_metric: int = max_points // len(metrics)
+
+    for metric in metrics:
+        values: np.ndarray = np.array(
+            [point.get(metric) for point in points], dtype=np.float64)
+        valid: np.ndarray = np.flatnonzero(~np.isnan(values))
+        if valid.size:
+            keep[valid[lttb_indices(times[valid], values[valid], per_metric)]] = True
+
+    return [points[index] for index in np.flatnonzero(keep)]
@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Type
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+
+class Fieldset(NamedTuple):
+    """
+    The columns and relationships a list request asks for.
+
+    Attributes:
+        fields (List[str]): The columns to return, in order.
+        includes (List[str]): The one-to-many relationships to embed.
+    """
+    fields: List[str]
+    includes: List[str]
+
+
+def column_names(model: Type[Any]) -> List[str]:
+    """
+    List the mapped columns of a model, in declaration order.
+
+    Args:
+        model (Type[Any]): The mapped class.
+
+    Returns:
+        List[str]: The attribute names of the columns.
+    """
+    return [column.key for column in inspect(model).column_attrs]
+
+
+def _split(value: str) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def parse_fieldset_args(model: Type[Any], includable: Sequence[str] = (), default_includes: Sequence[str] = (),
+                        args: Optional[Mapping[str, str]] = None) -> Fieldset:
+    """
+    Read the ``fields`` and ``include`` query parameters of a list request.
+
+    ``fields`` is a comma-separated list of columns, and may name includable relationships
+    as well; ``include`` lists the relationships to embed. Without either parameter, every
+    column and the ``default_includes`` are returned, as before the parameters existed.
+
+    Args:
+        model (Type[Any]): The mapped class of the list.
+        includable (Sequence[str]): The relationships clients may embed.
+        default_includes (Sequence[str]): The relationships embedded when neither parameter is given.
+        args (Optional[Mapping[str, str]]): The query parameters, the current request's by default.
+
+    Returns:
+        Fieldset: The columns and relationships to return.
+
+    Raises:
+        ValueError: If a field or relationship is unknown, or ``fields`` is empty.
+    """
+    args = request.args if args is None else args
+    if 'fields' not in args and 'include' not in args:
+        return Fieldset(column_names(model), list(default_includes))
+
+    columns: List[str] = column_names(model)
+    requested: List[str] = _split(args['fields']) if 'fields' in args else columns
+    if not requested:
+        raise ValueError("fields may not be empty")
+    includes: List[str] = [name for name in requested if name in includable]
+    fields: List[str] = [name for name in requested if name not in includable]
+    unknown: List[str] = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    for name in _split(args.get('include', '')):
+        if name not in includable:
+            raise ValueError(f"Cannot include {name}; includable: {', '.join(includable) or 'none'}")
+        if name not in includes:
+            includes.append(name)
+    return Fieldset(fields, includes)
+
+
+def fieldset_options(model: Type[Any], fieldset: Fieldset, includable: Sequence[str] = (),
+                     required: Sequence[Any] = ()) -> List[Any]:
+    """
+    Build the loader options fetching only what a fieldset returns.
+
+    The unused columns are left out of the SELECT, the embedded relationships are loaded
+    with one extra query per page, and the other includable relationships are never loaded.
+
+    Args:
+        model (Type[Any]): The mapped class of the list.
+        fieldset (Fieldset): The parsed fieldset.
+        includable (Sequence[str]): The relationships clients may embed.
+        required (Sequence[Any]): Columns to load even if they are not returned, e.g. the
+            ordering columns the pagination cursor is built from.
+
+    Returns:
+        List[Any]: Options for ``Query.options()`` or ``Select.options()``.
+    """
+    options: List[Any] = []
+    mapper: Any = inspect(model)
+    loaded: List[str] = list(dict.fromkeys([*fieldset.fields, *(column.key for column in required)]))
+    # Only relationships were requested, e.g. ?fields=test_cases; the primary key is loaded to embed them
+    loaded = loaded or [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+    if set(loaded) != set(column_names(model)):
+        options.append(load_only(*(getattr(model, name) for name in loaded)))
+    for name in includable:
+        relationship: Any = getattr(model, name)
+        options.append(selectinload(relationship) if name in fieldset.includes else raiseload(relationship))
+    return options
+
+
+def serialize_fieldset(entity: Any, fieldset: Fieldset) -> Dict[str, Any]:
+    """
+    Serialize an entity to the fields and embedded relationships of a fieldset.
+
+    Dates are written in ISO format and embedded entities with their ``to_dict()``, like
+    the ``to_dict()`` methods of the models do.
+
+    Args:
+        entity (Any): The entity, loaded with ``fieldset_options``.
+        fieldset (Fieldset): The parsed fieldset.
+
+    Returns:
+        Dict[str, Any]: The serialized entity.
+    """
+    data: Dict[str, Any] = {}
+    for name in fieldset.fields:
+        value: Any = getattr(entity, name)
+        data[name] = value.isoformat() if isinstance(value, datetime) else value
+    for name in fieldset.includes:
+        data[name] = [related.to_dict() for related in getattr(entity, name)]
+    return data
@@ -0,0 +1,188 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ColumnElement
+
+# An ordering key: the column and whether it is sorted descending
+SortKey = Tuple[Any, bool]
+
+
+class Page(NamedTuple):
+    """
+    A page of a keyset-paginated list.
+
+    Attributes:
+        items (List[Any]): The rows of the page.
+        next_cursor (Optional[str]): Opaque cursor of the next page, or None on the last page.
+    """
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key values of the last row of a page into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): The values of the ordering columns, in order.
+
+    Returns:
+        str: A URL-safe cursor.
+    """
+    payload: List[Any] = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, order_by: Sequence[SortKey]) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for the given ordering.
+
+    Args:
+        cursor (str): The opaque cursor.
+        order_by (Sequence[SortKey]): The ordering the cursor was produced for.
+
+    Returns:
+        List[Any]: The values of the ordering columns.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the ordering.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as err:
+        raise ValueError("Invalid pagination cursor") from err
+    if not isinstance(values, list) or len(values) != len(order_by):
+        raise ValueError("Invalid pagination cursor")
+    return [datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for (column, _), value in zip(order_by, values)]
+
+
+def keyset_filter(order_by: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """
+    Build the condition selecting the rows that sort strictly after ``values``.
+
+    The row comparison is expanded into ``(a > x) OR (a = x AND b > y) ...`` so that it
+    handles mixed sort directions and stays index-friendly on every backend.
+
+    Args:
+        order_by (Sequence[SortKey]): The ordering columns and their directions.
+        values (Sequence[Any]): The sort key values of the last row already returned.
+
+    Returns:
+        ColumnElement: The filter condition.
+    """
+    clauses: List[ColumnElement] = []
+    for position, (column, descending) in enumerate(order_by):
+        equal_prefix: List[ColumnElement] = [
+            prefix_column == value for (prefix_column, _), value in zip(order_by[:position], values)]
+        after: ColumnElement = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def _keyset_query(query: Any, order_by: Sequence[SortKey], limit: int, after: Optional[str]) -> Any:
+    if after:
+        query = query.filter(keyset_filter(order_by, decode_cursor(after, order_by)))
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in order_by])
+    return query.limit(limit + 1)
+
+
+def _to_page(rows: List[Any], order_by: Sequence[SortKey], limit: int) -> Page:
+    if len(rows) <= limit:
+        return Page(rows, None)
+    last: Any = rows[limit - 1]
+    return Page(rows[:limit], encode_cursor([getattr(last, column.key) for column, _ in order_by]))
+
+
+def paginate(query: Any, order_by: Sequence[SortKey], limit: int, after: Optional[str] = None) -> Page:
+    """
+    Fetch one page of a query with keyset pagination.
+
+    The ordering must be total (end with a unique column such as the primary key) so that
+    pages never skip or repeat rows. Unlike OFFSET, the cost of a page does not grow with
+    its position, as long as an index matches the ordering.
+
+    Args:
+        query (Any): A SQLAlchemy ``Query`` to paginate.
+        order_by (Sequence[SortKey]): The ordering columns and their directions.
+        limit (int): The page size.
+        after (Optional[str]): Cursor of the previous page, if any.
+
+    Returns:
+        Page: The rows of the page and the cursor of the next one.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    return _to_page(_keyset_query(query, order_by, limit, after).all(), order_by, limit)
+
+
+async def paginate_async(session: Any, statement: Any, order_by: Sequence[SortKey], limit: int,
+                         after: Optional[str] = None) -> Page:
+    """
+    Fetch one page of a ``select()`` of entities on an asyncio session, like ``paginate``.
+
+    Args:
+        session (Any): An ``AsyncSession``.
+        statement (Any): A ``select()`` of a mapped class.
+        order_by (Sequence[SortKey]): The ordering columns and their directions.
+        limit (int): The page size.
+        after (Optional[str]): Cursor of the previous page, if any.
+
+    Returns:
+        Page: The entities of the page and the cursor of the next one.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    result: Any = await session.execute(_keyset_query(statement, order_by, limit, after))
+    return _to_page(list(result.scalars().all()), order_by, limit)
+
+
+def parse_pagination_args(args: Optional[Mapping[str, str]] = None,
+                          config: Optional[Mapping[str, Any]] = None) -> Tuple[int, Optional[str]]:
+    """
+    Read the ``limit`` and ``after`` query parameters of a list request.
+
+    Args:
+        args (Optional[Mapping[str, str]]): The query parameters, the current request's by default.
+        config (Optional[Mapping[str, Any]]): The application config, the current app's by default.
+
+    Returns:
+        Tuple[int, Optional[str]]: The page size and the cursor of the previous page.
+
+    Raises:
+        ValueError: If the limit is not a positive integer no larger than PAGINATION_MAX_LIMIT.
+    """
+    args = request.args if args is None else args
+    config = current_app.config if config is None else config
+    limit: int = int(args.get('limit', config['PAGINATION_DEFAULT_LIMIT']))
+    if not 0 < limit <= config['PAGINATION_MAX_LIMIT']:
+        raise ValueError(f"limit must be between 1 and {config['PAGINATION_MAX_LIMIT']}")
+    return limit, args.get('after') or None
+
+
+def pagination_headers(page: Page, limit: int, current_request: Any = None) -> dict[str, str]:
+    """
+    Build the response headers advertising the next page of the current request.
+
+    Args:
+        page (Page): The page being returned.
+        limit (int): The page size.
+        current_request (Any): The request, Flask's current request by default.
+
+    Returns:
+        dict[str, str]: ``X-Next-Cursor`` and an RFC 8288 ``Link`` header, or nothing on the last page.
+    """
+    if not page.next_cursor:
+        return {}
+    current_request = request if current_request is None else current_request
+    query: dict[str, str] = {**current_request.args.to_dict(), 'limit': str(limit), 'after': page.next_cursor}
+    return {
+        'X-Next-Cursor': page.next_cursor,
+        'Link': f'<{current_request.base_url}?{urlencode(query)}>; rel="next"',
+    }
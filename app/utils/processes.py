@@ -0,0 +1,97 @@
+import os
+import signal
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Set, Tuple
+
+# Process groups of the external tools, e.g. Locust and Newman, running for this process
+_process_groups: Set[int] = set()
+_process_groups_lock: threading.Lock = threading.Lock()
+
+
+def start_process(args: Any, **kwargs: Any) -> subprocess.Popen:
+    """
+    Start an external tool in a process group of its own.
+
+    The group contains the tool and every process it starts, e.g. the Locust workers or
+    the command run by a shell, so that ``kill_process_groups`` stops all of them.
+
+    Args:
+        args (Any): The command, as for ``subprocess.Popen``.
+        **kwargs (Any): Other arguments of ``subprocess.Popen``.
+
+    Returns:
+        subprocess.Popen: The started process, to pass to ``wait_process``.
+    """
+    process: subprocess.Popen = subprocess.Popen(args, start_new_session=True, **kwargs)
+    with _process_groups_lock:
+        _process_groups.add(process.pid)
+    return process
+
+
+def wait_process(process: subprocess.Popen, timeout: Optional[float] = None) -> Tuple[Any, Any]:
+    """
+    Wait for a process started with ``start_process`` to exit.
+
+    Args:
+        process (subprocess.Popen): The process.
+        timeout (Optional[float]): Seconds to wait for, without limit by default.
+
+    Returns:
+        Tuple[Any, Any]: The captured standard output and error, None if they were not piped.
+    """
+    try:
+        return process.communicate(timeout=timeout)
+    finally:
+        if process.returncode is not None:
+            with _process_groups_lock:
+                _process_groups.discard(process.pid)
+
+
+def kill_process_groups(signum: int = signal.SIGTERM) -> None:
+    """
+    Send a signal to the process groups of the running tools.
+
+    Args:
+        signum (int): The signal to send.
+    """
+    with _process_groups_lock:
+        groups = list(_process_groups)
+    for group in groups:
+        try:
+            os.killpg(group, signum)
+        except ProcessLookupError:
+            pass
+
+
+@contextmanager
+def process_groups_killed_on(signum: int = signal.SIGTERM) -> Iterator[None]:
+    """
+    Kill the process groups of the running tools when the process receives a signal.
+
+    The signal then gets its previous handling, e.g. terminates the process. Celery
+    terminates a revoked task with SIGTERM, which would otherwise leave its tools running.
+    Signal handlers can only be installed from the main thread; elsewhere this does nothing.
+
+    Args:
+        signum (int): The signal to handle.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle(received: int, frame: Any) -> None:
+        kill_process_groups()
+        signal.signal(received, previous)
+        if callable(previous):
+            previous(received, frame)
+        elif previous == signal.SIG_DFL:
+            os.kill(os.getpid(), received)
+
+    # None when the current handler was not installed from Python
+    previous: Any = signal.signal(signum, handle) or signal.SIG_DFL
+    try:
+        yield
+    finally:
+        signal.signal(signum, previous)
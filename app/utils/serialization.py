@@ -0,0 +1,121 @@
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from flask import Flask, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # the standard library encoder is used when orjson is not installed
+    orjson = None
+
+# Bytes of serialized items buffered before a chunk of a streamed array is sent
+STREAM_CHUNK_SIZE: int = 64 * 1024
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON, with orjson when it is installed.
+
+    Values JSON does not support natively are converted like Flask does: dates become
+    HTTP dates, and decimals, UUIDs and dataclasses their string or dict forms.
+
+    Args:
+        obj (Any): The object to serialize.
+        sort_keys (bool): Whether to sort the keys of objects.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if orjson is not None:
+        option: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+    return json.dumps(obj, default=DefaultJSONProvider.default, sort_keys=sort_keys,
+                      ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider of the application encoding with orjson, which is several times faster
+    than the standard library, and falling back to it when orjson is not installed or
+    indentation is asked for.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs.get('indent') or kwargs.get('cls'):
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj: Any = self._prepare_response_obj(args, kwargs)
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)
+        # Encode straight to bytes instead of going through a str
+        return self._app.response_class(dumps(obj, sort_keys=self.sort_keys) + b'\n', mimetype=self.mimetype)
+
+
+def stream_json_array(items: Iterable[Any], serialize: Optional[Callable[[Any], Any]] = None,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Serialize an iterable to a JSON array chunk by chunk.
+
+    Only one chunk of serialized items is held at a time, so memory stays bounded however
+    many items the iterable (e.g. a query with ``yield_per``) produces.
+
+    Args:
+        items (Iterable[Any]): The items of the array.
+        serialize (Optional[Callable[[Any], Any]]): Converts an item to a JSON-serializable value, e.g. ``to_dict``.
+        chunk_size (int): Bytes buffered before a chunk is yielded.
+
+    Yields:
+        bytes: Consecutive parts of the JSON document.
+    """
+    buffer: List[bytes] = [b'[']
+    buffered: int = 1
+    for index, item in enumerate(items):
+        data: bytes = dumps(serialize(item) if serialize else item)
+        if index:
+            buffer.append(b',')
+        buffer.append(data)
+        buffered += len(data) + 1
+        if buffered >= chunk_size:
+            yield b''.join(buffer)
+            buffer, buffered = [], 0
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+def json_array_response(items: Iterable[Any], serialize: Optional[Callable[[Any], Any]] = None,
+                        headers: Optional[dict] = None) -> Response:
+    """
+    Stream an iterable as a JSON array response, see ``stream_json_array``.
+
+    The iterable is consumed within the request context, so lazy queries may still use
+    the request's database session.
+
+    Args:
+        items (Iterable[Any]): The items of the array.
+        serialize (Optional[Callable[[Any], Any]]): Converts an item to a JSON-serializable value.
+        headers (Optional[dict]): Extra response headers.
+
+    Returns:
+        Response: The streamed response.
+    """
+    return Response(stream_with_context(stream_json_array(items, serialize)),
+                    mimetype='application/json', headers=headers)
+
+
+def init_json(app: Flask) -> None:
+    """
+    Make ``jsonify`` and the request JSON parsing of an application use ``FastJSONProvider``.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,196 @@
+import struct
+from typing import Iterable, Optional, Union
+import numpy as np
+
+_HEADER: struct.Struct = struct.Struct('<dddQ')
+
+
+class TDigest:
+    """
+    Mergeable t-digest sketch for streaming quantile estimation.
+
+    Samples are buffered and periodically compressed into weighted centroids using the
+    logarithmic (k2) scale function, which keeps centroids small near the tails so extreme
+    percentiles such as p99 and p99.9 stay accurate. Compression is vectorized: every centroid is
+    assigned to the unit-width k bucket containing its cumulative-weight midpoint and the
+    buckets are combined with ``np.bincount``. Merging digests is a concatenation followed
+    by one compression pass.
+
+    Attributes:
+        compression (float): Controls accuracy vs. size; a digest keeps roughly
+            ``compression / 2`` centroids.
+        means (np.ndarray): Centroid means, sorted ascending.
+        weights (np.ndarray): Centroid weights.
+        min (float): Smallest sample seen.
+        max (float): Largest sample seen.
+    """
+
+    def __init__(self, compression: float = 200.0) -> None:
+        self.compression: float = compression
+        self.means: np.ndarray = np.empty(0, dtype=np.float64)
+        self.weights: np.ndarray = np.empty(0, dtype=np.float64)
+        self.min: float = np.inf
+        self.max: float = -np.inf
+        self._buffer: list[np.ndarray] = []
+        self._buffer_weights: list[np.ndarray] = []
+        self._buffered: int = 0
+        self._buffered_weight: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """The total number of samples summarized by the digest, i.e. the sum of their weights."""
+        return int(round(self.weights.sum() + self._buffered_weight))
+
+    def update(self, values: Iterable[float], weights: Union[float, Iterable[float]] = 1.0) -> 'TDigest':
+        """
+        Add samples to the digest.
+
+        Args:
+            values (Iterable[float]): The samples to add. NaN values are ignored.
+            weights (Union[float, Iterable[float]]): The number of observations each sample
+                stands for, either one weight for all samples or one per sample.
+
+        Returns:
+            TDigest: The digest itself, to allow chaining.
+        """
+        samples: np.ndarray = np.asarray(list(values) if not isinstance(values, np.ndarray) else values,
+                                         dtype=np.float64).ravel()
+        sample_weights: np.ndarray = np.broadcast_to(
+            np.asarray(weights if np.isscalar(weights) else list(weights), dtype=np.float64).ravel(), samples.shape)
+        kept: np.ndarray = ~np.isnan(samples) & (sample_weights > 0)
+        samples, sample_weights = samples[kept], sample_weights[kept]
+        if samples.size:
+            self._buffer.append(samples)
+            self._buffer_weights.append(sample_weights)
+            self._buffered += samples.size
+            self._buffered_weight += float(sample_weights.sum())
+            if self._buffered >= 5 * self.compression:
+                self.compress()
+        return self
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """
+        Merge another digest into this one.
+
+        Args:
+            other (TDigest): The digest to merge.
+
+        Returns:
+            TDigest: The digest itself, to allow chaining.
+        """
+        other.compress()
+        self.compress()
+        self._combine(np.concatenate((self.means, other.means)),
+                      np.concatenate((self.weights, other.weights)))
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merge_all(cls, digests: Iterable['TDigest'], compression: Optional[float] = None) -> 'TDigest':
+        """
+        Merge any number of digests in a single compression pass.
+
+        Args:
+            digests (Iterable[TDigest]): The digests to merge.
+            compression (Optional[float]): Compression of the merged digest. Defaults to the
+                compression of the first digest.
+
+        Returns:
+            TDigest: A new digest summarizing all the inputs.
+        """
+        digests = list(digests)
+        merged: TDigest = cls(compression or (digests[0].compression if digests else 200.0))
+        if not digests:
+            return merged
+        for digest in digests:
+            digest.compress()
+        merged._combine(np.concatenate([digest.means for digest in digests]),
+                        np.concatenate([digest.weights for digest in digests]))
+        merged.min = min(digest.min for digest in digests)
+        merged.max = max(digest.max for digest in digests)
+        return merged
+
+    def compress(self) -> None:
+        """Fold buffered samples into the centroids."""
+        if not self._buffer:
+            return
+        samples: np.ndarray = np.concatenate(self._buffer)
+        sample_weights: np.ndarray = np.concatenate(self._buffer_weights)
+        self._buffer, self._buffer_weights = [], []
+        self._buffered, self._buffered_weight = 0, 0.0
+        self.min = min(self.min, float(samples.min()))
+        self.max = max(self.max, float(samples.max()))
+        self._combine(np.concatenate((self.means, samples)), np.concatenate((self.weights, sample_weights)))
+
+    def _combine(self, means: np.ndarray, weights: np.ndarray) -> None:
+        if not means.size:
+            return
+        order: np.ndarray = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total: float = weights.sum()
+        midpoints: np.ndarray = (np.cumsum(weights) - weights / 2) / total
+        normalizer: float = 4 * np.log(max(total / self.compression, 1.0)) + 24
+        k: np.ndarray = self.compression / normalizer * np.log(midpoints / (1 - midpoints))
+        buckets: np.ndarray = np.floor(k - k[0]).astype(np.int64)
+        # Buckets are non-decreasing, so renumbering them keeps centroids in sorted order
+        _, buckets = np.unique(buckets, return_inverse=True)
+        self.weights = np.bincount(buckets, weights=weights)
+        self.means = np.bincount(buckets, weights=means * weights) / self.weights
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """
+        Estimate several quantiles at once.
+
+        Args:
+            qs (Iterable[float]): Quantiles in the [0, 1] range.
+
+        Returns:
+            np.ndarray: The estimated values, NaN if the digest is empty.
+        """
+        self.compress()
+        qs = np.clip(np.asarray(list(qs), dtype=np.float64), 0.0, 1.0)
+        if not self.weights.size:
+            return np.full(qs.shape, np.nan)
+        total: float = self.weights.sum()
+        positions: np.ndarray = np.concatenate(
+            ([0.0], np.cumsum(self.weights) - self.weights / 2, [total]))
+        values: np.ndarray = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(qs * total, positions, values)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a single quantile.
+
+        Args:
+            q (float): The quantile in the [0, 1] range.
+
+        Returns:
+            float: The estimated value.
+        """
+        return float(self.quantiles([q])[0])
+
+    def to_bytes(self) -> bytes:
+        """Serialize the digest to a compact binary representation."""
+        self.compress()
+        header: bytes = _HEADER.pack(self.compression, self.min, self.max, self.means.size)
+        return header + self.means.astype('<f8').tobytes() + self.weights.astype('<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'TDigest':
+        """
+        Deserialize a digest produced by ``to_bytes``.
+
+        Args:
+            payload (bytes): The serialized digest.
+
+        Returns:
+            TDigest: The deserialized digest.
+        """
+        compression, minimum, maximum, size = _HEADER.unpack_from(payload)
+        body: np.ndarray = np.frombuffer(payload, dtype='<f8', offset=_HEADER.size, count=2 * size)
+        digest: TDigest = cls(compression)
+        digest.means = body[:size].astype(np.float64)
+        digest.weights = body[size:].astype(np.float64)
+        digest.min, digest.max = minimum, maximum
+        return digest
@@ -0,0 +1,12 @@
+from celery import Celery
+from flask import Flask
+from app import create_app
+from app.extensions import celery as configured_celery
+
+environment: str = 'development'
+flask_app: Flask = create_app(environment)
+
+from app import tasks  # noqa: E402,F401  registers the tasks on the configured instance
+
+# Run by a Celery worker, e.g. `celery -A app.worker.celery worker --loglevel=info`
+celery: Celery = configured_celery
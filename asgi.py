@@ -0,0 +1,7 @@
+from quart import Quart
+from app.dashboard import create_dashboard_app
+
+environment: str = 'development'
+
+# Served by an ASGI server, e.g. `hypercorn asgi:app --workers 2`
+app: Quart = create_dashboard_app(environment)
@@ -0,0 +1,54 @@
+"""
+Add composite indexes for the hot API access paths.
+
+Test results are listed per test case and per test run, newest first, and aggregated
+over time ranges; performance results are listed per performance test by execution
+time. Each index matches one of those filters plus its sort column.
+
+Indexes that already exist, e.g. created with a table by scripts/create_db_schema.sql, are skipped.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Creates the indexes that do not exist yet.
+    downgrade(): Drops the indexes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0001'
+down_revision: str = None
+branch_labels: tuple = None
+depends_on: tuple = None
+
+# (index name, table, columns)
+HOT_PATH_INDEXES: list[tuple[str, str, list[str]]] = [
+    ('ix_test_cases_test_suite_id', 'test_cases', ['test_suite_id']),
+    ('ix_test_results_test_case_id_created_at', 'test_results', ['test_case_id', 'created_at']),
+    ('ix_test_results_test_run_id_created_at', 'test_results', ['test_run_id', 'created_at']),
+    ('ix_test_results_created_at', 'test_results', ['created_at']),
+    ('ix_performance_results_test_id_executed_at', 'performance_results', ['performance_test_id', 'executed_at']),
+    ('ix_test_run_test_suite_id_created_at', 'test_run', ['test_suite_id', 'created_at']),
+]
+
+
+def _index_exists(table: str, name: str) -> bool:
+    return any(index['name'] == name for index in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    for name, table, columns in HOT_PATH_INDEXES:
+        if not _index_exists(table, name):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    for name, table, _ in reversed(HOT_PATH_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""
+Add completion tracking to test runs.
+
+A run's results are written in bulk when it finishes, in the same transaction that
+records its final status and finish time.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Adds the status and finished_at columns.
+    downgrade(): Drops the status and finished_at columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0002'
+down_revision: str = '0001'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    op.add_column('test_run', sa.Column('status', sa.String(20), nullable=True, server_default='completed'))
+    op.add_column('test_run', sa.Column('finished_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    op.drop_column('test_run', 'finished_at')
+    op.drop_column('test_run', 'status')
@@ -0,0 +1,68 @@
+"""
+Store result_data of test and performance results as compressed binary payloads.
+
+Each table gets a binary column that the existing text is copied into in primary key
+batches, compressed as ``app.db.types.CompressedText`` does; the text column is then
+dropped and the new column takes its name.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Compresses result_data.
+    downgrade(): Restores result_data as text.
+"""
+from typing import Callable
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import LONGBLOB
+from app.db.types import compress_text, decompress_text
+
+# Revision identifiers used by Alembic.
+revision: str = '0003'
+down_revision: str = '0002'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+TABLES: tuple[str, ...] = ('test_results', 'performance_results')
+BATCH_SIZE: int = 500
+BINARY: sa.types.TypeEngine = sa.LargeBinary().with_variant(LONGBLOB(), 'mysql', 'mariadb')
+
+
+def _rewrite(table_name: str, source: str, target: str, convert: Callable) -> None:
+    """Copy ``source`` into ``target`` through ``convert``, one primary key batch at a time."""
+    connection = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column(source), sa.column(target))
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values({target: sa.bindparam('value')})
+    last_id: int = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c[source]).where(table.c.id > last_id, table.c[source].isnot(None))
+            .order_by(table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            break
+        connection.execute(update, [{'row_id': row.id, 'value': convert(row[1])} for row in rows])
+        last_id = rows[-1].id
+
+
+def _swap(table_name: str, column_type: sa.types.TypeEngine, convert: Callable) -> None:
+    op.add_column(table_name, sa.Column('result_data_new', column_type, nullable=True))
+    _rewrite(table_name, 'result_data', 'result_data_new', convert)
+    with op.batch_alter_table(table_name) as batch:
+        batch.drop_column('result_data')
+        batch.alter_column('result_data_new', new_column_name='result_data', existing_type=column_type)
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    for table_name in TABLES:
+        _swap(table_name, BINARY, compress_text)
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    for table_name in TABLES:
+        _swap(table_name, sa.Text(), decompress_text)
@@ -0,0 +1,55 @@
+"""
+Bucket test results by creation month.
+
+Adds ``test_results.created_month`` (YYYYMM), backfilled from created_at in primary key
+batches, and an index on (created_month, id) so that a month can be read, archived and
+deleted without scanning the table.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Adds and backfills the created_month column and its index.
+    downgrade(): Drops the index and the column.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0004'
+down_revision: str = '0003'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+BATCH_SIZE: int = 10000
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    op.add_column('test_results', sa.Column('created_month', sa.Integer(), nullable=True))
+
+    connection = op.get_bind()
+    table = sa.table('test_results', sa.column('id', sa.Integer), sa.column('created_at', sa.DateTime),
+                     sa.column('created_month', sa.Integer))
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(created_month=sa.bindparam('month'))
+    last_id: int = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.created_at).where(table.c.id > last_id, table.c.created_at.isnot(None))
+            .order_by(table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            break
+        connection.execute(update, [
+            {'row_id': row.id, 'month': row.created_at.year * 100 + row.created_at.month} for row in rows])
+        last_id = rows[-1].id
+
+    op.create_index('ix_test_results_created_month_id', 'test_results', ['created_month', 'id'])
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    op.drop_index('ix_test_results_created_month_id', table_name='test_results')
+    op.drop_column('test_results', 'created_month')
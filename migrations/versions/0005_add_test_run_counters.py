@@ -0,0 +1,63 @@
+"""
+Keep summary counters of results on test runs.
+
+Adds the result totals per status and the summed execution time of each run, backfilled
+from test_results one batch of runs at a time, so that run lists no longer aggregate the
+results table.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Adds and backfills the counter columns.
+    downgrade(): Drops the counter columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0005'
+down_revision: str = '0004'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+BATCH_SIZE: int = 1000
+COUNTERS: tuple[tuple[str, sa.types.TypeEngine], ...] = (
+    ('total_results', sa.Integer()), ('passed_results', sa.Integer()), ('failed_results', sa.Integer()),
+    ('errored_results', sa.Integer()), ('total_duration', sa.Float()))
+# Counted status of each per-status counter
+STATUSES: dict[str, str] = {'passed_results': 'Passed', 'failed_results': 'Failed', 'errored_results': 'Error'}
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    for name, column_type in COUNTERS:
+        op.add_column('test_run', sa.Column(name, column_type, nullable=False, server_default='0'))
+
+    connection = op.get_bind()
+    runs = sa.table('test_run', sa.column('id', sa.Integer), *[sa.column(name) for name, _ in COUNTERS])
+    results = sa.table('test_results', sa.column('test_run_id', sa.Integer), sa.column('status', sa.String),
+                       sa.column('execution_time', sa.Float))
+
+    def aggregate(expression: sa.ColumnElement, *criteria: sa.ColumnElement) -> sa.ScalarSelect:
+        return sa.select(expression).where(results.c.test_run_id == runs.c.id, *criteria).scalar_subquery()
+
+    values: dict[str, sa.ScalarSelect] = {
+        'total_results': aggregate(sa.func.count()),
+        'total_duration': aggregate(sa.func.coalesce(sa.func.sum(results.c.execution_time), 0)),
+        **{name: aggregate(sa.func.count(), results.c.status == status) for name, status in STATUSES.items()},
+    }
+    last_id: int = 0
+    max_id: int = connection.execute(sa.select(sa.func.max(runs.c.id))).scalar() or 0
+    while last_id < max_id:
+        connection.execute(runs.update().where(runs.c.id > last_id, runs.c.id <= last_id + BATCH_SIZE).values(values))
+        last_id += BATCH_SIZE
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    for name, _ in reversed(COUNTERS):
+        op.drop_column('test_run', name)
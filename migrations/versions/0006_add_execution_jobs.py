@@ -0,0 +1,58 @@
+"""
+Add the execution jobs queued by the execute endpoints.
+
+Suites, test cases and performance tests are executed by Celery workers instead of
+within the HTTP request; each execution is tracked by a job that clients poll for its
+status and result.
+
+The table and its index are skipped when they already exist, e.g. in databases created
+with scripts/create_db_schema.sql.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Creates the execution_jobs table and its index if they do not exist yet.
+    downgrade(): Drops the execution_jobs table.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import LONGBLOB
+
+# Revision identifiers used by Alembic.
+revision: str = '0006'
+down_revision: str = '0005'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('execution_jobs'):
+        op.create_table(
+            'execution_jobs',
+            sa.Column('id', sa.String(36), primary_key=True),
+            sa.Column('kind', sa.String(32), nullable=False),
+            sa.Column('target_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+            sa.Column('result', sa.LargeBinary().with_variant(LONGBLOB(), 'mysql', 'mariadb')),
+            sa.Column('error', sa.Text()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('started_at', sa.DateTime()),
+            sa.Column('finished_at', sa.DateTime()),
+        )
+    elif 'ix_execution_jobs_kind_target_id_created_at' in {
+            index['name'] for index in inspector.get_indexes('execution_jobs')}:
+        return
+    op.create_index('ix_execution_jobs_kind_target_id_created_at', 'execution_jobs',
+                    ['kind', 'target_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    op.drop_index('ix_execution_jobs_kind_target_id_created_at', table_name='execution_jobs')
+    op.drop_table('execution_jobs')
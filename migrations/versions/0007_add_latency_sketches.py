@@ -0,0 +1,63 @@
+"""
+Add the latency sketches of performance runs and rolling windows.
+
+Each stored performance run, and each rolling window of live stats, keeps a t-digest of
+its response times; percentiles across runs and windows merge the sketches instead of
+re-reading raw samples.
+
+The table and its indexes are skipped when they already exist, e.g. in databases created
+with scripts/create_db_schema.sql.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Creates the latency_sketches table and its indexes if they do not exist yet.
+    downgrade(): Drops the latency_sketches table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0007'
+down_revision: str = '0006'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+# Indexes of the table, by name
+INDEXES: dict = {
+    'ix_latency_sketches_test_result': ['performance_test_id', 'performance_result_id'],
+    'ix_latency_sketches_test_window': ['performance_test_id', 'window_start'],
+}
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    inspector = sa.inspect(op.get_bind())
+    existing: set = set()
+    if inspector.has_table('latency_sketches'):
+        existing = {index['name'] for index in inspector.get_indexes('latency_sketches')}
+    else:
+        op.create_table(
+            'latency_sketches',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('performance_test_id', sa.Integer(), sa.ForeignKey('performance_tests.id'), nullable=False),
+            sa.Column('performance_result_id', sa.Integer(), sa.ForeignKey('performance_results.id')),
+            sa.Column('window_start', sa.DateTime()),
+            sa.Column('sample_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('digest', sa.LargeBinary(), nullable=False),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'latency_sketches', columns)
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    for name in INDEXES:
+        op.drop_index(name, table_name='latency_sketches')
+    op.drop_table('latency_sketches')
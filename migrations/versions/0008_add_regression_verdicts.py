@@ -0,0 +1,52 @@
+"""
+Add the regression verdicts of performance runs.
+
+Each stored performance run gets one verdict, comparing it against the rolling baseline
+of the earlier runs of its test.
+
+The table is skipped when it already exists, e.g. in databases created with
+scripts/create_db_schema.sql.
+
+Attributes:
+    revision (str): The revision ID of the migration.
+    down_revision (str): The ID of the previous revision.
+    branch_labels (tuple): Labels for the Alembic branching feature.
+    depends_on (tuple): Dependencies of this revision on other revisions.
+
+Functions:
+    upgrade(): Creates the regression_verdicts table if it does not exist yet.
+    downgrade(): Drops the regression_verdicts table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic.
+revision: str = '0008'
+down_revision: str = '0007'
+branch_labels: tuple = None
+depends_on: tuple = None
+
+
+def upgrade() -> None:
+    """Commands to upgrade the database."""
+    if sa.inspect(op.get_bind()).has_table('regression_verdicts'):
+        return
+    op.create_table(
+        'regression_verdicts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('performance_result_id', sa.Integer(), sa.ForeignKey('performance_results.id'), nullable=False,
+                  unique=True),
+        sa.Column('performance_test_id', sa.Integer(), sa.ForeignKey('performance_tests.id'), nullable=False),
+        sa.Column('status', sa.String(32), nullable=False),
+        sa.Column('is_regression', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('p_value', sa.Float()),
+        sa.Column('effect_size', sa.Float()),
+        sa.Column('median_ratio', sa.Float()),
+        sa.Column('baseline_result_ids', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    """Commands to downgrade the database."""
+    op.drop_table('regression_verdicts')
@@ -0,0 +1,184 @@
+"""
+Benchmark the hot API queries before and after adding the hot-path indexes.
+
+Seeds a local database with a realistic volume of suites, cases, runs and results,
+times each list and aggregate query used by the API without the indexes, creates
+them, and times the queries again.
+
+Usage:
+    python scripts/benchmark_indexes.py --url sqlite:///benchmark.db --results 2000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Engine, Index, Table, and_, create_engine, func, insert, select, text  # noqa: E402
+from app.db.schema import (  # noqa: E402
+    PerformanceTest, PerformanceTestResult, TestCase, TestResult, TestRun, TestSuite)
+
+HOT_PATH_INDEXES: List[str] = [
+    'ix_test_cases_test_suite_id',
+    'ix_test_results_test_case_id_created_at',
+    'ix_test_results_test_run_id_created_at',
+    'ix_test_results_created_at',
+    'ix_performance_results_test_id_executed_at',
+    'ix_test_run_test_suite_id_created_at',
+]
+BATCH_SIZE: int = 10000
+STATUSES: Tuple[str, ...] = ('Passed', 'Passed', 'Passed', 'Failed', 'Error')
+
+
+def tables() -> List[Table]:
+    return [model.__table__ for model in (
+        TestSuite, TestCase, TestRun, TestResult, PerformanceTest, PerformanceTestResult)]
+
+
+def hot_path_indexes() -> List[Index]:
+    return [index for table in tables() for index in table.indexes if index.name in HOT_PATH_INDEXES]
+
+
+def insert_batches(engine: Engine, table: Table, rows: Callable[[int], Dict[str, Any]], count: int) -> None:
+    for start in range(0, count, BATCH_SIZE):
+        with engine.begin() as connection:
+            connection.execute(insert(table), [rows(index) for index in range(start, min(start + BATCH_SIZE, count))])
+
+
+def seed(engine: Engine, args: argparse.Namespace) -> None:
+    """Create the tables without the hot-path indexes and fill them with synthetic data."""
+    random.seed(args.seed)
+    now: datetime = datetime.utcnow()
+    cases: int = args.suites * args.cases_per_suite
+    runs: int = args.suites * args.runs_per_suite
+
+    def timestamp() -> datetime:
+        return now - timedelta(seconds=random.randint(0, 365 * 24 * 3600))
+
+    table_list: List[Table] = tables()
+    for table in reversed(table_list):
+        table.drop(engine, checkfirst=True)
+    for table in table_list:
+        table.create(engine)
+    for index in hot_path_indexes():
+        index.drop(engine)
+
+    insert_batches(engine, TestSuite.__table__, lambda i: {
+        'id': i + 1, 'name': f'suite-{i}', 'description': 'benchmark suite'}, args.suites)
+    insert_batches(engine, TestCase.__table__, lambda i: {
+        'id': i + 1, 'test_suite_id': i % args.suites + 1, 'name': f'case-{i}', 'description': ''}, cases)
+    insert_batches(engine, TestRun.__table__, lambda i: {
+        'id': i + 1, 'test_suite_id': i % args.suites + 1, 'created_at': timestamp()}, runs)
+    insert_batches(engine, TestResult.__table__, lambda i: {
+        'test_case_id': random.randint(1, cases), 'test_run_id': random.randint(1, runs),
+        'status': random.choice(STATUSES), 'execution_time': random.random() * 5,
+        'result_data': 'newman run output', 'created_at': timestamp()}, args.results)
+    insert_batches(engine, PerformanceTest.__table__, lambda i: {
+        'id': i + 1, 'name': f'perf-{i}', 'test_suite_id': i % args.suites + 1}, args.performance_tests)
+    insert_batches(engine, PerformanceTestResult.__table__, lambda i: {
+        'performance_test_id': random.randint(1, args.performance_tests), 'status': 'completed',
+        'execution_time': random.random() * 600, 'avg_response_time': random.random() * 300,
+        'requests_per_sec': random.random() * 1000, 'result_data': '{}',
+        'executed_at': timestamp()}, args.performance_results)
+
+
+def queries(args: argparse.Namespace) -> Dict[str, Callable[[], Any]]:
+    """The list and aggregate queries issued by the API, with randomized parameters."""
+    results: Table = TestResult.__table__
+    performance_results: Table = PerformanceTestResult.__table__
+    cases: int = args.suites * args.cases_per_suite
+    runs: int = args.suites * args.runs_per_suite
+    now: datetime = datetime.utcnow()
+
+    return {
+        'GET /testsuites/<id> (cases)': lambda: select(TestCase.__table__).where(
+            TestCase.__table__.c.test_suite_id == random.randint(1, args.suites)),
+        'GET /testsuites/<id>/runs': lambda: select(TestRun.__table__).where(
+            TestRun.__table__.c.test_suite_id == random.randint(1, args.suites)
+        ).order_by(TestRun.__table__.c.created_at.desc()).limit(50),
+        'GET /testcases/<id>/results': lambda: select(results).where(
+            results.c.test_case_id == random.randint(1, cases)
+        ).order_by(results.c.created_at.desc()).limit(50),
+        'test run results': lambda: select(results).where(
+            results.c.test_run_id == random.randint(1, runs)
+        ).order_by(results.c.created_at),
+        'test case success rate': lambda: select(func.count()).where(
+            results.c.test_case_id == random.randint(1, cases), results.c.status == 'Passed'),
+        'results in last 24h': lambda: select(func.count()).where(
+            results.c.created_at >= now - timedelta(days=1)),
+        'GET /performancetests/<id>/results': lambda: select(performance_results).where(
+            performance_results.c.performance_test_id == random.randint(1, args.performance_tests)
+        ).order_by(performance_results.c.executed_at.desc()).limit(50),
+        'avg response time last 7d': lambda: select(func.avg(performance_results.c.avg_response_time)).where(
+            and_(performance_results.c.performance_test_id == random.randint(1, args.performance_tests),
+                 performance_results.c.executed_at >= now - timedelta(days=7))),
+    }
+
+
+def measure(engine: Engine, args: argparse.Namespace) -> Dict[str, float]:
+    """Return the median latency in milliseconds of each query."""
+    timings: Dict[str, float] = {}
+    with engine.connect() as connection:
+        for name, build in queries(args).items():
+            samples: List[float] = []
+            for _ in range(args.repeat):
+                statement = build()
+                start: float = time.perf_counter()
+                connection.execute(statement).fetchall()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(samples)
+    return timings
+
+
+def analyze(engine: Engine) -> None:
+    if engine.dialect.name in ('sqlite', 'postgresql'):
+        with engine.begin() as connection:
+            connection.execute(text('ANALYZE'))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='sqlite:///benchmark.db', help='Database URL to benchmark against')
+    parser.add_argument('--suites', type=int, default=200)
+    parser.add_argument('--cases-per-suite', type=int, default=20)
+    parser.add_argument('--runs-per-suite', type=int, default=100)
+    parser.add_argument('--results', type=int, default=2000000)
+    parser.add_argument('--performance-tests', type=int, default=50)
+    parser.add_argument('--performance-results', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse data seeded by a previous run')
+    args = parser.parse_args()
+
+    engine: Engine = create_engine(args.url)
+    if args.skip_seed:
+        for index in hot_path_indexes():
+            index.drop(engine, checkfirst=True)
+    else:
+        start: float = time.perf_counter()
+        seed(engine, args)
+        print(f"Seeded {args.results} test results in {time.perf_counter() - start:.1f}s")
+
+    analyze(engine)
+    before: Dict[str, float] = measure(engine, args)
+
+    start = time.perf_counter()
+    for index in hot_path_indexes():
+        index.create(engine)
+    print(f"Created {len(HOT_PATH_INDEXES)} indexes in {time.perf_counter() - start:.1f}s")
+    analyze(engine)
+    after: Dict[str, float] = measure(engine, args)
+
+    print(f"\n{'query':<38}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        speedup: float = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<38}{before[name]:>14.2f}{after[name]:>14.2f}{speedup:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
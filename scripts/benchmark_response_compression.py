@@ -0,0 +1,117 @@
+"""
+Benchmark the bytes sent and the latency of the largest API responses with and without
+response compression.
+
+Serves pages of test results carrying Newman output, pages of performance results
+carrying Locust stats, and a streamed performance time series from a Flask app using
+``compress_response``, and for each content coding (identity, gzip and, if installed,
+brotli) reports the body size, the compression ratio, the median server time and the
+time to transfer the body over a link of the given bandwidth.
+
+Usage:
+    python scripts/benchmark_response_compression.py --page-size 100 --mbps 50
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, Response, jsonify  # noqa: E402
+from app.utils.compression import brotli, compress_response  # noqa: E402
+from scripts.benchmark_result_data_compression import locust_stats, newman_output  # noqa: E402
+
+
+def test_results(count: int) -> List[Dict[str, Any]]:
+    start: datetime = datetime(2024, 5, 1)
+    return [{
+        'id': index, 'test_case_id': random.randint(1, 500), 'status': random.choice(['Passed', 'Passed', 'Failed']),
+        'execution_time': round(random.uniform(0.1, 30), 3), 'result_data': newman_output(random.randint(5, 60)),
+        'created_at': (start + timedelta(minutes=index)).isoformat(),
+    } for index in range(count)]
+
+
+def performance_results(count: int) -> List[Dict[str, Any]]:
+    start: datetime = datetime(2024, 5, 1)
+    return [{
+        'id': index, 'performance_test_id': 1, 'execution_time': round(random.uniform(60, 600), 3),
+        'status': 'Passed', 'result_data': locust_stats(random.randint(5, 40)),
+        'executed_at': (start + timedelta(hours=index)).isoformat(),
+    } for index in range(count)]
+
+
+def time_series(points: int) -> Iterator[str]:
+    start: datetime = datetime(2024, 5, 1)
+    yield '['
+    for index in range(points):
+        yield (',' if index else '') + json.dumps({
+            'time': (start + timedelta(seconds=index)).isoformat(), 'avg_response_time': random.uniform(5, 900),
+            'requests_per_sec': random.uniform(1, 500), 'user_count': random.randint(1, 1000)})
+    yield ']'
+
+
+def create_benchmark_app(page_size: int, points: int) -> Flask:
+    app: Flask = Flask(__name__)
+    app.after_request(compress_response)
+    results: List[Dict[str, Any]] = test_results(page_size)
+    runs: List[Dict[str, Any]] = performance_results(page_size)
+
+    @app.route('/testcases/results')
+    def results_page() -> Response:
+        return jsonify(results)
+
+    @app.route('/performancetests/results')
+    def performance_page() -> Response:
+        return jsonify(runs)
+
+    @app.route('/performancetests/timeseries')
+    def timeseries() -> Response:
+        random.seed(points)
+        return Response(time_series(points), mimetype='application/json')
+
+    return app
+
+
+def benchmark(app: Flask, repeat: int, mbps: float) -> None:
+    encodings: List[str] = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+    client: Any = app.test_client()
+    print(f"{'endpoint':<30}{'encoding':<10}{'size (KB)':>11}{'ratio':>8}{'server (ms)':>13}{'transfer (ms)':>15}")
+    for endpoint in ('/testcases/results', '/performancetests/results', '/performancetests/timeseries'):
+        identity_size: int = 0
+        for encoding in encodings:
+            times: List[float] = []
+            size: int = 0
+            for _ in range(repeat):
+                start: float = time.perf_counter()
+                response: Any = client.get(endpoint, headers={'Accept-Encoding': encoding})
+                size = len(response.get_data())
+                times.append(time.perf_counter() - start)
+            assert response.headers.get('Content-Encoding', 'identity') == encoding
+            identity_size = identity_size or size
+            print(f"{endpoint:<30}{encoding:<10}{size / 1024:>11.1f}{identity_size / size:>8.1f}"
+                  f"{statistics.median(times) * 1000:>13.2f}{size * 8 / (mbps * 1000):>15.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=100, help='Results per page of the list endpoints')
+    parser.add_argument('--points', type=int, default=20000, help='Points of the streamed time series')
+    parser.add_argument('--repeat', type=int, default=10, help='Requests timed per endpoint and encoding')
+    parser.add_argument('--mbps', type=float, default=50, help='Client bandwidth used for the transfer times')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    if brotli is None:
+        print("brotli is not installed; only gzip is offered\n")
+    benchmark(create_benchmark_app(args.page_size, args.points), args.repeat, args.mbps)
+
+
+if __name__ == '__main__':
+    main()
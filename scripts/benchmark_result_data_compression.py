@@ -0,0 +1,129 @@
+"""
+Benchmark the storage savings and read/write overhead of compressed result_data.
+
+Generates Newman console outputs and Locust stats JSON blobs of increasing size, then
+for each codec available (raw text, zlib and, if installed, zstd) reports the compression
+ratio, the encode/decode time per payload, and the database size and insert/select times
+of storing them in a SQLite table through a Text versus a CompressedText column.
+
+Usage:
+    python scripts/benchmark_result_data_compression.py --rows 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlalchemy as sa  # noqa: E402
+from app.db.types import CompressedText, ZLIB_LEVEL, ZSTD_LEVEL, zstandard  # noqa: E402
+
+
+def newman_output(cases: int) -> str:
+    lines: List[str] = ['newman', '', 'Ator API collection']
+    for index in range(cases):
+        status: str = random.choice(['200 OK', '200 OK', '200 OK', '404 Not Found', '500 Internal Server Error'])
+        lines += [
+            f'→ GET /api/v1/items/{random.randint(1, 10 ** 6)}',
+            f'  GET https://api.example.com/api/v1/items/{index} [{status}, {random.randint(200, 4000)}B, '
+            f'{random.randint(5, 900)}ms]',
+            '  ✓  Status code is 200' if status == '200 OK' else f'  {index}. Status code is 200',
+            '  ✓  Response time is below 1000ms',
+        ]
+    return '\n'.join(lines)
+
+
+def locust_stats(endpoints: int) -> str:
+    stats: Dict[str, Dict[str, float]] = {
+        f'GET /api/v1/resource/{index}': {
+            'requests': random.randint(100, 100000), 'failures': random.randint(0, 100),
+            'avg': round(random.uniform(5, 800), 3), 'p50': random.randint(5, 500), 'p90': random.randint(50, 900),
+            'p95': random.randint(100, 1200), 'p99': random.randint(200, 3000), 'rps': round(random.uniform(1, 500), 3),
+        } for index in range(endpoints)}
+    return json.dumps({'endpoints': stats, 'aggregated': stats[next(iter(stats))]})
+
+
+def codecs() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    available = {
+        'raw': (lambda data: data, lambda data: data),
+        'zlib': (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress),
+    }
+    if zstandard is not None:
+        compressor, decompressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL), zstandard.ZstdDecompressor()
+        available['zstd'] = (compressor.compress, decompressor.decompress)
+    return available
+
+
+def benchmark_codecs(payloads: Dict[str, str], repeat: int) -> None:
+    print(f"{'payload':<22}{'codec':<7}{'size (KB)':>11}{'ratio':>8}{'encode (ms)':>13}{'decode (ms)':>13}")
+    for name, payload in payloads.items():
+        data: bytes = payload.encode('utf-8')
+        for codec, (encode, decode) in codecs().items():
+            encoded: bytes = encode(data)
+            encode_times: List[float] = []
+            decode_times: List[float] = []
+            for _ in range(repeat):
+                start: float = time.perf_counter()
+                encode(data)
+                encode_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                decode(encoded)
+                decode_times.append(time.perf_counter() - start)
+            print(f"{name:<22}{codec:<7}{len(encoded) / 1024:>11.1f}{len(data) / len(encoded):>8.1f}"
+                  f"{statistics.median(encode_times) * 1000:>13.3f}{statistics.median(decode_times) * 1000:>13.3f}")
+
+
+def benchmark_storage(rows: List[str]) -> None:
+    print(f"\n{'column type':<16}{'db size (MB)':>14}{'insert (s)':>12}{'select (s)':>12}")
+    for label, column_type in (('Text', sa.Text()), ('CompressedText', CompressedText())):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'results.db')
+            engine = sa.create_engine(f'sqlite:///{path}')
+            metadata = sa.MetaData()
+            table = sa.Table('test_results', metadata, sa.Column('id', sa.Integer, primary_key=True),
+                             sa.Column('result_data', column_type))
+            metadata.create_all(engine)
+
+            start: float = time.perf_counter()
+            with engine.begin() as connection:
+                connection.execute(table.insert(), [{'result_data': row} for row in rows])
+            insert_seconds: float = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with engine.connect() as connection:
+                assert len(connection.execute(sa.select(table.c.result_data)).scalars().all()) == len(rows)
+            select_seconds: float = time.perf_counter() - start
+
+            engine.dispose()
+            print(f"{label:<16}{os.path.getsize(path) / 1024 ** 2:>14.1f}{insert_seconds:>12.2f}{select_seconds:>12.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000, help='Number of rows stored in the storage benchmark')
+    parser.add_argument('--repeat', type=int, default=20, help='Repetitions of each codec timing')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    if zstandard is None:
+        print("zstandard is not installed; CompressedText falls back to zlib\n")
+    benchmark_codecs({
+        'newman 10 cases': newman_output(10),
+        'newman 200 cases': newman_output(200),
+        'newman 2000 cases': newman_output(2000),
+        'locust 20 endpoints': locust_stats(20),
+        'locust 500 endpoints': locust_stats(500),
+    }, args.repeat)
+    benchmark_storage([newman_output(random.randint(20, 800)) for _ in range(args.rows)])
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,23 @@ CREATE TABLE IF NOT EXISTS test_cases (
     test_suite_id INT NOT NULL,
     name VARCHAR(128) NOT NULL,
     description VARCHAR(256),
-    FOREIGN KEY (test_suite_id) REFERENCES test_suites (id)
+    FOREIGN KEY (test_suite_id) REFERENCES test_suites (id),
+    INDEX ix_test_cases_test_suite_id (test_suite_id)
+);
+
+CREATE TABLE IF NOT EXISTS test_run (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    test_suite_id INT NOT NULL,
+    status VARCHAR(20) DEFAULT 'running',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME,
+    total_results INT NOT NULL DEFAULT 0,
+    passed_results INT NOT NULL DEFAULT 0,
+    failed_results INT NOT NULL DEFAULT 0,
+    errored_results INT NOT NULL DEFAULT 0,
+    total_duration FLOAT NOT NULL DEFAULT 0,
+    FOREIGN KEY (test_suite_id) REFERENCES test_suites (id),
+    INDEX ix_test_run_test_suite_id_created_at (test_suite_id, created_at)
 );
 
 CREATE TABLE IF NOT EXISTS test_results (
@@ -23,10 +39,15 @@ CREATE TABLE IF NOT EXISTS test_results (
     status VARCHAR(50),
     execution_time FLOAT,
     failure_reason VARCHAR(255),
-    result_data TEXT,
+    result_data LONGBLOB,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    created_month INT,
     FOREIGN KEY (test_case_id) REFERENCES test_cases (id),
-    FOREIGN KEY (test_run_id) REFERENCES test_run (id)
+    FOREIGN KEY (test_run_id) REFERENCES test_run (id),
+    INDEX ix_test_results_test_case_id_created_at (test_case_id, created_at),
+    INDEX ix_test_results_test_run_id_created_at (test_run_id, created_at),
+    INDEX ix_test_results_created_at (created_at),
+    INDEX ix_test_results_created_month_id (created_month, id)
 );
 
 CREATE TABLE IF NOT EXISTS performance_tests (
@@ -46,11 +67,54 @@ CREATE TABLE IF NOT EXISTS performance_results (
     status VARCHAR(50),
     avg_response_time FLOAT,
     requests_per_sec FLOAT,
-    result_data TEXT,
+    result_data LONGBLOB,
     executed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (performance_test_id) REFERENCES performance_tests (id),
+    INDEX ix_performance_results_test_id_executed_at (performance_test_id, executed_at)
+);
+
+CREATE TABLE IF NOT EXISTS latency_sketches (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    performance_test_id INT NOT NULL,
+    performance_result_id INT,
+    window_start DATETIME,
+    sample_count INT NOT NULL DEFAULT 0,
+    digest BLOB NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (performance_test_id) REFERENCES performance_tests (id),
+    FOREIGN KEY (performance_result_id) REFERENCES performance_results (id),
+    INDEX ix_latency_sketches_test_result (performance_test_id, performance_result_id),
+    INDEX ix_latency_sketches_test_window (performance_test_id, window_start)
+);
+
+CREATE TABLE IF NOT EXISTS regression_verdicts (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    performance_result_id INT NOT NULL UNIQUE,
+    performance_test_id INT NOT NULL,
+    status VARCHAR(32) NOT NULL,
+    is_regression BOOLEAN NOT NULL DEFAULT FALSE,
+    p_value FLOAT,
+    effect_size FLOAT,
+    median_ratio FLOAT,
+    baseline_result_ids TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (performance_result_id) REFERENCES performance_results (id),
     FOREIGN KEY (performance_test_id) REFERENCES performance_tests (id)
 );
 
+CREATE TABLE IF NOT EXISTS execution_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    target_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    result LONGBLOB,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME,
+    INDEX ix_execution_jobs_kind_target_id_created_at (kind, target_id, created_at)
+);
+
 CREATE TABLE IF NOT EXISTS users (
     id INT PRIMARY KEY AUTO_INCREMENT,
     username VARCHAR(128) NOT NULL,
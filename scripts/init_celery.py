@@ -1 +1 @@
-celery -A app.tasks.celery worker --loglevel=info
+celery -A app.worker.celery worker --loglevel=info
@@ -1,9 +1,13 @@
 import pytest
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Table, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 from app import create_app
+from app.db.schema import BaseSchema
 from app.extensions import db as _db
-from typing import Generator, Any
+from typing import Generator, Any, List
 
 
 @pytest.fixture(scope='session')
@@ -33,3 +37,73 @@ def db(app: Flask) -> Generator[SQLAlchemy, Any, None]:
         _db.create_all()
         yield _db
         _db.drop_all()
+
+
+@pytest.fixture
+def tables() -> List[Table]:
+    """
+    Pytest fixture listing the tables the ``engine`` fixture creates.
+
+    Modules override it with the tables their tests use, e.g.
+    ``return [SuiteModel.__table__, CaseModel.__table__]``.
+
+    Returns:
+        List[Table]: Every table of the schema.
+    """
+    return BaseSchema.metadata.sorted_tables
+
+
+@pytest.fixture
+def engine(tables: List[Table]) -> Generator[Engine, Any, None]:
+    """
+    Pytest fixture for an in-memory SQLite database holding the ``tables``.
+
+    Args:
+        tables (List[Table]): The tables to create.
+
+    Yields:
+        Generator[Engine, Any, None]: The engine of the database.
+    """
+    engine = create_engine('sqlite://')
+    BaseSchema.metadata.create_all(engine, tables=tables)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine: Engine) -> Generator[Session, Any, None]:
+    """
+    Pytest fixture for a session on the ``engine``, without the Flask application.
+
+    Modules seed their data by overriding it with a fixture of the same name that takes
+    this one as argument.
+
+    Args:
+        engine (Engine): The engine of the in-memory database.
+
+    Yields:
+        Generator[Session, Any, None]: The session.
+    """
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Generator[List[str], Any, None]:
+    """
+    Pytest fixture recording the SQL statements sent through the ``engine``, in order.
+
+    Args:
+        engine (Engine): The engine to listen to.
+
+    Yields:
+        Generator[List[str], Any, None]: The statements, which tests may clear.
+    """
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import func, select
+from app.db.schema import TestCase as CaseModel, TestSuite as SuiteModel
+from app.services.test_management_service import TestManagementService as BulkService
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__]
+
+
+@pytest.fixture
+def session(session):
+    session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+    session.execute(CaseModel.__table__.insert().values(id=1, test_suite_id=1, name='login'))
+    session.commit()
+    return session
+
+
+def test_cases_are_created_in_bulk(session):
+    """Valid items are created together and invalid ones are reported with their index."""
+    service = BulkService(session, max_items=10)
+    items = [{'name': 'signup'}, {'name': ''}, {'name': 'logout', 'description': 'ends the session'},
+             {'name': 'search', 'priority': 1}]
+    result = service.create_test_cases(1, items)
+
+    assert [(case['index'], case['name'], case['test_suite_id']) for case in result.items] == [
+        (0, 'signup', 1), (2, 'logout', 1)]
+    assert all(case['id'] for case in result.items)
+    assert [error['index'] for error in result.errors] == [1, 3]
+    assert result.errors[0]['errors'][0]['field'] == 'name'
+    assert session.scalar(select(func.count()).select_from(CaseModel)) == 3
+
+
+def test_suites_are_created_with_their_cases(session):
+    """Suites are created with their nested test cases, whose errors carry their path."""
+    service = BulkService(session, max_items=10)
+    result = service.create_test_suites([
+        {'name': 'checkout', 'test_cases': [{'name': 'pay'}, {'name': 'refund'}]},
+        {'name': 'broken', 'test_cases': [{'name': 'ok'}, {}]},
+    ])
+
+    assert [(suite['name'], [case['name'] for case in suite['test_cases']]) for suite in result.items] == [
+        ('checkout', ['pay', 'refund'])]
+    assert result.errors == [{'index': 1, 'errors': [{'field': 'test_cases.1.name', 'message': 'Field required'}]}]
+    assert session.scalar(select(func.count()).select_from(SuiteModel).where(SuiteModel.name == 'broken')) == 0
+
+
+def test_cases_are_updated_in_bulk(session):
+    """Only the given fields are changed, and unknown IDs are reported as errors."""
+    service = BulkService(session, max_items=10)
+    result = service.update_test_cases([{'id': 42, 'name': 'ghost'}, {'id': 1, 'description': 'valid credentials'},
+                                        {'id': 1, 'name': None}])
+
+    assert [(case['index'], case['name'], case['description']) for case in result.items] == [
+        (1, 'login', 'valid credentials')]
+    assert [error['index'] for error in result.errors] == [0, 2]
+    assert session.get(CaseModel, 1).description == 'valid credentials'
+
+
+def test_bodies_must_be_bounded_arrays(session):
+    """Bodies that are not arrays, empty or too large are rejected as a whole."""
+    service = BulkService(session, max_items=2)
+    for body in (None, {'name': 'login'}, [], [{'name': 'a'}] * 3):
+        with pytest.raises(ValueError):
+            service.create_test_cases(1, body)
+    with pytest.raises(LookupError):
+        service.create_test_cases(2, [{'name': 'a'}])
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from flask import Flask
+from app import extensions
+from app.api import api_blueprint
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the application in a fresh interpreter where every connection attempt fails
+IMPORT_OFFLINE = """
+import socket
+
+def refuse(*args, **kwargs):
+    raise AssertionError(f"Connection attempted at import: {args}")
+
+socket.socket.connect = socket.socket.connect_ex = refuse
+socket.create_connection = socket.getaddrinfo = refuse
+
+import app, app.api, app.extensions, app.tasks
+assert app.extensions._clients == {}, app.extensions._clients
+"""
+
+
+class FakeClient:
+    """Answers pings like the InfluxDB and Redis clients, or fails like an unreachable server."""
+
+    def __init__(self, up=True):
+        self.up = up
+
+    def ping(self):
+        if not self.up:
+            raise ConnectionError('Connection refused')
+        return True
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setattr(extensions, '_clients', {})
+    monkeypatch.setattr(extensions, '_clients_pid', os.getpid())
+    return extensions._clients
+
+
+@pytest.fixture
+def created(clients, monkeypatch):
+    created = []
+
+    def create(config):
+        # Slow enough for concurrent first uses to overlap
+        time.sleep(0.01)
+        created.append(FakeClient())
+        return created[-1]
+
+    monkeypatch.setattr(extensions, 'create_redis_client', create)
+    return created
+
+
+def test_importing_the_application_connects_to_nothing():
+    """No client is created, and no socket connected, by importing the application."""
+    result = subprocess.run([sys.executable, '-c', IMPORT_OFFLINE], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_clients_are_created_once_and_reused(created):
+    """Concurrent first uses share a single client, which later calls return."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: extensions.get_redis_client(), range(32)))
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+    assert extensions.get_redis_client() is created[0]
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is POSIX only')
+def test_forked_processes_create_their_own_clients(created):
+    """A forked worker does not reuse the client of its parent."""
+    parent = extensions.get_redis_client()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        own = extensions.get_redis_client()
+        os.write(write, b'1' if own is not parent and extensions.get_redis_client() is own else b'0')
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert os.read(read, 1) == b'1'
+    assert extensions.get_redis_client() is parent and len(created) == 1
+
+
+def test_health_reports_backends_that_are_down(clients):
+    """/health answers 503 naming the unreachable backend, and 200 once it is back."""
+    app = Flask(__name__)
+    app.register_blueprint(api_blueprint)
+    clients.update(influxdb=FakeClient(), redis=FakeClient(up=False))
+
+    response = app.test_client().get('/health')
+    assert response.status_code == 503
+    assert response.get_json() == {'status': 'degraded', 'checks': {'influxdb': True, 'redis': False}}
+
+    clients['redis'].up = True
+    response = app.test_client().get('/health')
+    assert (response.status_code, response.get_json()['status']) == (200, 'ok')
@@ -0,0 +1,46 @@
+import json
+import pytest
+import sqlalchemy as sa
+from app.db.types import RAW, CompressedText, compress_text, decompress_text
+
+NEWMAN_OUTPUT = '\n'.join(
+    f'→ GET /api/items/{index}\n  GET http://api.local/items/{index} [200 OK, 1.2kB, {index % 97}ms]\n'
+    f'  ✓  Status code is 200\n  ✓  Response time is below 200ms' for index in range(2000))
+
+RESULTS = sa.Table('results', sa.MetaData(), sa.Column('id', sa.Integer, primary_key=True),
+                   sa.Column('result_data', CompressedText()))
+
+
+@pytest.fixture
+def tables():
+    return [RESULTS]
+
+
+def test_round_trip_of_small_large_and_binary_like_text():
+    """Every value reads back unchanged, whether it was compressed or not."""
+    for value in ('', 'short', NEWMAN_OUTPUT, json.dumps({'p95': 12.5}) * 500, '\x00\x01 leading control bytes'):
+        assert decompress_text(compress_text(value)) == value
+
+
+def test_only_large_payloads_are_compressed():
+    """Values under the threshold are stored raw; large repetitive output shrinks substantially."""
+    assert compress_text('short')[:1] == RAW
+    stored = compress_text(NEWMAN_OUTPUT)
+    assert stored[:1] != RAW
+    assert len(stored) < len(NEWMAN_OUTPUT.encode()) / 5
+
+
+def test_legacy_text_is_read_as_is():
+    """Payloads written before compression are returned unchanged."""
+    assert decompress_text('plain text') == 'plain text'
+    assert decompress_text(b'{"legacy": true}') == '{"legacy": true}'
+
+
+def test_column_type_is_transparent(engine):
+    """The column stores compressed bytes but reads and writes str."""
+    with engine.begin() as connection:
+        connection.execute(RESULTS.insert(), [{'id': 1, 'result_data': NEWMAN_OUTPUT}, {'id': 2, 'result_data': None}])
+        assert connection.execute(sa.select(RESULTS.c.result_data).order_by(RESULTS.c.id)).scalars().all() == [
+            NEWMAN_OUTPUT, None]
+        stored = connection.execute(sa.text('SELECT length(result_data) FROM results WHERE id = 1')).scalar()
+    assert stored < len(NEWMAN_OUTPUT.encode()) / 5
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+
+pytest.importorskip('quart')
+pytest.importorskip('aiosqlite')
+jwt = pytest.importorskip('jwt')
+
+from app.dashboard import create_dashboard_app  # noqa: E402
+from app.db.aio import async_database_uri  # noqa: E402
+from app.db.schema import PERFORMANCE_RUN_COMPLETED, PERFORMANCE_RUN_ERROR, BaseSchema, \
+    PerformanceTest as PerfTestModel, PerformanceTestResult as PerfResultModel, TestCase as CaseModel, \
+    TestSuite as SuiteModel  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'dashboard.db'}"
+    engine = create_engine(uri)
+    BaseSchema.metadata.create_all(engine, tables=[
+        SuiteModel.__table__, CaseModel.__table__, PerfTestModel.__table__, PerfResultModel.__table__])
+    start = datetime(2024, 5, 1)
+    with engine.begin() as connection:
+        connection.execute(SuiteModel.__table__.insert(), [{'id': index, 'name': f'suite-{index}'} for index in (1, 2, 3)])
+        connection.execute(CaseModel.__table__.insert().values(id=1, test_suite_id=1, name='login'))
+        connection.execute(PerfTestModel.__table__.insert().values(id=1, name='load', created_at=start))
+        connection.execute(PerfResultModel.__table__.insert(), [{
+            'id': index, 'performance_test_id': 1,
+            'status': PERFORMANCE_RUN_COMPLETED if index % 2 else PERFORMANCE_RUN_ERROR,
+            'avg_response_time': 100.0 * index, 'requests_per_sec': 10.0, 'executed_at': start + timedelta(hours=index),
+        } for index in range(1, 5)])
+    engine.dispose()
+
+    app = create_dashboard_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_REPLICA_URIS'] = []
+    app.config['JWT_SECRET_KEY'] = 'a-dashboard-test-secret-of-32-bytes'
+    return app
+
+
+def get(app, path, authorized=True):
+    async def request():
+        async with app.test_app():
+            headers = {'Authorization': 'Bearer ' + jwt.encode(
+                {'sub': '1', 'type': 'access'}, app.config['JWT_SECRET_KEY'], algorithm='HS256')} if authorized else {}
+            response = await app.test_client().get(path, headers=headers)
+            return response.status_code, await response.get_json(), response.headers
+    return asyncio.run(request())
+
+
+def test_async_uri_uses_asyncio_driver():
+    """Synchronous driver names are swapped for their asyncio counterparts."""
+    assert async_database_uri('mysql+pymysql://user:secret@db/ator') == 'mysql+aiomysql://user:secret@db/ator'
+    assert async_database_uri('sqlite:///ator.db') == 'sqlite+aiosqlite:///ator.db'
+
+
+def test_lists_are_paginated(app):
+    """List endpoints page with the same cursors and headers as the Flask API."""
+    status, suites, headers = get(app, '/api/dashboard/testsuites?limit=2')
+    assert status == 200
+    assert [suite['id'] for suite in suites] == [1, 2]
+    assert suites[0]['test_cases'][0]['name'] == 'login'
+    status, suites, _ = get(app, f"/api/dashboard/testsuites?limit=2&after={headers['X-Next-Cursor']}")
+    assert [suite['id'] for suite in suites] == [3]
+
+    assert get(app, '/api/dashboard/testsuites', authorized=False)[0] == 401
+
+
+def test_performance_analytics(app):
+    """The summary aggregates every run and the trend lists them oldest first."""
+    status, summary, _ = get(app, '/api/dashboard/performancetests/1/summary')
+    assert status == 200
+    assert (summary['runs'], summary['passed'], summary['max_response_time']) == (4, 2, 400.0)
+
+    status, trend, _ = get(app, '/api/dashboard/performancetests/1/trend?limit=3')
+    assert [point['avg_response_time'] for point in trend] == [200.0, 300.0, 400.0]
+    assert get(app, '/api/dashboard/performancetests/2/summary')[0] == 404
+
+
+def test_suite_lists_accept_fieldsets(app):
+    """Clients may ask for some columns only, and leave out or embed the test cases."""
+    status, suites, _ = get(app, '/api/dashboard/testsuites?fields=id,name&limit=1')
+    assert (status, suites) == (200, [{'id': 1, 'name': 'suite-1'}])
+    status, suites, _ = get(app, '/api/dashboard/testsuites?fields=name,test_cases&limit=1')
+    assert suites[0]['test_cases'][0]['name'] == 'login' and 'id' not in suites[0]
+    assert get(app, '/api/dashboard/testsuites?fields=secret')[0] == 400
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from app.utils.downsampling import lttb_indices, downsample_points
+
+
+def test_lttb_keeps_endpoints_and_threshold() -> None:
+    """
+    Test that LTTB returns exactly ``threshold`` sorted indices including both endpoints.
+    """
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 100.0)
+
+    indices = lttb_indices(x, y, 500)
+
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == 9999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_preserves_spikes() -> None:
+    """
+    Test that an isolated latency spike survives heavy downsampling.
+    """
+    x = np.arange(50000, dtype=float)
+    y = np.full(50000, 20.0)
+    y[31337] = 2500.0
+
+    indices = lttb_indices(x, y, 100)
+
+    assert 31337 in indices
+
+
+def test_lttb_returns_all_points_below_threshold() -> None:
+    """
+    Test that short series are returned untouched.
+    """
+    indices = lttb_indices(np.arange(5.0), np.arange(5.0), 10)
+
+    assert list(indices) == [0, 1, 2, 3, 4]
+
+
+def test_downsample_points_handles_missing_values() -> None:
+    """
+    Test that time-series points are reduced per metric while skipping null values.
+    """
+    points = [
+        {'time': f'2024-01-01T00:{minute // 60:02d}:{minute % 60:02d}Z',
+         'response_time': None if minute % 7 == 0 else float(minute % 13),
+         'requests_per_sec': float(minute % 5)}
+        for minute in range(3600)
+    ]
+
+    sampled = downsample_points(points, ['response_time', 'requests_per_sec'], 200)
+
+    assert len(sampled) <= 200
+    assert sampled[0] is points[0]
+    assert sampled == sorted(sampled, key=lambda point: point['time'])
+
+
+def test_downsample_points_caps_many_metrics() -> None:
+    """
+    Test that the union over many metrics never exceeds ``max_points``.
+    """
+    metrics = [f'metric_{index}' for index in range(10)]
+    points = [
+        {'time': f'2024-01-01T00:{second // 60:02d}:{second % 60:02d}Z',
+         **{metric: float((second * (index + 3)) % 17) for index, metric in enumerate(metrics)}}
+        for second in range(3600)
+    ]
+
+    assert len(downsample_points(points, metrics, 31)) <= 31
+    with pytest.raises(ValueError):
+        downsample_points(points, metrics, 5)
@@ -0,0 +1,119 @@
+import pytest
+import sqlalchemy as sa
+from flask import Flask, current_app, jsonify
+from app.extensions import db
+from app.db.cache import entity_cache, cached_get
+from app.db.schema import BaseSchema, TestCase as CaseModel, TestSuite as SuiteModel
+from app.utils.conditional import conditional_get
+
+
+class InMemoryRedis:
+    """The subset of the Redis client the entity cache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.available = True
+
+    def _check(self):
+        if not self.available:
+            raise ConnectionError('Redis is down')
+
+    def mget(self, keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    def incr(self, key):
+        self._check()
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+def redis(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'cache.db'}"
+    # Without the local tier every lookup goes through Redis
+    app.config['ENTITY_CACHE_LOCAL_SIZE'] = 0
+    db.init_app(app)
+    redis = InMemoryRedis()
+    entity_cache.configure(app.config, lambda: redis)
+    with app.app_context():
+        BaseSchema.metadata.create_all(db.engine)
+        with db.engine.begin() as connection:
+            connection.execute(sa.insert(SuiteModel.__table__).values(id=1, name='suite'))
+            connection.execute(sa.insert(CaseModel.__table__).values(id=1, test_suite_id=1, name='login'))
+        yield redis
+        db.session.remove()
+    entity_cache.configure({})
+    entity_cache.redis_factory = None
+
+
+@pytest.fixture
+def engine(redis):
+    # The statements are counted on the engine of the application
+    return db.engine
+
+
+def test_repeated_lookups_skip_the_database(redis, statements):
+    """Only the first lookup reads the row; later sessions get it from Redis."""
+    for _ in range(5):
+        case = cached_get(CaseModel, 1)
+        assert (case.name, case.test_suite_id) == ('login', 1)
+        db.session.remove()
+    assert len(statements) == 1
+    assert cached_get(CaseModel, 2) is None
+
+
+def test_commits_bump_the_version(redis):
+    """Updating and deleting through the session invalidates the cached row on commit."""
+    cached_get(CaseModel, 1).name = 'logout'
+    db.session.commit()
+    db.session.remove()
+    assert cached_get(CaseModel, 1).name == 'logout'
+
+    db.session.execute(sa.update(CaseModel.__table__).values(name='signup'))
+    db.session.commit()
+    db.session.remove()
+    assert cached_get(CaseModel, 1).name == 'signup'
+
+    db.session.delete(cached_get(CaseModel, 1))
+    db.session.commit()
+    db.session.remove()
+    assert cached_get(CaseModel, 1) is None
+
+
+def test_lookups_fall_back_to_the_database(redis, statements):
+    """An unreachable Redis makes lookups read from the database instead of failing."""
+    redis.available = False
+    assert cached_get(SuiteModel, 1).name == 'suite'
+    assert len(statements) == 1
+
+
+def test_unchanged_lists_are_not_modified(redis):
+    """A matching If-None-Match is answered 304 without running the view, until the table is written."""
+    app = current_app._get_current_object()
+    calls = []
+
+    @app.route('/cases')
+    @conditional_get(CaseModel)
+    def cases():
+        calls.append(1)
+        return jsonify([case.name for case in db.session.scalars(sa.select(CaseModel))])
+
+    client = app.test_client()
+    response = client.get('/cases')
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert client.get('/cases', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/cases?page=2', headers={'If-None-Match': etag}).status_code == 200
+    assert len(calls) == 2
+
+    db.session.add(CaseModel(id=2, test_suite_id=1, name='logout', description=''))
+    db.session.commit()
+    response = client.get('/cases', headers={'If-None-Match': etag})
+    assert (response.status_code, response.get_json()) == (200, ['login', 'logout'])
+    assert response.headers['ETag'] != etag
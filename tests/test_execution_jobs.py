@@ -0,0 +1,129 @@
+import sys
+from types import SimpleNamespace
+import pytest
+from flask import Flask
+from app.extensions import db
+from app.db.schema import BaseSchema, ExecutionJob as JobModel, TestCase as CaseModel, TestResult as ResultModel, \
+    TestRun as RunModel, TestSuite as SuiteModel, month_bucket
+from app.services import api_test_execution_service, execution_job_service
+from app.services.execution_job_service import ExecutionJobService
+
+
+class FakeTask:
+    def __init__(self):
+        self.sent = []
+
+    def apply_async(self, args, task_id):
+        self.sent.append((args, task_id))
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__, JobModel.__table__]
+
+
+@pytest.fixture
+def session(session):
+    session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+    session.execute(CaseModel.__table__.insert().values(id=1, test_suite_id=1, name='login'))
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def task(monkeypatch):
+    task = FakeTask()
+    monkeypatch.setitem(sys.modules, 'app.tasks', SimpleNamespace(run_execution_job=task))
+    return task
+
+
+@pytest.fixture
+def revoked(monkeypatch):
+    revoked = []
+    monkeypatch.setattr(execution_job_service, 'celery', SimpleNamespace(
+        control=SimpleNamespace(revoke=lambda task_id, terminate: revoked.append((task_id, terminate)))))
+    return revoked
+
+
+def test_jobs_are_queued_and_run(session, task, monkeypatch):
+    """Enqueuing only stores and sends the job; the worker runs it and stores its result."""
+    service = ExecutionJobService(session)
+    job = service.enqueue('test_case', 1)
+    assert (job.status, task.sent) == ('queued', [([job.id], job.id)])
+    with pytest.raises(ValueError):
+        service.enqueue('test_case', 2)
+
+    monkeypatch.setitem(execution_job_service.EXECUTORS, 'test_case',
+                        lambda target_id, db_session: {'test_case_id': target_id, 'status': 'Passed'})
+    finished = service.run(job.id)
+    assert finished.status == 'succeeded'
+    assert finished.to_dict()['result'] == {'test_case_id': 1, 'status': 'Passed'}
+    assert finished.started_at and finished.finished_at
+
+
+def test_failed_executions_are_recorded(session, task, monkeypatch):
+    """An error during the execution marks the job failed with the error message."""
+    def crash(target_id, db_session):
+        raise RuntimeError('newman crashed')
+
+    monkeypatch.setitem(execution_job_service.EXECUTORS, 'test_suite', crash)
+    service = ExecutionJobService(session)
+    job = service.run(service.enqueue('test_suite', 1).id)
+    assert (job.status, job.error) == ('failed', 'newman crashed')
+
+
+def test_cancelled_jobs_are_not_run(session, task, revoked, monkeypatch):
+    """Cancelled jobs are revoked, skipped by the worker and keep their status."""
+    executed = []
+    monkeypatch.setitem(execution_job_service.EXECUTORS, 'test_case',
+                        lambda target_id, db_session: executed.append(target_id) or {})
+    service = ExecutionJobService(session)
+    job = service.enqueue('test_case', 1)
+    assert service.cancel(job.id).status == 'cancelled'
+    assert revoked == [(job.id, True)]
+    assert service.run(job.id).status == 'cancelled'
+    assert executed == []
+
+    with pytest.raises(ValueError):
+        service.cancel(job.id)
+    assert service.cancel('missing') is None
+
+
+def test_jobs_cancelled_while_running_keep_their_status(session, task, revoked, monkeypatch):
+    """A worker finishing a job cancelled meanwhile does not overwrite the cancellation."""
+    service = ExecutionJobService(session)
+    job = service.enqueue('test_case', 1)
+    monkeypatch.setitem(execution_job_service.EXECUTORS, 'test_case',
+                        lambda target_id, db_session: service.cancel(job.id) and {'status': 'Passed'})
+    finished = service.run(job.id)
+    assert (finished.status, finished.result) == ('cancelled', None)
+
+
+@pytest.fixture
+def app_db(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'jobs.db'}"
+    db.init_app(app)
+    with app.app_context():
+        BaseSchema.metadata.create_all(db.engine, tables=[
+            SuiteModel.__table__, CaseModel.__table__, RunModel.__table__, ResultModel.__table__])
+        with db.engine.begin() as connection:
+            connection.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+            connection.execute(CaseModel.__table__.insert().values(id=1, test_suite_id=1, name='login'))
+        yield db
+        db.session.remove()
+
+
+def test_test_case_runs_store_their_result(app_db, monkeypatch):
+    """The real test case executor runs Newman and stores the TestResult."""
+    commands = []
+    monkeypatch.setattr(api_test_execution_service, 'start_process',
+                        lambda args, **kwargs: commands.append(args) or SimpleNamespace(returncode=1))
+    monkeypatch.setattr(api_test_execution_service, 'wait_process', lambda process: ('1 assertion failed', ''))
+
+    result = execution_job_service.EXECUTORS['test_case'](1, app_db.session)
+
+    assert commands == [['newman', 'run', 'path_to_collections/login.json']]
+    stored = app_db.session.get(ResultModel, result['id'])
+    assert (stored.status, stored.result_data) == ('Failed', '1 assertion failed')
+    assert stored.created_month == month_bucket(stored.created_at)
@@ -0,0 +1,83 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from app.db.schema import TestCase as CaseModel, TestRun as RunModel, TestSuite as SuiteModel
+from app.utils.fieldsets import Fieldset, fieldset_options, parse_fieldset_args, serialize_fieldset
+
+INCLUDES = ('test_cases',)
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__, RunModel.__table__]
+
+
+@pytest.fixture
+def session(session):
+    session.execute(SuiteModel.__table__.insert(), [
+        {'id': 1, 'name': 'checkout', 'description': 'payments'}, {'id': 2, 'name': 'search', 'description': ''}])
+    session.execute(CaseModel.__table__.insert(), [
+        {'id': 1, 'test_suite_id': 1, 'name': 'pay'}, {'id': 2, 'test_suite_id': 1, 'name': 'refund'}])
+    session.commit()
+    return session
+
+
+def list_suites(session, statements, fieldset):
+    statements.clear()
+    suites = session.execute(select(SuiteModel).order_by(SuiteModel.id)
+                             .options(*fieldset_options(SuiteModel, fieldset, INCLUDES))).scalars().all()
+    return [serialize_fieldset(suite, fieldset) for suite in suites]
+
+
+def test_defaults_match_to_dict(session, statements):
+    """Without fields or include, lists are serialized like to_dict()."""
+    fieldset = parse_fieldset_args(SuiteModel, INCLUDES, INCLUDES, args={})
+    suites = list_suites(session, statements, fieldset)
+    assert len(statements) == 2
+    assert suites == [suite.to_dict() for suite in session.scalars(select(SuiteModel).order_by(SuiteModel.id))]
+
+
+def test_unrequested_columns_and_relationships_are_not_loaded(session, statements):
+    """Only the requested columns are selected, and the test cases are neither queried nor returned."""
+    fieldset = parse_fieldset_args(SuiteModel, INCLUDES, INCLUDES, args={'fields': 'id,name'})
+    assert fieldset == Fieldset(['id', 'name'], [])
+    suites = list_suites(session, statements, fieldset)
+    assert suites == [{'id': 1, 'name': 'checkout'}, {'id': 2, 'name': 'search'}]
+    assert len(statements) == 1 and 'description' not in statements[0]
+
+
+def test_relationships_are_included_on_request(session, statements):
+    """Relationships named in fields or include are embedded with a single extra query."""
+    for args in ({'fields': 'name,test_cases'}, {'fields': 'name', 'include': 'test_cases'}):
+        suites = list_suites(session, statements, parse_fieldset_args(SuiteModel, INCLUDES, INCLUDES, args=args))
+        assert [(suite['name'], [case['name'] for case in suite['test_cases']]) for suite in suites] == [
+            ('checkout', ['pay', 'refund']), ('search', [])]
+        assert len(statements) == 2
+
+    suites = list_suites(session, statements, parse_fieldset_args(SuiteModel, INCLUDES, INCLUDES, args={'include': ''}))
+    assert suites[0] == {'id': 1, 'name': 'checkout', 'description': 'payments'}
+
+
+def test_relationships_can_be_requested_alone(session, statements):
+    """Requesting only a relationship returns it without columns."""
+    fieldset = parse_fieldset_args(SuiteModel, INCLUDES, INCLUDES, args={'fields': 'test_cases'})
+    assert fieldset == Fieldset([], ['test_cases'])
+    suites = list_suites(session, statements, fieldset)
+    assert [[case['name'] for case in suite['test_cases']] for suite in suites] == [['pay', 'refund'], []]
+    assert set(suites[0]) == {'test_cases'}
+
+
+def test_unknown_fields_are_rejected():
+    """Unknown columns, relationships that may not be embedded and empty fields are errors."""
+    with pytest.raises(ValueError):
+        parse_fieldset_args(SuiteModel, INCLUDES, args={'fields': 'id,password'})
+    with pytest.raises(ValueError):
+        parse_fieldset_args(CaseModel, args={'include': 'test_suite'})
+    with pytest.raises(ValueError):
+        parse_fieldset_args(SuiteModel, INCLUDES, args={'fields': ' , '})
+
+
+def test_dates_are_serialized_like_to_dict():
+    """Datetime columns are written in ISO format."""
+    run = RunModel(id=1, test_suite_id=1, status='Passed', created_at=datetime(2024, 5, 1, 12), finished_at=None)
+    assert serialize_fieldset(run, Fieldset(['id', 'created_at'], [])) == {'id': 1, 'created_at': '2024-05-01T12:00:00'}
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.orm import DeclarativeBase, Session
+from app.utils.pagination import decode_cursor, encode_cursor, paginate, parse_pagination_args
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Row(Base):
+    __tablename__ = 'rows'
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime)
+
+
+@pytest.fixture
+def tables():
+    return [Row.__table__]
+
+
+@pytest.fixture
+def session(session):
+    start = datetime(2024, 1, 1)
+    # Three rows share each timestamp, so the id tie-breaker matters
+    session.add_all([Row(id=index + 1, created_at=start + timedelta(minutes=index // 3)) for index in range(50)])
+    session.commit()
+    return session
+
+
+def test_pages_cover_every_row_once_in_order(session):
+    """Walking the cursors returns every row exactly once, in (created_at desc, id desc) order."""
+    order_by = [(Row.created_at, True), (Row.id, True)]
+    seen, cursor = [], None
+    while True:
+        page = paginate(session.query(Row), order_by, 7, cursor)
+        seen.extend(row.id for row in page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+
+    expected = [row.id for row in session.query(Row).order_by(Row.created_at.desc(), Row.id.desc())]
+    assert seen == expected
+
+
+def test_last_page_has_no_cursor(session):
+    """A page holding the remaining rows does not advertise a next page."""
+    page = paginate(session.query(Row), [(Row.id, False)], 50, None)
+    assert len(page.items) == 50
+    assert page.next_cursor is None
+
+
+def test_cursor_round_trip_and_validation():
+    """Cursors restore datetimes and reject tampered or mismatched values."""
+    order_by = [(Row.created_at, True), (Row.id, True)]
+    moment = datetime(2024, 5, 1, 12, 30)
+    assert decode_cursor(encode_cursor([moment, 42]), order_by) == [moment, 42]
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor', order_by)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([42]), order_by)
+
+
+def test_parse_pagination_args_bounds():
+    """The limit defaults from config and must stay within PAGINATION_MAX_LIMIT."""
+    app = Flask(__name__)
+    app.config.update(PAGINATION_DEFAULT_LIMIT=50, PAGINATION_MAX_LIMIT=500)
+    with app.app_context():
+        assert parse_pagination_args({}) == (50, None)
+        assert parse_pagination_args({'limit': '10', 'after': 'abc'}) == (10, 'abc')
+        for limit in ('0', '501', 'ten'):
+            with pytest.raises(ValueError):
+                parse_pagination_args({'limit': limit})
@@ -0,0 +1,49 @@
+import numpy as np
+from app.services.performance_comparison_service import build_stats_matrix, compare_stats
+
+
+def make_run(scale: float, endpoints: int = 200) -> dict:
+    """
+    Build the result_data of a run with the given latency scale.
+    """
+    return {'endpoints': {
+        f'GET /endpoint/{index}': {'p50': 10.0 * scale + index, 'p95': 40.0 * scale + index,
+                                   'p99': 90.0 * scale + index, 'rps': 100.0 / scale}
+        for index in range(endpoints)
+    }}
+
+
+def test_build_stats_matrix_fills_missing_endpoints() -> None:
+    """
+    Test that endpoints missing from a run are represented as NaN.
+    """
+    runs = [make_run(1.0, endpoints=3), make_run(1.0, endpoints=2)]
+
+    endpoints, matrix = build_stats_matrix(runs)
+
+    assert matrix.shape == (2, 3, 4)
+    assert endpoints[2] == 'GET /endpoint/2'
+    assert np.isnan(matrix[1, 2]).all()
+
+
+def test_compare_stats_flags_regressions() -> None:
+    """
+    Test that a slower candidate is flagged while a baseline-like one is not.
+
+    Asserts:
+        Deltas, confidence intervals and significance over 50 runs x 200 endpoints.
+    """
+    rng = np.random.default_rng(3)
+    baseline_runs = [make_run(1.0 + rng.normal(0, 0.02)) for _ in range(50)]
+    _, baseline = build_stats_matrix(baseline_runs)
+    _, slow = build_stats_matrix([make_run(1.5)])
+    _, usual = build_stats_matrix([make_run(1.0)])
+
+    regression = compare_stats(slow[0], baseline)
+    steady = compare_stats(usual[0], baseline)
+
+    assert regression['runs'].min() == 50
+    assert regression['significant'][:, 0].all()
+    assert (regression['delta_pct'][:, 3] < -25).all()
+    assert not steady['significant'].any()
+    assert (steady['baseline_ci_low'] <= steady['baseline_mean']).all()
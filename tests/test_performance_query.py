@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.performance_query import PerformanceSeriesQuery
+from app.services.performance_data_service import build_series_query
+
+
+def make_query(**overrides) -> PerformanceSeriesQuery:
+    """
+    Build a performance series query spanning one hour, with optional overrides.
+    """
+    params = {
+        'test_id': 7,
+        'start': datetime(2024, 1, 1, 0, 0, 0),
+        'end': datetime(2024, 1, 1, 1, 0, 0),
+        'metrics': 'response_time,requests_per_sec',
+    }
+    params.update(overrides)
+    return PerformanceSeriesQuery(**params)
+
+
+def test_build_series_query_is_bounded() -> None:
+    """
+    Test that the generated query is grouped, time-bounded and parameterized.
+
+    Asserts:
+        The default resolution fits the point budget and the test id is a bind parameter.
+    """
+    query, bind_params = build_series_query(make_query(), max_range_seconds=86400, max_points=600)
+
+    assert 'MEAN("response_time") AS "response_time"' in query
+    assert "time >= '2024-01-01T00:00:00.000000Z'" in query
+    assert 'GROUP BY time(6s)' in query
+    assert 'LIMIT 600' in query
+    assert bind_params == {'test_id': '7'}
+
+
+def test_build_series_query_percentile_aggregation() -> None:
+    """
+    Test that percentile aggregations are translated to PERCENTILE().
+    """
+    query, _ = build_series_query(
+        make_query(aggregation='p99', resolution=60), max_range_seconds=86400, max_points=600)
+
+    assert 'PERCENTILE("response_time", 99)' in query
+    assert 'GROUP BY time(60s)' in query
+
+
+def test_build_series_query_rejects_unbounded_requests() -> None:
+    """
+    Test that ranges and resolutions beyond the configured bounds are rejected.
+    """
+    with pytest.raises(ValueError):
+        build_series_query(make_query(end=datetime(2024, 1, 3)), max_range_seconds=86400, max_points=600)
+
+    with pytest.raises(ValueError):
+        build_series_query(make_query(resolution=1), max_range_seconds=86400, max_points=600)
+
+
+def test_series_query_rejects_unsafe_identifiers() -> None:
+    """
+    Test that metric names and aggregations are validated before reaching InfluxQL.
+    """
+    with pytest.raises(ValueError):
+        make_query(metrics='response_time"; DROP MEASUREMENT performance')
+
+    with pytest.raises(ValueError):
+        make_query(aggregation='integral')
+
+    with pytest.raises(ValueError):
+        make_query(start=datetime(2024, 1, 1, 2), end=datetime(2024, 1, 1, 1))
+
+
+def test_series_query_requires_three_points_per_metric() -> None:
+    """
+    Test that max_points leaves room for at least three downsampled points per metric.
+    """
+    assert make_query(max_points=6).max_points == 6
+    with pytest.raises(ValueError):
+        make_query(max_points=5)
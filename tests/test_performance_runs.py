@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+import shlex
+import subprocess
+from types import SimpleNamespace
+import pytest
+from flask import Flask
+from sqlalchemy import select
+from app.config import Config
+from app.db.schema import PERFORMANCE_RUN_COMPLETED, PERFORMANCE_RUN_ERROR, ExecutionJob as JobModel, \
+    LatencySketch as SketchModel, PerformanceTest as PerfTestModel, PerformanceTestResult as PerfResultModel, \
+    RegressionVerdict as VerdictModel, TestSuite as SuiteModel
+from app.services import performance_data_service
+from app.services.execution_job_service import ExecutionJobService
+from app.services.performance_data_service import PerformanceDataService
+from app.services.performance_test_service import LocustPerformanceTester, run_performance_test
+from app.utils.tdigest import TDigest
+
+STATS_HEADER = ['Type', 'Name', 'Request Count', 'Failure Count', 'Average Response Time', 'Min Response Time', '50%',
+                '90%', '95%', '99%', '100%', 'Requests/s']
+
+
+def write_stats(prefix, rows):
+    with open(f'{prefix}_stats.csv', 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(STATS_HEADER)
+        writer.writerows(rows)
+
+
+def test_locust_writes_the_stats_file_the_run_reads(tmp_path):
+    """The --csv prefix given to Locust is the one whose _stats.csv is parsed."""
+    prefix = str(tmp_path / 'locust_result_7')
+    command = LocustPerformanceTester._build_locust_command({'locustfile': 'load.py', 'host': 'http://app'}, prefix)
+    csv_prefix = next(arg.split('=', 1)[1] for arg in shlex.split(command) if arg.startswith('--csv='))
+    assert csv_prefix == prefix
+
+    write_stats(csv_prefix, [['GET', '/login', 10, 0, 12.5, 5, 11, 20, 25, 40, 60, 5.0],
+                             ['', 'Aggregated', 10, 0, 12.5, 5, 11, 20, 25, 40, 60, 5.0]])
+    results = LocustPerformanceTester._parse_locust_test_results(f'{prefix}_stats.csv')
+    aggregated = LocustPerformanceTester(None)._aggregate_test_results(results)
+    assert aggregated['endpoints']['GET /login']['p95'] == 25.0
+    assert aggregated['aggregated']['rps'] == 5.0
+
+
+class FakeLocust:
+    """Stands in for the Locust process, writing the stats of the endpoints it is given."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.commands = []
+
+    def __call__(self, command, **kwargs):
+        self.commands.append(command)
+        if self.rows:
+            write_stats(next(arg.split('=', 1)[1] for arg in shlex.split(command) if arg.startswith('--csv=')),
+                        self.rows)
+        return SimpleNamespace(pid=4242, returncode=0, communicate=lambda timeout=None: (None, None))
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, PerfTestModel.__table__, PerfResultModel.__table__, SketchModel.__table__,
+            VerdictModel.__table__, JobModel.__table__]
+
+
+@pytest.fixture
+def session(session, tmp_path, monkeypatch):
+    # Locust writes its files in the working directory
+    monkeypatch.chdir(tmp_path)
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    with app.app_context():
+        session.execute(PerfTestModel.__table__.insert().values(
+            id=1, name='load', config=json.dumps({'locustfile': 'load.py', 'host': 'http://app', 'users': 5})))
+        session.commit()
+        yield session
+
+
+def run_job(session):
+    job_id = 'job-1'
+    session.execute(JobModel.__table__.insert().values(id=job_id, kind='performance_test', target_id=1,
+                                                       status='queued'))
+    session.commit()
+    return ExecutionJobService(session).run(job_id)
+
+
+def test_performance_jobs_run_locust(session, monkeypatch):
+    """The worker runs Locust with the stored config and stores the parsed run."""
+    locust = FakeLocust([['GET', '/login', 10, 0, 12.5, 5, 11, 20, 25, 40, 60, 5.0],
+                         ['', 'Aggregated', 10, 0, 12.5, 5, 11, 20, 25, 40, 60, 5.0]])
+    monkeypatch.setattr(subprocess, 'Popen', locust)
+    job = run_job(session)
+
+    assert job.status == 'succeeded'
+    assert '--users 5' in locust.commands[0] and '--host http://app' in locust.commands[0]
+    assert job.to_dict()['result']['status'] == PERFORMANCE_RUN_COMPLETED
+    stored = session.scalars(select(PerfResultModel)).one()
+    assert (stored.status, stored.avg_response_time, stored.requests_per_sec) == (PERFORMANCE_RUN_COMPLETED, 12.5, 5.0)
+    assert json.loads(stored.result_data)['endpoints']['GET /login']['p99'] == 40.0
+    assert not [name for name in os.listdir('.') if name.startswith('locust_')]
+
+
+def test_performance_jobs_fail_when_locust_does_not_run(session, monkeypatch):
+    """A run without Locust results is stored as an error and fails its job."""
+    monkeypatch.setattr(subprocess, 'Popen', FakeLocust([]))
+    job = run_job(session)
+
+    assert job.status == 'failed'
+    assert 'locust_result_1_stats.csv' in job.error
+    assert session.scalars(select(PerfResultModel.status)).all() == [PERFORMANCE_RUN_ERROR]
+
+
+def test_runs_record_their_latency_sketch(session, monkeypatch):
+    """The response times rebuilt from the Locust percentiles are sketched with the weight of every request."""
+    locust = FakeLocust([['', 'Aggregated', 250000, 0, 30.0, 5, 20, 60, 80, 150, 300, 20.0]])
+    monkeypatch.setattr(subprocess, 'Popen', locust)
+    result = run_performance_test(1, session)
+
+    sketch = session.scalars(select(SketchModel).where(SketchModel.performance_result_id == result['id'])).one()
+    digest = TDigest.from_bytes(sketch.digest)
+    assert sketch.sample_count == 250000
+    # Response times rise steeply after the median, from 20 at p50 to 60 at p66
+    assert digest.quantile(0.5) == pytest.approx(20, rel=0.1)
+    assert digest.quantile(0.95) == pytest.approx(80, rel=0.05)
+    assert session.scalars(select(SketchModel).where(SketchModel.window_start.isnot(None))).one().sample_count == 250000
+
+
+def test_pushed_performance_data_records_its_latency_sketch(session, monkeypatch):
+    """Performance data pushed by a client is stored with a sketch of its response times."""
+    written = []
+    monkeypatch.setattr(performance_data_service, 'get_influxdb_client',
+                        lambda: SimpleNamespace(write_points=written.append))
+    PerformanceDataService(session).save_performance_data(
+        [{'test_id': 1, 'execution_time': time} for time in (10.0, 20.0, 30.0)])
+
+    result = session.scalars(select(PerfResultModel)).one()
+    sketch = session.scalars(select(SketchModel).where(SketchModel.performance_result_id == result.id)).one()
+    assert (result.execution_time, sketch.sample_count, len(written)) == (10.0, 3, 1)
+
+
+def test_slower_runs_are_flagged_as_regressions(session, monkeypatch):
+    """Runs stored one after the other are judged against the earlier ones."""
+    verdicts = []
+    for scale in (1.0, 1.02, 0.98, 1.01, 1.0, 1.5):
+        percentiles = [value * scale for value in (5, 20, 60, 80, 150, 300)]
+        row = ['', 'Aggregated', 1000, 0, 30.0 * scale, *percentiles, 20.0]
+        monkeypatch.setattr(subprocess, 'Popen', FakeLocust([row]))
+        result = run_performance_test(1, session)
+        verdicts.append(session.scalars(select(VerdictModel.status)
+                                        .where(VerdictModel.performance_result_id == result['id'])).one())
+
+    assert verdicts == ['insufficient_data'] * 3 + ['pass', 'pass', 'regression']
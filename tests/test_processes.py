@@ -0,0 +1,45 @@
+import os
+import signal
+import subprocess
+import time
+import pytest
+from app.utils.processes import process_groups_killed_on, start_process, wait_process
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'killpg'), reason='process groups are POSIX only')
+
+
+def group_exists(group):
+    try:
+        os.killpg(group, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_terminating_the_task_kills_the_tool_and_its_children():
+    """A signal received while a tool runs kills its whole process group, then gets its previous handling."""
+    received = []
+    previous = signal.signal(signal.SIGUSR1, lambda signum, frame: received.append(signum))
+    try:
+        with process_groups_killed_on(signal.SIGUSR1):
+            # The shell starts sleep as a child of its own, like Locust starts its workers
+            process = start_process('sleep 30; true', shell=True)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            wait_process(process, timeout=5)
+        assert process.returncode == -signal.SIGTERM
+        assert received == [signal.SIGUSR1]
+        deadline = time.monotonic() + 5
+        while group_exists(process.pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not group_exists(process.pid)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+
+def test_output_is_captured_and_the_handler_restored():
+    """Piped output is returned once the tool exits, and the previous handler is restored."""
+    handler = signal.getsignal(signal.SIGUSR2)
+    with process_groups_killed_on(signal.SIGUSR2):
+        process = start_process(['echo', 'done'], stdout=subprocess.PIPE, text=True)
+        assert wait_process(process) == ('done\n', None)
+    assert signal.getsignal(signal.SIGUSR2) is handler
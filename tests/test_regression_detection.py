@@ -0,0 +1,49 @@
+import numpy as np
+from app.services.regression_service import judge_regression
+from app.utils.statistics import mann_whitney_greater, rankdata
+from app.utils.tdigest import TDigest
+
+REGRESSION_CONFIG = {
+    'REGRESSION_SAMPLE_SIZE': 500,
+    'REGRESSION_ALPHA': 0.01,
+    'REGRESSION_MIN_EFFECT_SIZE': 0.147,
+    'REGRESSION_MIN_SLOWDOWN': 0.05,
+}
+
+
+def test_rankdata_averages_ties() -> None:
+    """
+    Test that tied values share the average of their ranks.
+    """
+    ranks, ties = rankdata(np.array([10.0, 20.0, 10.0, 30.0]))
+
+    assert list(ranks) == [1.5, 3.0, 1.5, 4.0]
+    assert list(ties) == [2, 1, 1]
+
+
+def test_mann_whitney_detects_shift() -> None:
+    """
+    Test the U statistic, p-value and Cliff's delta for shifted and identical samples.
+    """
+    rng = np.random.default_rng(11)
+    reference = rng.normal(100, 10, 400)
+
+    _, p_shifted, delta_shifted = mann_whitney_greater(rng.normal(110, 10, 400), reference)
+    _, p_same, delta_same = mann_whitney_greater(reference, reference)
+
+    assert p_shifted < 1e-6 and delta_shifted > 0.4
+    assert p_same > 0.4 and abs(delta_same) < 1e-9
+
+
+def test_judge_regression_ignores_noise() -> None:
+    """
+    Test that a 20% slowdown is flagged while a run from the same distribution passes.
+    """
+    rng = np.random.default_rng(5)
+    baseline = TDigest.merge_all([TDigest().update(rng.lognormal(4, 0.5, 5000)) for _ in range(10)])
+
+    slower = judge_regression(TDigest().update(rng.lognormal(4, 0.5, 5000) * 1.2), baseline, REGRESSION_CONFIG)
+    usual = judge_regression(TDigest().update(rng.lognormal(4, 0.5, 5000)), baseline, REGRESSION_CONFIG)
+
+    assert slower['status'] == 'regression' and slower['median_ratio'] > 1.15
+    assert usual['status'] == 'pass' and not usual['is_regression']
@@ -0,0 +1,62 @@
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from app.db.routing import RoutingSession, pin_to_primary, register_replica_binds, use_replica
+
+metadata = sa.MetaData()
+origin = sa.Table('origin', metadata, sa.Column('id', sa.Integer, primary_key=True), sa.Column('name', sa.String(20)))
+
+
+@pytest.fixture
+def db(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['SQLALCHEMY_REPLICA_URIS'] = [f"sqlite:///{tmp_path / 'replica.db'}"]
+    assert register_replica_binds(app.config) == ['replica_0']
+    db = SQLAlchemy(session_options={'class_': RoutingSession})
+    db.init_app(app)
+    with app.app_context():
+        for key, name in ((None, 'primary'), ('replica_0', 'replica')):
+            metadata.create_all(db.engines[key])
+            with db.engines[key].begin() as connection:
+                connection.execute(origin.insert().values(id=1, name=name))
+        yield db
+        db.session.remove()
+
+
+def read(db):
+    return db.session.execute(sa.select(origin.c.name)).scalar_one()
+
+
+def test_reads_use_primary_unless_routed(db):
+    """Reads go to the primary by default and to the replica inside use_replica()."""
+    assert read(db) == 'primary'
+    with use_replica(db.session()):
+        assert read(db) == 'replica'
+    db.session.rollback()
+    assert read(db) == 'primary'
+
+
+def test_writes_and_locking_reads_stay_on_primary(db):
+    """DML and SELECT ... FOR UPDATE are never routed to a replica."""
+    with use_replica(db.session()):
+        db.session.execute(origin.insert().values(id=2, name='written'))
+        assert db.session.execute(
+            sa.select(origin.c.name).where(origin.c.id == 2).with_for_update()).scalar_one() == 'written'
+        db.session.commit()
+    assert db.session.execute(sa.select(sa.func.count()).select_from(origin)).scalar_one() == 2
+
+
+def test_pinned_session_reads_from_primary(db):
+    """Once pinned, for instance after a flush, the session no longer reads from replicas."""
+    pin_to_primary(db.session())
+    with use_replica(db.session()):
+        assert read(db) == 'primary'
+
+
+def test_dml_statements_pin_the_session(db):
+    """Reads after an UPDATE executed without a flush still see the write."""
+    with use_replica(db.session()):
+        db.session.execute(origin.update().where(origin.c.id == 1).values(name='updated'))
+        assert read(db) == 'updated'
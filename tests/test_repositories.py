@@ -0,0 +1,73 @@
+import pytest
+from flask import Flask
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.db.schema import BaseSchema, TestCase as CaseModel, TestSuite as SuiteModel
+from app.db import repositories
+from app.db.unit_of_work import unit_of_work
+
+
+@pytest.fixture
+def repository():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        BaseSchema.metadata.create_all(db.engine, tables=[SuiteModel.__table__, CaseModel.__table__])
+        repositories.TestSuiteRepository().bulk_add([{'id': 1, 'name': 'suite'}])
+        repository = repositories.TestCaseRepository()
+        repository.bulk_add([{'id': index, 'test_suite_id': 1, 'name': f'case-{index}'}
+                             for index in range(1, 2501)])
+        yield repository
+        db.session.remove()
+
+
+def test_iter_all_streams_every_row_in_order(repository):
+    """Streaming in small batches yields every row once, in primary key order."""
+    ids = [case.id for case in repository.iter_all(batch_size=100)]
+    assert ids == list(range(1, 2501))
+    assert [case.id for case in repository.iter_all(CaseModel.id > 2495)] == [2496, 2497, 2498, 2499, 2500]
+
+
+def test_get_many_skips_missing_ids(repository):
+    """IDs are looked up across IN batches and missing ones are ignored."""
+    cases = repository.get_many([2500, 3, 1, 3, 9999] + list(range(1000, 1200)))
+    assert [case.id for case in cases][:3] == [1, 3, 1000]
+    assert len(cases) == 203
+
+
+def test_get_many_applies_loader_options(repository):
+    """Relationships named in the loader options are loaded with the instances."""
+    [suite] = repositories.TestSuiteRepository(db.session).get_many([1], selectinload(SuiteModel.test_cases))
+    assert 'test_cases' not in inspect(suite).unloaded
+    assert len(suite.test_cases) == 2500
+    [case] = repository.get_many([1])
+    assert 'test_suite' in inspect(case).unloaded
+
+
+def test_bulk_upsert_updates_existing_and_inserts_new(repository):
+    """Conflicting rows are updated in place and new rows are inserted."""
+    written = repository.bulk_upsert([
+        {'id': 1, 'test_suite_id': 1, 'name': 'renamed'},
+        {'id': 2501, 'test_suite_id': 1, 'name': 'case-2501'},
+    ])
+    assert written == 2
+    assert [case.name for case in repository.get_many([1, 2501])] == ['renamed', 'case-2501']
+
+
+def test_delete_where_is_set_based(repository):
+    """A single statement removes every matching row and reports the count."""
+    assert repository.delete_where(CaseModel.id > 2000) == 500
+    assert len(repository.get_many(range(1990, 2010))) == 11
+    with pytest.raises(ValueError):
+        repository.delete_where()
+
+
+def test_failed_writes_roll_back_the_enclosing_unit_of_work(repository):
+    """A failing add propagates, so the outer unit of work rolls back instead of committing partial work."""
+    with pytest.raises(Exception):
+        with unit_of_work():
+            repository.add(CaseModel(id=2501, test_suite_id=1, name='partial', description=''))
+            repository.add(object())
+    assert repository.get_many([2501]) == []
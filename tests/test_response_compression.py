@@ -0,0 +1,69 @@
+import gzip
+import pytest
+from flask import Flask, Response, jsonify
+from app.utils.compression import brotli, compress_response
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['RESPONSE_COMPRESSION_MIN_SIZE'] = 1024
+    app.after_request(compress_response)
+
+    @app.route('/large')
+    def large():
+        response = jsonify([{'id': index, 'status': 'Passed'} for index in range(500)])
+        response.set_etag('results-v1')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify(id=1)
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'{index}\n' for index in range(1000)), mimetype='text/plain')
+
+    @app.route('/failure')
+    def failure():
+        return jsonify(error='x' * 4096), 500
+
+    @app.route('/archive')
+    def archive():
+        return Response(b'\x1f\x8b' + bytes(4096), mimetype='application/gzip')
+
+    return app.test_client()
+
+
+def test_large_responses_are_gzipped(client):
+    """Bodies above the threshold are compressed, and their strong ETag becomes weak."""
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'] == 'W/"results-v1"'
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert gzip.decompress(response.data) == client.get('/large').data
+
+
+def test_small_and_binary_responses_are_not_compressed(client):
+    """Small bodies, binary mimetypes, errors and clients without Accept-Encoding get the identity coding."""
+    for path, headers in (('/small', {'Accept-Encoding': 'gzip'}), ('/archive', {'Accept-Encoding': 'gzip'}),
+                          ('/failure', {'Accept-Encoding': 'gzip'}), ('/large', {})):
+        assert 'Content-Encoding' not in client.get(path, headers=headers).headers
+
+
+def test_streamed_responses_are_compressed_incrementally(client):
+    """Streamed bodies are compressed chunk by chunk without a Content-Length."""
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert response.is_streamed
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data).decode() == ''.join(f'{index}\n' for index in range(1000))
+
+
+@pytest.mark.skipif(brotli is None, reason='brotli is not installed')
+def test_brotli_is_preferred(client):
+    """Brotli is picked over gzip when the client accepts both with the same quality."""
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == client.get('/large').data
+    assert client.get('/large', headers={'Accept-Encoding': 'gzip, br;q=0.5'}).headers['Content-Encoding'] == 'gzip'
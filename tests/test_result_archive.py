@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import func, select
+from app.db.schema import TestCase as CaseModel, TestResult as ResultModel, TestRun as RunModel, \
+    TestSuite as SuiteModel
+from app.services.result_archive_service import ResultArchiveService, retention_cutoff
+
+pytest.importorskip('pyarrow')
+NOW = datetime(2024, 9, 15)
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__, RunModel.__table__, ResultModel.__table__]
+
+
+@pytest.fixture
+def service(session, tmp_path):
+    session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+    session.execute(CaseModel.__table__.insert(), [{'id': 1, 'test_suite_id': 1, 'name': 'a'},
+                                                   {'id': 2, 'test_suite_id': 1, 'name': 'b'}])
+    # One result per case every 5 days over a year
+    session.execute(ResultModel.__table__.insert(), [
+        {'test_case_id': case_id, 'status': 'Passed', 'result_data': f'output {day}',
+         'created_at': NOW - timedelta(days=day)} for day in range(0, 365, 5) for case_id in (1, 2)])
+    session.commit()
+    return ResultArchiveService(session, archive_dir=str(tmp_path))
+
+
+def test_retention_cutoff():
+    """The cutoff is the first month kept, counting back from the current one."""
+    assert retention_cutoff(NOW, 6) == 202403
+    assert retention_cutoff(datetime(2024, 2, 1), 3) == 202311
+
+
+def test_expired_months_are_moved_to_parquet(service):
+    """Months before the cutoff leave the database and land in one archive file each."""
+    total = service.db_session.scalar(select(func.count()).select_from(ResultModel.__table__))
+    months = service.expired_months(6, NOW)
+    assert months and max(months) < 202403
+
+    moved = sum(service.archive_month(month, batch_size=7) for month in months)
+
+    remaining = service.db_session.scalar(select(func.count()).select_from(ResultModel.__table__))
+    assert remaining + moved == total
+    assert service.expired_months(6, NOW) == []
+    assert service.archived_months() == sorted(months, reverse=True)
+
+
+def test_pages_continue_from_live_rows_into_the_archive(service):
+    """Walking the cursors lists every result of a case once, newest first, across both stores."""
+    expected = [NOW - timedelta(days=day) for day in range(0, 365, 5)]
+    for month in service.expired_months(6, NOW):
+        service.archive_month(month)
+
+    seen, cursor = [], None
+    while True:
+        page = service.page_results(1, 10, cursor)
+        seen.extend(datetime.fromisoformat(item['created_at']) for item in page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected
@@ -0,0 +1,99 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event, func, select
+from app.api.test_management import test_management_routes
+from app.config import Config
+from app.db.schema import BaseSchema, TestCase as CaseModel, TestResult as ResultModel, TestRun as RunModel, \
+    TestSuite as SuiteModel
+from app.extensions import db
+from app.services.result_writer import BulkResultWriter
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__, RunModel.__table__, ResultModel.__table__]
+
+
+@pytest.fixture
+def session(session):
+    session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+    session.execute(CaseModel.__table__.insert(), [
+        {'id': index, 'test_suite_id': 1, 'name': f'case-{index}'} for index in range(1, 251)])
+    session.commit()
+    return session
+
+
+def test_run_results_are_written_in_one_commit(session):
+    """All results of a run and its final status are persisted by a single commit."""
+    writer = BulkResultWriter.for_new_run(1, db_session=session, batch_size=100)
+    commits = []
+    event.listen(session, 'after_commit', lambda _: commits.append(1))
+
+    with writer:
+        for case_id in range(1, 251):
+            writer.add(case_id, 'Passed' if case_id % 10 else 'Failed', execution_time=0.1)
+
+    assert len(commits) == 1
+    assert len(writer) == 0
+    assert session.scalar(select(func.count()).select_from(ResultModel.__table__).where(
+        ResultModel.__table__.c.test_run_id == writer.test_run_id)) == 250
+    run = session.execute(select(RunModel.__table__).where(RunModel.__table__.c.id == writer.test_run_id)).one()
+    assert run.status == 'completed'
+    assert run.finished_at is not None
+    assert (run.total_results, run.passed_results, run.failed_results, run.errored_results) == (250, 225, 25, 0)
+    assert run.total_duration == pytest.approx(25.0)
+
+
+def test_failed_run_is_marked_failed(session):
+    """An error during the run still stores the collected results and flags the run as failed."""
+    writer = BulkResultWriter.for_new_run(1, db_session=session)
+    with pytest.raises(RuntimeError):
+        with writer:
+            writer.add(1, 'Passed')
+            raise RuntimeError('newman crashed')
+
+    assert session.scalar(select(RunModel.__table__.c.status).where(
+        RunModel.__table__.c.id == writer.test_run_id)) == 'failed'
+    assert session.scalar(select(func.count()).select_from(ResultModel.__table__)) == 1
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'runs.db'}"
+    app.config['JWT_SECRET_KEY'] = 'a-test-runs-secret-of-32-bytes!!'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(test_management_routes)
+    with app.app_context():
+        BaseSchema.metadata.create_all(db.engine, tables=[
+            SuiteModel.__table__, CaseModel.__table__, RunModel.__table__, ResultModel.__table__])
+        db.session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+        db.session.execute(CaseModel.__table__.insert(), [{'id': 1, 'test_suite_id': 1, 'name': 'login'},
+                                                          {'id': 2, 'test_suite_id': 1, 'name': 'logout'}])
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def test_suite_runs_are_listed_with_their_counters(app):
+    """GET /testsuites/<id>/runs pages the runs, newest first, with the counters of their results."""
+    for statuses in (['Passed', 'Failed'], ['Passed', 'Passed']):
+        with BulkResultWriter.for_new_run(1) as writer:
+            for case_id, status in enumerate(statuses, start=1):
+                writer.add(case_id, status, execution_time=0.5)
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+    response = client.get('/testsuites/1/runs?limit=1', headers=headers)
+    assert response.status_code == 200
+    [run] = response.get_json()
+    assert (run['total_results'], run['passed_results'], run['failed_results']) == (2, 2, 0)
+    response = client.get(f"/testsuites/1/runs?limit=1&after={response.headers['X-Next-Cursor']}", headers=headers)
+    [run] = response.get_json()
+    assert (run['status'], run['passed_results'], run['failed_results'], run['total_duration']) == (
+        'completed', 1, 1, pytest.approx(1.0))
+
+    assert client.get('/testsuites/1/runs').status_code == 401
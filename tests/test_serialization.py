@@ -0,0 +1,65 @@
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+from app.utils.serialization import FastJSONProvider, json_array_response, stream_json_array
+
+
+@dataclass
+class Point:
+    time: datetime
+    value: float
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_output_matches_the_default_provider(app):
+    """The fast provider encodes every value the way Flask's default provider does."""
+    payload = {'b': [1, 2.5, None, True], 'a': 'ünïcode', 'created_at': datetime(2024, 5, 1, 12, 30),
+               'amount': Decimal('1.10'), 'id': uuid.UUID(int=1), 'point': Point(datetime(2024, 5, 1), 0.5)}
+    default = DefaultJSONProvider(app)
+    assert json.loads(app.json.dumps(payload)) == json.loads(default.dumps(payload))
+    assert app.json.loads(app.json.dumps(payload))['a'] == 'ünïcode'
+
+    with app.test_request_context():
+        response = jsonify(payload)
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == json.loads(default.dumps(payload))
+
+
+def test_arrays_are_streamed_in_bounded_chunks():
+    """Items are serialized lazily and sent in chunks of about chunk_size bytes."""
+    consumed = []
+
+    def items():
+        for index in range(1000):
+            consumed.append(index)
+            yield {'id': index, 'status': 'Passed'}
+
+    chunks = stream_json_array(items(), chunk_size=1024)
+    first = next(chunks)
+    assert first.startswith(b'[') and 1024 <= len(first) < 1100
+    assert len(consumed) < 1000
+    body = first + b''.join(chunks)
+    assert json.loads(body) == [{'id': index, 'status': 'Passed'} for index in range(1000)]
+    assert json.loads(b''.join(stream_json_array([]))) == []
+
+
+def test_array_response_serializes_items(app):
+    """json_array_response streams the serialized items within the request."""
+    @app.route('/points')
+    def points():
+        return json_array_response(iter([Point(datetime(2024, 5, 1), 0.5)]), lambda point: {'value': point.value})
+
+    response = app.test_client().get('/points')
+    assert response.is_streamed
+    assert response.get_json() == [{'value': 0.5}]
@@ -0,0 +1,72 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.api.test_management import test_management_routes
+from app.config import Config
+from app.db.schema import BaseSchema, TestCase as CaseModel, TestSuite as SuiteModel
+from app.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'suites.db'}"
+    app.config['JWT_SECRET_KEY'] = 'a-test-suites-secret-of-32-bytes'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(test_management_routes)
+    with app.app_context():
+        BaseSchema.metadata.create_all(db.engine, tables=[SuiteModel.__table__, CaseModel.__table__])
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def engine(app):
+    # The statements fixture records what the endpoints send through the application's engine
+    return db.engine
+
+
+def seed(suites, cases_per_suite):
+    db.session.execute(SuiteModel.__table__.insert(), [
+        {'id': index + 1, 'name': f'suite-{index}', 'description': ''} for index in range(suites)])
+    db.session.execute(CaseModel.__table__.insert(), [
+        {'id': index * cases_per_suite + case + 1, 'test_suite_id': index + 1, 'name': f'case-{index}-{case}',
+         'description': ''} for index in range(suites) for case in range(cases_per_suite)])
+    db.session.commit()
+    db.session.remove()
+
+
+def get(app, path):
+    headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+    response = app.test_client().get(path, headers=headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+@pytest.mark.parametrize('suites', [3, 30])
+def test_serializing_suites_issues_constant_queries(app, statements, suites):
+    """Listing suites with their cases takes two queries, however many suites there are."""
+    seed(suites, 4)
+    statements.clear()
+
+    payload = get(app, '/testsuites')
+
+    assert len(statements) == 2
+    assert len(payload) == suites
+    assert all(len(suite['test_cases']) == 4 for suite in payload)
+    assert [case['id'] for case in payload[0]['test_cases']] == sorted(case['id'] for case in payload[0]['test_cases'])
+
+
+def test_suite_is_loaded_with_its_cases(app, statements):
+    """A suite and its cases take two queries, and an unknown suite is not found."""
+    seed(2, 4)
+    statements.clear()
+
+    suite = get(app, '/testsuites/2')
+
+    assert len(statements) == 2
+    assert [case['name'] for case in suite['test_cases']] == [f'case-1-{case}' for case in range(4)]
+    headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+    assert app.test_client().get('/testsuites/3', headers=headers).status_code == 404
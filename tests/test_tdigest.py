@@ -0,0 +1,69 @@
+import numpy as np
+from app.utils.tdigest import TDigest
+
+
+def test_tdigest_quantiles_are_accurate() -> None:
+    """
+    Test that streamed updates estimate tail percentiles within 1% of the exact values.
+    """
+    rng = np.random.default_rng(42)
+    samples = rng.lognormal(mean=3.0, sigma=0.8, size=200000)
+    digest = TDigest()
+    for batch in np.array_split(samples, 400):
+        digest.update(batch)
+
+    estimated = digest.quantiles([0.5, 0.95, 0.99])
+    exact = np.quantile(samples, [0.5, 0.95, 0.99])
+
+    assert digest.count == samples.size
+    assert np.all(np.abs(estimated - exact) / exact < 0.01)
+
+
+def test_tdigest_merge_matches_single_digest() -> None:
+    """
+    Test that merging per-run digests estimates the same percentiles as the pooled samples.
+    """
+    rng = np.random.default_rng(7)
+    runs = [rng.exponential(scale=50.0 + run, size=20000) for run in range(20)]
+    digests = [TDigest().update(run) for run in runs]
+
+    merged = TDigest.merge_all(digests)
+    exact = np.quantile(np.concatenate(runs), [0.5, 0.99])
+
+    assert merged.count == 400000
+    assert np.all(np.abs(merged.quantiles([0.5, 0.99]) - exact) / exact < 0.01)
+
+
+def test_tdigest_weights_count_like_repeated_samples() -> None:
+    """
+    Test that a weighted sample counts as many repeated ones, in the count and in merges.
+    """
+    rng = np.random.default_rng(13)
+    small, large = rng.normal(100, 5, 1000), rng.normal(200, 5, 1000)
+
+    merged = TDigest.merge_all([TDigest().update(small), TDigest().update(large, weights=99.0)])
+    repeated = TDigest().update(np.concatenate([small, np.repeat(large, 99)]))
+
+    assert merged.count == repeated.count == 100000
+    assert np.all(np.abs(merged.quantiles([0.05, 0.5]) - repeated.quantiles([0.05, 0.5])) < 2)
+    assert TDigest().update([1.0, 2.0, np.nan], weights=[2.0, 0.0, 5.0]).count == 2
+
+
+def test_tdigest_round_trips_through_bytes() -> None:
+    """
+    Test that serialization preserves centroids and bounds.
+    """
+    digest = TDigest().update(np.arange(1.0, 10001.0))
+
+    restored = TDigest.from_bytes(digest.to_bytes())
+
+    assert restored.count == digest.count
+    assert restored.min == 1.0 and restored.max == 10000.0
+    assert restored.quantile(0.5) == digest.quantile(0.5)
+
+
+def test_empty_tdigest_returns_nan() -> None:
+    """
+    Test that an empty digest reports no estimate.
+    """
+    assert np.isnan(TDigest().quantile(0.99))
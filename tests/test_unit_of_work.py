@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event, func, select
+from app.db.schema import TestCase as CaseModel, TestSuite as SuiteModel
+from app.db.unit_of_work import in_unit_of_work, unit_of_work
+
+
+@pytest.fixture
+def tables():
+    return [SuiteModel.__table__, CaseModel.__table__]
+
+
+@pytest.fixture
+def session(session):
+    session.execute(SuiteModel.__table__.insert().values(id=1, name='suite'))
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def commits(session):
+    committed = []
+    event.listen(session, 'after_commit', lambda _: committed.append(1))
+    return committed
+
+
+def case_count(session):
+    return session.scalar(select(func.count()).select_from(CaseModel.__table__))
+
+
+def test_nested_units_commit_once(session, commits):
+    """Units opened inside another one join it, and rows are flushed in batches."""
+    with unit_of_work(session, batch_size=10) as uow:
+        for index in range(1, 26):
+            uow.add(CaseModel(id=index, test_suite_id=1, name=f'case-{index}', description=''))
+            with unit_of_work(session):
+                assert in_unit_of_work(session)
+        assert len(session.new) == 5
+    assert len(commits) == 1
+    assert case_count(session) == 25
+    assert not in_unit_of_work(session)
+
+
+def test_errors_roll_back_the_whole_unit(session, commits):
+    """An error in a nested unit rolls back everything done in the outermost one."""
+    with pytest.raises(RuntimeError):
+        with unit_of_work(session) as uow:
+            uow.add(CaseModel(id=1, test_suite_id=1, name='case', description=''))
+            uow.flush()
+            with unit_of_work(session):
+                raise RuntimeError('failed')
+    assert commits == []
+    assert case_count(session) == 0
+
+    with unit_of_work(session) as uow:
+        uow.add(CaseModel(id=2, test_suite_id=1, name='case', description=''))
+    assert case_count(session) == 1